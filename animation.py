@@ -1,41 +1,42 @@
 # animation.py - Système d'animation avancé
+import pygame
+import os
+from array import array
+from atlas import SpriteAtlas
+
 class Animation:
     def __init__(self, frames, frame_duration, loop=True):
         self.frames = frames  # Liste des images/surfaces
         self.frame_duration = frame_duration  # Durée de chaque frame en ms
         self.loop = loop
-        self.current_frame = 0
-        self.timer = 0
-        self.done = False
-    
-    def update(self, dt):
-        if self.done:
-            return
-        
-        self.timer += dt
-        if self.timer >= self.frame_duration:
-            self.timer = 0
-            self.current_frame += 1
-            
-            if self.current_frame >= len(self.frames):
-                if self.loop:
-                    self.current_frame = 0
-                else:
-                    self.current_frame = len(self.frames) - 1
-                    self.done = True
-    
-    def get_current_frame(self):
-        return self.frames[self.current_frame]
-    
-    def reset(self):
-        self.current_frame = 0
-        self.timer = 0
-        self.done = False
+        self.loaded = False  # True dès qu'une frame vient d'un fichier
 
 class AnimationManager:
-    def __init__(self):
+    """Clips partagés et état d'animation par entité, mis à jour en un seul passage
+
+    L'état des entités est rangé en tableaux compacts (clip, frame, timer,
+    terminé) indexés par slot, sans objet Python par entité.
+    """
+    
+    def __init__(self, loader=None):
         self.animations = {}
-        self.current_animation = None
+        self.atlas = SpriteAtlas()
+        
+        # Clips: (type d'entité, nom) -> id, et leurs caractéristiques par id
+        self.clips = []
+        self.clip_ids = {}
+        self.clip_frame_counts = array('i')
+        self.clip_durations = array('d')
+        self.clip_loops = bytearray()
+        
+        # État par entité, indexé par slot
+        self.entity_slots = {}  # Id d'entité -> slot
+        self.free_slots = []
+        self.slot_clips = array('i')  # -1: slot libre
+        self.slot_frames = array('i')
+        self.slot_timers = array('d')
+        self.slot_done = bytearray()
+        self.loader = loader  # AssetLoader optionnel: décodage en arrière-plan
         self.load_animations()
     
     def load_animations(self):
@@ -52,30 +53,161 @@ class AnimationManager:
                 "move": self.create_animation("monsters/slime/move", 4, 150)
             }
         }
+        self.register_clips()
+        if self.loader:
+            # Regrouper dans l'atlas une fois toutes les frames décodées
+            self.loader.on_group_loaded("animations", self.pack_frames)
+        else:
+            self.pack_frames()
+    
+    def register_clips(self):
+        """Numérote les clips et range leurs caractéristiques en tableaux"""
+        for entity_type, animations in self.animations.items():
+            for name, animation in animations.items():
+                self.clip_ids[(entity_type, name)] = len(self.clips)
+                self.clips.append(animation)
+                self.clip_frame_counts.append(len(animation.frames))
+                self.clip_durations.append(animation.frame_duration)
+                self.clip_loops.append(1 if animation.loop else 0)
     
     def create_animation(self, path, frame_count, duration, loop=True):
-        frames = []
+        # Fallback: surfaces vides, remplacées à mesure que les fichiers sont chargés
+        frames = [pygame.Surface((16, 16), pygame.SRCALPHA) for _ in range(frame_count)]
+        animation = Animation(frames, duration, loop)
+        
+        strip_path = f"assets/{path}.png"
+        if os.path.exists(strip_path):
+            # Planche horizontale: une seule ouverture de fichier pour toutes les frames
+            self.load_image(strip_path, lambda strip: self.split_strip(animation, strip))
+            return animation
+        
         for i in range(frame_count):
             # Charger l'image depuis le dossier correspondant
             frame_path = f"assets/{path}_{i}.png"
             if os.path.exists(frame_path):
-                frame = pygame.image.load(frame_path).convert_alpha()
-                frames.append(frame)
-            else:
-                # Fallback: créer des surfaces colorées
-                frames.append(pygame.Surface((16, 16), pygame.SRCALPHA))
-        return Animation(frames, duration, loop)
+                self.load_image(frame_path, lambda frame, i=i: self.set_frame(animation, i, frame))
+        return animation
     
-    def play_animation(self, entity, animation_name):
-        if entity in self.animations and animation_name in self.animations[entity]:
-            self.current_animation = self.animations[entity][animation_name]
-            self.current_animation.reset()
+    def set_frame(self, animation, index, frame):
+        animation.frames[index] = frame
+        animation.loaded = True
+    
+    def load_image(self, path, callback):
+        if self.loader:
+            self.loader.load_image("animations", path, callback)
+        else:
+            callback(pygame.image.load(path))
+    
+    def split_strip(self, animation, strip):
+        """Découpe une planche horizontale en frames"""
+        frame_width = strip.get_width() // len(animation.frames)
+        for i in range(len(animation.frames)):
+            animation.frames[i] = strip.subsurface(
+                (i * frame_width, 0, frame_width, strip.get_height())
+            ).copy()
+        animation.loaded = True
+    
+    def pack_frames(self):
+        """Regroupe toutes les frames dans l'atlas et les remplace par des subsurfaces"""
+        frames = {}
+        for entity, animations in self.animations.items():
+            for name, animation in animations.items():
+                for i, frame in enumerate(animation.frames):
+                    frames[(entity, name, i)] = frame
+        
+        packed = self.atlas.pack(frames)
+        for entity, animations in self.animations.items():
+            for name, animation in animations.items():
+                animation.frames = [packed[(entity, name, i)] for i in range(len(animation.frames))]
+    
+    def play(self, entity_id, entity_type, animation_name):
+        """Joue un clip pour une entité; ne fait rien s'il est déjà en cours"""
+        clip = self.clip_ids.get((entity_type, animation_name))
+        if clip is None:
+            return False
+        
+        slot = self.entity_slots.get(entity_id)
+        if slot is None:
+            slot = self.allocate_slot(entity_id)
+        elif self.slot_clips[slot] == clip:
+            return True
+        
+        self.slot_clips[slot] = clip
+        self.slot_frames[slot] = 0
+        self.slot_timers[slot] = 0.0
+        self.slot_done[slot] = 0
+        return True
+    
+    def allocate_slot(self, entity_id):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.slot_clips)
+            self.slot_clips.append(-1)
+            self.slot_frames.append(0)
+            self.slot_timers.append(0.0)
+            self.slot_done.append(0)
+        self.entity_slots[entity_id] = slot
+        return slot
+    
+    def remove(self, entity_id):
+        """Libère l'état d'animation d'une entité (mort, déchargement)"""
+        slot = self.entity_slots.pop(entity_id, None)
+        if slot is not None:
+            self.slot_clips[slot] = -1
+            self.free_slots.append(slot)
+    
+    def clear(self):
+        """Oublie l'état de toutes les entités (nouvelle partie, chargement)"""
+        self.entity_slots = {}
+        self.free_slots = []
+        self.slot_clips = array('i')
+        self.slot_frames = array('i')
+        self.slot_timers = array('d')
+        self.slot_done = bytearray()
     
     def update(self, dt):
-        if self.current_animation:
-            self.current_animation.update(dt)
+        """Avance toutes les animations en un passage, en sautant des frames si dt est grand"""
+        clips = self.slot_clips
+        frames = self.slot_frames
+        timers = self.slot_timers
+        done = self.slot_done
+        durations = self.clip_durations
+        counts = self.clip_frame_counts
+        loops = self.clip_loops
+        
+        for slot in range(len(clips)):
+            clip = clips[slot]
+            if clip < 0 or done[slot]:
+                continue
+            timer = timers[slot] + dt
+            duration = durations[clip]
+            if timer < duration:
+                timers[slot] = timer
+                continue
+            
+            steps = int(timer // duration)
+            timers[slot] = timer - steps * duration
+            frame = frames[slot] + steps
+            count = counts[clip]
+            if frame >= count:
+                if loops[clip]:
+                    frame %= count
+                else:
+                    frame = count - 1
+                    done[slot] = 1
+            frames[slot] = frame
+    
+    def get_frame(self, entity_id):
+        """Image courante de l'entité, ou None si elle n'a pas d'animation chargée"""
+        slot = self.entity_slots.get(entity_id)
+        if slot is None:
+            return None
+        animation = self.clips[self.slot_clips[slot]]
+        if not animation.loaded:
+            return None
+        return animation.frames[self.slot_frames[slot]]
     
-    def get_current_frame(self):
-        if self.current_animation:
-            return self.current_animation.get_current_frame()
-        return None
+    def is_done(self, entity_id):
+        slot = self.entity_slots.get(entity_id)
+        return slot is None or self.slot_done[slot] == 1
@@ -0,0 +1,92 @@
+# asset_loader.py - Chargement des assets en arrière-plan avec progression
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from atlas import prepare_surface
+
+
+class AssetLoader:
+    """Lit et décode les fichiers sur un pool de threads
+
+    La conversion des surfaces et les callbacks s'exécutent sur le thread
+    principal, dans poll(), appelé à chaque frame.
+    """
+
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assets")
+        self.pending = []  # (future, groupe, finalisation)
+        self.totals = {}  # Groupe -> nombre de jobs soumis
+        self.completed = {}  # Groupe -> nombre de jobs terminés
+        self.group_callbacks = {}  # Groupe -> callbacks appelés quand tout est chargé
+
+    def submit(self, group, decode, finalize, *args):
+        """decode(*args) tourne sur un thread, finalize(résultat) sur le thread principal"""
+        future = self.executor.submit(decode, *args)
+        self.pending.append((future, group, finalize))
+        self.totals[group] = self.totals.get(group, 0) + 1
+        self.completed.setdefault(group, 0)
+        return future
+
+    def load_image(self, group, path, callback, colorkey=None):
+        """Décode une image en arrière-plan puis la convertit au format de l'écran"""
+        def finalize(surface):
+            callback(prepare_surface(surface, colorkey))
+        return self.submit(group, pygame.image.load, finalize, path)
+
+    def load_sound(self, group, path, callback):
+        """Décode entièrement un son en arrière-plan"""
+        return self.submit(group, pygame.mixer.Sound, callback, path)
+
+    def load_file(self, group, path, callback):
+        """Lit un fichier brut en arrière-plan (octets, ex: musiques)"""
+        return self.submit(group, read_file, callback, path)
+
+    def on_group_loaded(self, group, callback):
+        """Appelle callback quand tous les jobs du groupe sont finalisés"""
+        if self.is_done(group):
+            callback()
+        else:
+            self.group_callbacks.setdefault(group, []).append(callback)
+
+    def poll(self):
+        """Finalise les jobs terminés; retourne le nombre de jobs traités"""
+        # Un seul passage: un job qui se termine pendant le tri reste en attente
+        finished = []
+        pending = []
+        for job in self.pending:
+            (finished if job[0].done() else pending).append(job)
+        if not finished:
+            return 0
+
+        self.pending = pending
+        for future, group, finalize in finished:
+            try:
+                finalize(future.result())
+            except Exception as e:
+                print(f"Erreur de chargement d'asset: {e}")
+            finally:
+                self.completed[group] += 1
+
+        for group in {job[1] for job in finished}:
+            if self.is_done(group):
+                for callback in self.group_callbacks.pop(group, []):
+                    callback()
+        return len(finished)
+
+    def get_progress(self, group=None):
+        """Progression entre 0 et 1, pour un groupe ou pour tous les jobs"""
+        groups = [group] if group else list(self.totals)
+        total = sum(self.totals.get(g, 0) for g in groups)
+        if total == 0:
+            return 1.0
+        return sum(self.completed.get(g, 0) for g in groups) / total
+
+    def is_done(self, group=None):
+        return self.get_progress(group) >= 1.0
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
@@ -0,0 +1,92 @@
+# atlas.py - Atlas de sprites et normalisation du format des surfaces
+import pygame
+
+
+def prepare_surface(surface, colorkey=None):
+    """Convertit une surface au format de l'écran pour des blits sans conversion
+
+    Les surfaces à couleur transparente utilisent l'accélération RLE.
+    """
+    if not pygame.display.get_init() or pygame.display.get_surface() is None:
+        return surface  # Pas encore de fenêtre: conversion impossible
+
+    if colorkey is not None:
+        surface = surface.convert()
+        surface.set_colorkey(colorkey, pygame.RLEACCEL)
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+class SpriteAtlas:
+    """Regroupe de nombreuses petites images dans quelques grandes planches"""
+
+    def __init__(self, sheet_size=1024, padding=1, colorkey=(255, 0, 255)):
+        self.sheet_size = sheet_size
+        self.padding = padding
+        self.colorkey = colorkey  # Couleur transparente des planches à color key
+        self.sheets = []
+
+    def get_kind(self, surface):
+        """Type de planche adapté à la surface: opaque, alpha ou colorkey"""
+        if surface.get_flags() & pygame.SRCALPHA:
+            return "alpha"
+        if surface.get_colorkey() is not None:
+            return "colorkey"
+        return "opaque"
+
+    def pack(self, surfaces):
+        """Range les surfaces {nom: surface} et retourne {nom: subsurface}"""
+        groups = {}
+        for name, surface in surfaces.items():
+            groups.setdefault(self.get_kind(surface), []).append((name, surface))
+
+        packed = {}
+        for kind, items in groups.items():
+            # Rangement par étagères: les plus hautes d'abord
+            items.sort(key=lambda item: item[1].get_height(), reverse=True)
+            placements = []
+            x = y = shelf_height = 0
+            sheet_index = 0
+            for name, surface in items:
+                width, height = surface.get_size()
+                if x + width > self.sheet_size:
+                    x = 0
+                    y += shelf_height + self.padding
+                    shelf_height = 0
+                if y + height > self.sheet_size:
+                    sheet_index += 1
+                    x = y = shelf_height = 0
+                placements.append((name, surface, sheet_index, x, y))
+                x += width + self.padding
+                shelf_height = max(shelf_height, height)
+
+            # Planches réduites à la surface réellement occupée
+            extents = [[1, 1] for _ in range(sheet_index + 1)]
+            for name, surface, index, px, py in placements:
+                extents[index][0] = max(extents[index][0], px + surface.get_width())
+                extents[index][1] = max(extents[index][1], py + surface.get_height())
+            sheets = [self.create_sheet(kind, size) for size in extents]
+            for name, surface, index, px, py in placements:
+                sheets[index].blit(surface, (px, py))
+            sheets = [self.finalize_sheet(sheet, kind) for sheet in sheets]
+            self.sheets.extend(sheets)
+
+            for name, surface, index, px, py in placements:
+                packed[name] = sheets[index].subsurface((px, py) + surface.get_size())
+        return packed
+
+    def create_sheet(self, kind, size):
+        if kind == "alpha":
+            sheet = pygame.Surface(size, pygame.SRCALPHA)
+            sheet.fill((0, 0, 0, 0))
+        else:
+            sheet = pygame.Surface(size)
+            sheet.fill(self.colorkey)
+        return sheet
+
+    def finalize_sheet(self, sheet, kind):
+        if kind == "colorkey":
+            return prepare_surface(sheet, self.colorkey)
+        return prepare_surface(sheet)
@@ -1,15 +1,24 @@
 # audio.py - Système de son et musique
 import pygame
 import os
+import io
+from collections import OrderedDict
 
 class AudioManager:
-    def __init__(self):
+    def __init__(self, enabled=True, loader=None, music_cache_budget=8 * 1024 * 1024):
+        self.enabled = enabled  # False: aucun accès au mixer (mode headless)
+        self.loader = loader  # AssetLoader optionnel: décodage en arrière-plan
         self.sounds = {}
         self.music = {}
         self.current_music = None
+        self.music_cache = OrderedDict()  # Musiques préchargées en mémoire (LRU)
+        self.music_cache_budget = music_cache_budget  # En octets
+        self.music_cache_bytes = 0
+        self.music_pending = set()  # Lectures en cours sur le chargeur d'assets
         self.music_volume = 0.5
         self.sound_volume = 0.7
-        self.load_audio()
+        if self.enabled:
+            self.load_audio()
     
     def load_audio(self):
         # Charger les effets sonores
@@ -24,7 +33,10 @@ class AudioManager:
         
         for name, path in sound_files.items():
             if os.path.exists(path):
-                self.sounds[name] = pygame.mixer.Sound(path)
+                if self.loader:
+                    self.loader.load_sound("audio", path, lambda sound, name=name: self.add_sound(name, sound))
+                else:
+                    self.sounds[name] = pygame.mixer.Sound(path)
         
         # Charger les musiques
         music_files = {
@@ -39,25 +51,75 @@ class AudioManager:
             if os.path.exists(path):
                 self.music[name] = path
     
+    def add_sound(self, name, sound):
+        """Enregistre un son décodé (appelé par le chargeur d'assets)"""
+        sound.set_volume(self.sound_volume)
+        self.sounds[name] = sound
+    
     def play_sound(self, sound_name):
-        if sound_name in self.sounds:
+        if self.enabled and sound_name in self.sounds:
             self.sounds[sound_name].set_volume(self.sound_volume)
             self.sounds[sound_name].play()
     
     def play_music(self, music_name, loops=-1):
+        if not self.enabled:
+            return
         if music_name in self.music and self.current_music != music_name:
-            pygame.mixer.music.load(self.music[music_name])
+            if music_name in self.music_cache:
+                self.music_cache.move_to_end(music_name)
+                pygame.mixer.music.load(io.BytesIO(self.music_cache[music_name]))
+            else:
+                pygame.mixer.music.load(self.music[music_name])
             pygame.mixer.music.set_volume(self.music_volume)
             pygame.mixer.music.play(loops)
             self.current_music = music_name
     
+    def prefetch_music(self, music_name):
+        """Lit le fichier de musique à l'avance pour éviter l'accès disque au changement de zone"""
+        if not self.enabled or music_name not in self.music:
+            return
+        if music_name in self.music_cache:
+            self.music_cache.move_to_end(music_name)
+            return
+        if music_name in self.music_pending:
+            return
+        
+        path = self.music[music_name]
+        if self.loader:
+            # Fichier illisible: reste en attente, play_music lira le fichier directement
+            self.music_pending.add(music_name)
+            self.loader.load_file("music", path, lambda data: self.add_music(music_name, data))
+        else:
+            with open(path, 'rb') as f:
+                self.add_music(music_name, f.read())
+    
+    def add_music(self, music_name, data):
+        """Met une musique lue en cache, en évinçant les moins récentes au-delà du budget"""
+        self.music_pending.discard(music_name)
+        if len(data) > self.music_cache_budget or music_name in self.music_cache:
+            return
+        self.music_cache[music_name] = data
+        self.music_cache_bytes += len(data)
+        self.trim_music_cache()
+    
+    def set_music_cache_budget(self, budget):
+        self.music_cache_budget = budget
+        self.trim_music_cache()
+    
+    def trim_music_cache(self):
+        while self.music_cache_bytes > self.music_cache_budget:
+            _, evicted = self.music_cache.popitem(last=False)
+            self.music_cache_bytes -= len(evicted)
+    
     def stop_music(self):
-        pygame.mixer.music.stop()
+        if self.enabled:
+            pygame.mixer.music.stop()
         self.current_music = None
     
     def set_music_volume(self, volume):
         self.music_volume = max(0, min(1, volume))
-        pygame.mixer.music.set_volume(self.music_volume)
+        if self.enabled:
+            pygame.mixer.music.set_volume(self.music_volume)
     
     def set_sound_volume(self, volume):
         self.sound_volume = max(0, min(1, volume))
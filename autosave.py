@@ -0,0 +1,95 @@
+# autosave.py - Sauvegardes en arrière-plan à partir d'instantanés de l'état
+import time
+from concurrent.futures import ThreadPoolExecutor
+from save_format import COMPRESSION_ZLIB, SaveSnapshot
+
+
+class SaveResult:
+    __slots__ = ("slot", "automatic", "snapshot_ms", "write_ms", "size", "error")
+
+    def __init__(self, slot, automatic, snapshot_ms, write_ms=0.0, size=0, error=None):
+        self.slot = slot
+        self.automatic = automatic
+        self.snapshot_ms = snapshot_ms  # Capture sur le thread principal
+        self.write_ms = write_ms  # Encodage, compression et écriture sur le thread de sauvegarde
+        self.size = size
+        self.error = error
+
+
+class AutosaveService:
+    """Capture l'état sur le thread principal, encode et écrit sur un thread dédié
+
+    Une seule écriture à la fois. Les demandes faites pendant une écriture
+    attendent leur tour, une par slot: une demande plus récente pour le même
+    slot remplace la précédente, jamais celle d'un autre slot.
+    poll(), appelé à chaque frame, retourne les sauvegardes terminées.
+    """
+
+    def __init__(self, save_system, interval=300, enabled=True, compression=COMPRESSION_ZLIB):
+        self.save_system = save_system
+        self.interval = interval * 1000  # En ms de jeu
+        self.enabled = enabled
+        self.compression = compression
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self.writing = None  # (future, slot, automatique, durée de capture)
+        self.queued = {}  # Slot -> (instantané, automatique, durée de capture), dans l'ordre des demandes
+        self.last_save_time = 0.0
+        self.last_result = None  # SaveResult de la dernière sauvegarde terminée
+
+    def reset(self, game_time):
+        """Repart de zéro (nouvelle partie, chargement)"""
+        self.last_save_time = game_time
+
+    def is_due(self, game_time):
+        """Vrai quand l'intervalle de sauvegarde automatique est écoulé"""
+        return self.enabled and game_time - self.last_save_time >= self.interval
+
+    def save(self, player, environment, quest_manager, play_time, slot=0, automatic=False, thumbnail=None):
+        start = time.perf_counter()
+        snapshot = SaveSnapshot(player, environment, quest_manager, play_time, thumbnail)
+        snapshot_ms = (time.perf_counter() - start) * 1000
+        if automatic:
+            self.last_save_time = play_time * 1000
+        self.queued[slot] = (snapshot, automatic, snapshot_ms)
+        self.start_next()
+
+    def start_next(self):
+        if self.writing is not None or not self.queued:
+            return
+        slot = next(iter(self.queued))
+        snapshot, automatic, snapshot_ms = self.queued.pop(slot)
+        future = self.executor.submit(self.write, snapshot, slot)
+        self.writing = (future, slot, automatic, snapshot_ms)
+
+    def write(self, snapshot, slot):
+        """Tourne sur le thread de sauvegarde; retourne (durée en ms, taille)"""
+        start = time.perf_counter()
+        size = self.save_system.write_snapshot(slot, snapshot, self.compression)
+        return (time.perf_counter() - start) * 1000, size
+
+    def is_busy(self):
+        return self.writing is not None or bool(self.queued)
+
+    def poll(self):
+        """Sauvegardes terminées depuis le dernier appel (liste de SaveResult)"""
+        if self.writing is None or not self.writing[0].done():
+            return []
+        future, slot, automatic, snapshot_ms = self.writing
+        self.writing = None
+        try:
+            write_ms, size = future.result()
+            result = SaveResult(slot, automatic, snapshot_ms, write_ms, size)
+        except Exception as e:
+            # Encodage ou écriture: la sauvegarde précédente du slot reste intacte
+            result = SaveResult(slot, automatic, snapshot_ms, error=e)
+        self.last_result = result
+        self.start_next()
+        return [result]
+
+    def shutdown(self):
+        """Termine les écritures en cours et en attente (fermeture du jeu)"""
+        while self.is_busy():
+            if self.writing is not None:
+                self.writing[0].exception()  # Attend sans relancer l'erreur
+            self.poll()
+        self.executor.shutdown(wait=True)
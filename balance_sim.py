@@ -0,0 +1,148 @@
+# balance_sim.py - Simulation Monte Carlo des combats pour l'équilibrage
+#
+# Exemple: python balance_sim.py --levels 1-10 --fights 2000 --output balance.csv
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Le bandeau de pygame (importé par les modules du jeu) finirait dans le CSV sur stdout
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from combat import PlayerState, MonsterState, simulate_fight
+from config import DIFFICULTY_MULTIPLIERS
+from inventory import get_item
+from monsters import Slime, Rat, Korvash
+from player import Player
+
+CLASSES = ("warrior", "archer", "mage", "thief")
+MONSTERS = {"slime": Slime, "rat": Rat, "korvash": Korvash}
+
+# Un tour = l'action du joueur puis la réponse du monstre (2 s chacune en jeu)
+SECONDS_PER_TURN = 4.0
+
+COLUMNS = ("class", "level", "monster", "difficulty", "fights", "win_rate",
+           "avg_turns", "time_to_kill_s", "xp_per_min", "gold_per_min", "loot_value_per_min")
+
+
+def build_player_state(class_name, level):
+    """Joueur de la classe donnée, monté au niveau voulu"""
+    player = Player("Ycrad", class_name)
+    while player.level < level:
+        player.xp = player.xp_to_next_level
+        player.level_up()
+    return PlayerState.from_player(player)
+
+
+def run_cell(cell):
+    """Simule fights combats pour une case de la grille; retourne une ligne du CSV"""
+    class_name, level, monster_name, difficulty, fights, seed = cell
+    rng = random.Random(seed)
+    player_template = build_player_state(class_name, level)
+    monster = MONSTERS[monster_name](level, (0, 0))
+    monster_template = MonsterState.from_monster(monster, DIFFICULTY_MULTIPLIERS[difficulty])
+
+    wins = 0
+    total_turns = 0
+    win_turns = 0
+    for _ in range(fights):
+        won, turns = simulate_fight(player_template.copy(), monster_template.copy(), rng)
+        total_turns += turns
+        if won:
+            wins += 1
+            win_turns += turns
+
+    # Butin de toutes les victoires en un seul tirage vectorisé
+    loot_table = monster.loot_table
+    loot = loot_table.totals(loot_table.roll_batch(wins, np.random.default_rng(seed)))
+    loot_value = sum(get_item(item_id).value * count for item_id, count in loot.items())
+
+    minutes = total_turns * SECONDS_PER_TURN / 60
+    return {
+        "class": class_name,
+        "level": level,
+        "monster": monster_name,
+        "difficulty": difficulty,
+        "fights": fights,
+        "win_rate": round(wins / fights, 4),
+        "avg_turns": round(total_turns / fights, 2),
+        "time_to_kill_s": round(win_turns / wins * SECONDS_PER_TURN, 2) if wins else "",
+        "xp_per_min": round(wins * monster.xp_reward / minutes, 2),
+        "gold_per_min": round(wins * monster.gold_reward / minutes, 2),
+        "loot_value_per_min": round(loot_value / minutes, 2),
+    }
+
+
+def parse_levels(text):
+    """"1-10" ou "1,3,5" -> liste de niveaux"""
+    levels = []
+    for part in text.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            levels.extend(range(int(start), int(end) + 1))
+        else:
+            levels.append(int(part))
+    return levels
+
+
+def build_grid(classes, levels, monsters, difficulties, fights, seed):
+    """Cases classe × niveau × monstre × difficulté, chacune avec sa propre graine"""
+    return [
+        (class_name, level, monster_name, difficulty, fights, seed + index)
+        for index, (class_name, level, monster_name, difficulty) in enumerate(
+            itertools.product(classes, levels, monsters, difficulties)
+        )
+    ]
+
+
+def run_sweep(grid, workers=None):
+    """Répartit les cases sur un pool de processus; lignes dans l'ordre de la grille"""
+    if workers == 1:
+        return [run_cell(cell) for cell in grid]
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(grid) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_cell, grid, chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation d'équilibrage des combats")
+    parser.add_argument("--classes", default=",".join(CLASSES))
+    parser.add_argument("--levels", default="1-10")
+    parser.add_argument("--monsters", default=",".join(MONSTERS))
+    parser.add_argument("--difficulties", default=",".join(DIFFICULTY_MULTIPLIERS))
+    parser.add_argument("--fights", type=int, default=1000, help="Combats par case de la grille")
+    parser.add_argument("--workers", type=int, default=None, help="Processus (défaut: tous les coeurs)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Fichier CSV (défaut: sortie standard)")
+    args = parser.parse_args()
+
+    grid = build_grid(
+        args.classes.split(","), parse_levels(args.levels),
+        args.monsters.split(","), args.difficulties.split(","),
+        args.fights, args.seed
+    )
+    start = time.perf_counter()
+    rows = run_sweep(grid, args.workers)
+    elapsed = time.perf_counter() - start
+
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(output, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if args.output:
+            output.close()
+
+    total_fights = len(grid) * args.fights
+    print(f"{len(grid)} cases, {total_fights} combats en {elapsed:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# combat.py - Moteur de combat pur: états, action et RNG en entrée, résultat structuré en sortie
+#
+# Aucune dépendance à pygame, à l'horloge, à l'UI ou à l'audio: Game ne fait que
+# piloter les tours et afficher les résultats. Les mêmes fonctions servent aux
+# simulations (équilibrage, anticipation de l'IA).
+
+ATTACK = "attack"
+SKILL = "skill"
+FLEE = "flee"
+
+FLEE_CHANCE = 0.5
+
+
+class SkillState:
+    """Compétence réduite à ce qui compte pour le combat"""
+    __slots__ = ("name", "mp_cost", "base_damage", "cooldown")
+
+    def __init__(self, name, mp_cost, base_damage, cooldown):
+        self.name = name
+        self.mp_cost = mp_cost
+        self.base_damage = base_damage
+        self.cooldown = cooldown  # En tours du joueur
+
+    @classmethod
+    def from_skill(cls, skill):
+        return cls(skill.name, skill.mp_cost, skill.base_damage, skill.cooldown)
+
+
+class PlayerState:
+    """Instantané des valeurs de combat du joueur"""
+    __slots__ = ("hp", "max_hp", "mp", "level", "attack_power", "defense",
+                 "critical_chance", "critical_multiplier", "skills", "cooldowns")
+
+    def __init__(self, hp, max_hp, mp, level, attack_power, defense,
+                 critical_chance=0.05, critical_multiplier=1.5, skills=(), cooldowns=None):
+        self.hp = hp
+        self.max_hp = max_hp
+        self.mp = mp
+        self.level = level
+        self.attack_power = attack_power
+        self.defense = defense
+        self.critical_chance = critical_chance
+        self.critical_multiplier = critical_multiplier
+        self.skills = list(skills)
+        self.cooldowns = dict(cooldowns or {})  # Nom de compétence -> tours restants
+
+    @classmethod
+    def from_player(cls, player):
+        defense = player.stats["defense"]
+        if player.equipment["armor"]:
+            defense += player.equipment["armor"].defense
+        return cls(
+            player.hp, player.max_hp, player.mp, player.level,
+            player.calculate_damage(), defense,
+            player.stats["critical_chance"], player.stats["critical_multiplier"],
+            [SkillState.from_skill(skill) for skill in player.skills],
+            player.skill_cooldowns
+        )
+
+    def copy(self):
+        return PlayerState(self.hp, self.max_hp, self.mp, self.level, self.attack_power, self.defense,
+                           self.critical_chance, self.critical_multiplier, self.skills, self.cooldowns)
+
+    def apply_to(self, player):
+        """Reporte PV, MP et cooldowns sur le joueur"""
+        player.hp = self.hp
+        player.mp = self.mp
+        player.skill_cooldowns = dict(self.cooldowns)
+
+
+class MonsterState:
+    """Instantané des valeurs de combat d'un monstre"""
+    __slots__ = ("name", "hp", "max_hp", "damage")
+
+    def __init__(self, name, hp, max_hp, damage):
+        self.name = name
+        self.hp = hp
+        self.max_hp = max_hp
+        self.damage = damage
+
+    @classmethod
+    def from_monster(cls, monster, difficulty=1.0):
+        """difficulty: multiplicateur des dégâts du monstre (Config.get_difficulty_multiplier)"""
+        return cls(monster.name, monster.hp, monster.max_hp, int(monster.damage * difficulty))
+
+    def copy(self):
+        return MonsterState(self.name, self.hp, self.max_hp, self.damage)
+
+    def apply_to(self, monster):
+        monster.hp = self.hp
+
+
+class TurnResult:
+    """Ce qui s'est passé pendant une action"""
+    __slots__ = ("actor", "action", "success", "damage", "critical", "fled",
+                 "target_defeated", "skill_name", "reason")
+
+    def __init__(self, actor, action, success=True, damage=0, critical=False, fled=False,
+                 target_defeated=False, skill_name=None, reason=None):
+        self.actor = actor  # "player" ou "monster"
+        self.action = action
+        self.success = success  # Faux: action impossible, le tour n'est pas consommé
+        self.damage = damage
+        self.critical = critical
+        self.fled = fled
+        self.target_defeated = target_defeated
+        self.skill_name = skill_name
+        self.reason = reason  # Pourquoi l'action a échoué: "unknown_skill", "cooldown", "mp"
+
+    def __repr__(self):
+        return (f"TurnResult({self.actor}, {self.action}, success={self.success}, "
+                f"damage={self.damage}, critical={self.critical}, fled={self.fled}, "
+                f"target_defeated={self.target_defeated})")
+
+
+def tick_cooldowns(player):
+    """Un tour du joueur s'est écoulé"""
+    if player.cooldowns:
+        player.cooldowns = {name: turns - 1 for name, turns in player.cooldowns.items() if turns > 1}
+
+
+def resolve_player_action(player, monster, action, rng, skill_index=0):
+    """Applique l'action du joueur sur les états et retourne un TurnResult"""
+    if action == ATTACK:
+        damage = player.attack_power
+        critical = rng.random() < player.critical_chance
+        if critical:
+            damage = int(damage * player.critical_multiplier)
+        monster.hp -= damage
+        tick_cooldowns(player)
+        return TurnResult("player", ATTACK, damage=damage, critical=critical,
+                          target_defeated=monster.hp <= 0)
+
+    if action == SKILL:
+        if not 0 <= skill_index < len(player.skills):
+            return TurnResult("player", SKILL, success=False, reason="unknown_skill")
+        skill = player.skills[skill_index]
+        if skill.name in player.cooldowns:
+            return TurnResult("player", SKILL, success=False, skill_name=skill.name, reason="cooldown")
+        if player.mp < skill.mp_cost:
+            return TurnResult("player", SKILL, success=False, skill_name=skill.name, reason="mp")
+
+        player.mp -= skill.mp_cost
+        damage = skill.base_damage + player.level * 2
+        monster.hp -= damage
+        tick_cooldowns(player)
+        if skill.cooldown > 0:
+            player.cooldowns[skill.name] = skill.cooldown
+        return TurnResult("player", SKILL, damage=damage, skill_name=skill.name,
+                          target_defeated=monster.hp <= 0)
+
+    if action == FLEE:
+        tick_cooldowns(player)
+        return TurnResult("player", FLEE, fled=rng.random() < FLEE_CHANCE)
+
+    raise ValueError(f"Action de combat inconnue: {action}")
+
+
+def resolve_monster_action(player, monster, rng):
+    """Le monstre attaque; la défense du joueur réduit les dégâts (minimum 1)"""
+    damage = max(1, monster.damage - player.defense)
+    player.hp -= damage
+    return TurnResult("monster", ATTACK, damage=damage, target_defeated=player.hp <= 0)
+
+
+def choose_action(player):
+    """Politique gloutonne pour les simulations: l'action disponible aux dégâts attendus les plus hauts"""
+    best = (ATTACK, 0)
+    best_damage = player.attack_power * (1 + player.critical_chance * (player.critical_multiplier - 1))
+    for index, skill in enumerate(player.skills):
+        if skill.name in player.cooldowns or player.mp < skill.mp_cost:
+            continue
+        damage = skill.base_damage + player.level * 2
+        if skill.base_damage > 0 and damage > best_damage:
+            best, best_damage = (SKILL, index), damage
+    return best
+
+
+def simulate_fight(player, monster, rng, policy=choose_action, max_turns=1000):
+    """Combat complet sans fuite; retourne (victoire, nombre de tours du joueur)
+
+    Les états sont modifiés sur place: passer des copies pour les réutiliser.
+    """
+    for turn in range(1, max_turns + 1):
+        action, skill_index = policy(player)
+        result = resolve_player_action(player, monster, action, rng, skill_index)
+        if not result.success:
+            result = resolve_player_action(player, monster, ATTACK, rng)
+        if result.target_defeated:
+            return True, turn
+        if resolve_monster_action(player, monster, rng).target_defeated:
+            return False, turn
+    return False, max_turns
@@ -1,15 +1,87 @@
 # config.py - Système de configuration complet
+import copy
 import json
 import pygame
 import os
+import time
+
+# Multiplicateur des dégâts des monstres selon la difficulté
+DIFFICULTY_MULTIPLIERS = {
+    "easy": 0.7,
+    "normal": 1.0,
+    "hard": 1.3,
+    "expert": 1.7
+}
+
+def coerce(value, default):
+    """Valeur du fichier convertie au type de la valeur par défaut (None si invalide)"""
+    if isinstance(default, bool):
+        return value if isinstance(value, bool) else None
+    if isinstance(default, (int, float)):
+        if isinstance(value, bool):
+            return None
+        try:
+            return type(default)(value)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(default, dict):
+        if not isinstance(value, dict):
+            return None
+        merged = copy.deepcopy(default)
+        merged.update(value)
+        return merged
+    if isinstance(default, (list, tuple)):
+        return list(value) if isinstance(value, (list, tuple)) else None
+    return value if isinstance(value, type(default)) else None
+
 
 class Config:
+    """Configuration typée, aplatie en {(section, clé): valeur}
+
+    Les écritures sont regroupées et différées (update() à chaque frame), et
+    le fichier est relu quand il change sur le disque: les écouteurs
+    enregistrés par section sont prévenus des clés modifiées.
+    """
+    WRITE_DELAY = 1.0  # Secondes sans modification avant l'écriture
+    RELOAD_INTERVAL = 1.0  # Secondes entre deux vérifications du fichier
+    
     def __init__(self, config_file="config.json"):
         self.config_file = config_file
         self.default_config = self.get_default_config()
         self.config = {}
+        self.values = {}  # (section, clé) -> valeur
+        self.listeners = {}  # Section -> [callback(clés modifiées)]
+        self.dirty_since = None  # Première modification non écrite
+        self.pending_keys = set()  # (section, clé) modifiées depuis la dernière écriture
+        self.last_change = 0.0
+        self.file_mtime = None
+        self.next_reload_check = 0.0
         self.load_config()
     
+    def build_values(self, data):
+        """Aplatit data sur les valeurs par défaut, en validant les types"""
+        values = {}
+        for category, settings in self.default_config.items():
+            section = data.get(category, {})
+            if not isinstance(section, dict):
+                section = {}
+            for key, default in settings.items():
+                value = coerce(section[key], default) if key in section else None
+                values[(category, key)] = copy.deepcopy(default) if value is None else value
+        return values
+    
+    def rebuild_config(self):
+        """Dictionnaire imbriqué (pour le fichier) à partir des valeurs aplaties"""
+        self.config = {category: {} for category in self.default_config}
+        for (category, key), value in self.values.items():
+            self.config.setdefault(category, {})[key] = value
+    
+    def get_file_mtime(self):
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+    
     def get_default_config(self):
         """Retourne la configuration par défaut"""
         return {
@@ -18,6 +90,9 @@ class Config:
                 "fullscreen": False,
                 "vsync": True,
                 "framerate": 60,
+                "frame_pacing": "sleep",  # sleep, busy, uncapped
+                "dirty_rects": True,
+                "chunk_memory_budget": 4,  # Mo de chunks du monde gardés en mémoire
                 "render_scale": 1.0,
                 "particles_quality": "medium",
                 "shadow_quality": "low"
@@ -27,12 +102,16 @@ class Config:
                 "music_volume": 0.7,
                 "sound_volume": 0.8,
                 "mute": False,
-                "enable_ambience": True
+                "enable_ambience": True,
+                "music_cache_budget": 8  # Mo de musiques préchargées gardées en mémoire
             },
             "gameplay": {
                 "difficulty": "normal",
+                "tick_rate": 60,
+                "ai_budget_ms": 2.0,
                 "autosave": True,
                 "autosave_interval": 300,
+                "save_slots": 10,
                 "tooltips": True,
                 "minimap": True,
                 "quest_markers": True,
@@ -50,6 +129,9 @@ class Config:
                     "attack": [pygame.K_SPACE],
                     "inventory": [pygame.K_i],
                     "skills": [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4],
+                    "quests": [pygame.K_q],
+                    "save": [pygame.K_F5],
+                    "confirm": [pygame.K_RETURN],
                     "pause": [pygame.K_ESCAPE]
                 },
                 "touch": {
@@ -91,49 +173,114 @@ class Config:
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
-                
-                # S'assurer que toutes les sections existent
-                for category, settings in self.default_config.items():
-                    if category not in self.config:
-                        self.config[category] = settings
-                    else:
-                        for key, value in settings.items():
-                            if key not in self.config[category]:
-                                self.config[category][key] = value
+                    data = json.load(f)
+                self.values = self.build_values(data if isinstance(data, dict) else {})
+                self.file_mtime = self.get_file_mtime()
+                self.rebuild_config()
             else:
-                self.config = self.default_config
+                self.values = self.build_values({})
+                self.rebuild_config()
                 self.save_config()
                 
         except (json.JSONDecodeError, IOError) as e:
             print(f"Erreur de chargement de la config: {e}")
-            self.config = self.default_config
+            self.values = self.build_values({})
+            self.rebuild_config()
     
     def save_config(self):
-        """Sauvegarde la configuration dans le fichier"""
+        """Sauvegarde la configuration dans le fichier (écriture atomique)"""
         try:
             # Créer le dossier si nécessaire
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+            directory = os.path.dirname(self.config_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
+            temp_file = self.config_file + ".tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.config_file)
+            self.file_mtime = self.get_file_mtime()  # Pas de rechargement de notre propre écriture
+            self.dirty_since = None
+            self.pending_keys.clear()
                 
         except IOError as e:
             print(f"Erreur de sauvegarde de la config: {e}")
     
     def get(self, category, key, default=None):
         """Récupère une valeur de configuration"""
-        try:
-            return self.config.get(category, {}).get(key, self.default_config[category][key])
-        except KeyError:
-            return default
+        return self.values.get((category, key), default)
     
     def set(self, category, key, value):
-        """Définit une valeur de configuration"""
-        if category not in self.config:
-            self.config[category] = {}
-        self.config[category][key] = value
-        self.save_config()
+        """Définit une valeur; écrite sur le disque plus tard par update()"""
+        if self.values.get((category, key)) == value:
+            return
+        self.values[(category, key)] = value
+        self.config.setdefault(category, {})[key] = value
+        self.pending_keys.add((category, key))
+        now = time.monotonic()
+        self.last_change = now
+        if self.dirty_since is None:
+            self.dirty_since = now
+        self.notify({category: {key}})
+    
+    def add_listener(self, category, callback):
+        """callback(clés modifiées) est appelé quand la section change"""
+        self.listeners.setdefault(category, []).append(callback)
+    
+    def notify(self, changes):
+        for category, keys in changes.items():
+            for callback in self.listeners.get(category, ()):
+                callback(keys)
+    
+    def update(self, now=None):
+        """À appeler à chaque frame: écriture différée et rechargement à chaud"""
+        now = time.monotonic() if now is None else now
+        # Écrit après WRITE_DELAY sans modification, ou au plus tard 5 × WRITE_DELAY
+        # après la première (réglage modifié en continu)
+        if self.dirty_since is not None and (
+                now - self.last_change >= self.WRITE_DELAY
+                or now - self.dirty_since >= self.WRITE_DELAY * 5):
+            self.save_config()
+        if now >= self.next_reload_check:
+            self.next_reload_check = now + self.RELOAD_INTERVAL
+            self.check_reload()
+    
+    def flush(self):
+        """Écrit tout de suite les modifications en attente (fermeture du jeu)"""
+        if self.dirty_since is not None:
+            self.save_config()
+    
+    def check_reload(self):
+        """Relit le fichier s'il a été modifié depuis le dernier chargement"""
+        mtime = self.get_file_mtime()
+        if mtime is None or mtime == self.file_mtime:
+            return {}
+        self.file_mtime = mtime
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            # Fichier en cours d'édition: on garde les valeurs actuelles
+            print(f"Erreur de rechargement de la config: {e}")
+            return {}
+        previous = self.values
+        self.values = self.build_values(data if isinstance(data, dict) else {})
+        # Les modifications locales pas encore écrites gardent la priorité
+        for name in self.pending_keys:
+            self.values[name] = previous[name]
+        self.rebuild_config()
+        changes = self.diff(previous, self.values)
+        self.notify(changes)
+        return changes
+    
+    @staticmethod
+    def diff(previous, values):
+        """{section: clés modifiées} entre deux jeux de valeurs aplaties"""
+        changes = {}
+        for (category, key), value in values.items():
+            if previous.get((category, key)) != value:
+                changes.setdefault(category, set()).add(key)
+        return changes
     
     def apply_graphics_settings(self, screen):
         """Applique les paramètres graphiques"""
@@ -158,10 +305,11 @@ class Config:
     def apply_audio_settings(self, audio_manager):
         """Applique les paramètres audio"""
         if audio_manager:
-            audio_manager.set_master_volume(self.get("audio", "master_volume"))
-            audio_manager.set_music_volume(self.get("audio", "music_volume"))
-            audio_manager.set_sound_volume(self.get("audio", "sound_volume"))
-            audio_manager.set_mute(self.get("audio", "mute"))
+            # Volume principal et muet appliqués aux deux volumes
+            master = 0.0 if self.get("audio", "mute") else self.get("audio", "master_volume")
+            audio_manager.set_music_volume(self.get("audio", "music_volume") * master)
+            audio_manager.set_sound_volume(self.get("audio", "sound_volume") * master)
+            audio_manager.set_music_cache_budget(self.get("audio", "music_cache_budget") * 1024 * 1024)
     
     def get_key_bindings(self):
         """Retourne les bindings de touches"""
@@ -177,16 +325,13 @@ class Config:
     
     def reset_to_defaults(self):
         """Réinitialise la configuration aux valeurs par défaut"""
-        self.config = self.default_config
+        previous = self.values
+        self.values = self.build_values({})
+        self.rebuild_config()
         self.save_config()
+        self.notify(self.diff(previous, self.values))
     
     def get_difficulty_multiplier(self):
         """Retourne le multiplicateur de difficulté"""
         difficulty = self.get("gameplay", "difficulty")
-        multipliers = {
-            "easy": 0.7,
-            "normal": 1.0,
-            "hard": 1.3,
-            "expert": 1.7
-        }
-        return multipliers.get(difficulty, 1.0)
+        return DIFFICULTY_MULTIPLIERS.get(difficulty, 1.0)
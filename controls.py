@@ -1,23 +1,72 @@
-# controls.py - Système de contrôle clavier ET tactile
+# controls.py - Couche d'entrées: actions compilées depuis le clavier, le tactile et la manette
 import pygame
+from fonts import get_font, render_text
+
+# Bouton de manette (disposition SDL courante) -> actions
+GAMEPAD_BUTTONS = {
+    0: ("attack", "confirm"),
+    1: ("pause",),
+    2: ("interact",),
+    3: ("inventory",),
+    4: ("skill_2",),
+    5: ("skill_3",),
+    6: ("quests",),
+    7: ("save",),
+}
+
+# Seuil d'inclinaison du joystick tactile pour activer une direction
+TOUCH_THRESHOLD = 0.3
+
 
 class ControlSystem:
-    def __init__(self):
-        # États de contrôle
-        self.move_up = False
-        self.move_down = False
-        self.move_left = False
-        self.move_right = False
-        self.interact = False
-        self.attack = False
-        self.inventory = False
-        
-        # Contrôles tactiles
+    """Traduit les événements en actions, avec un état par tick
+    
+    Les bindings sont compilés en un dictionnaire touche -> actions: chaque
+    événement coûte une recherche. update(), appelé une fois par tick,
+    calcule les actions pressées, maintenues et relâchées depuis le tick
+    précédent, toutes sources confondues.
+    """
+    
+    def __init__(self, key_bindings=None, keyboard_enabled=True, touch_enabled=False, gamepad_settings=None,
+                 touch_settings=None, scale_factor=1.0, screen_size=(800, 600)):
+        self.keyboard_enabled = keyboard_enabled
+        self.touch_enabled = touch_enabled
+        gamepad_settings = gamepad_settings or {}
+        self.gamepad_enabled = gamepad_settings.get("enabled", False)
+        self.gamepad_deadzone = gamepad_settings.get("deadzone", 0.15)
+        self.screen_size = screen_size  # Conversion des coordonnées normalisées des doigts
+        
+        # Clavier: touches enfoncées et nombre de touches tenant chaque action
+        self.key_bindings = {}
+        self.key_actions = {}  # Touche -> tuple d'actions
+        self.keys_down = set()
+        self.keyboard_counts = {}
+        
+        # Tactile: pointeur (souris ou doigt) -> contrôle tenu
         self.touch_controls = []
+        self.touch_pointers = {}
+        self.touch_held = set()
+        self.touch_moves = set()
+        self.overlay_key = None  # (opacité, taille, échelle, écran) des surfaces en cache
+        self.overlay = []  # (surface, rect) précalculés, un par contrôle
+        self.knob_surface = None
+        self.knob_travel = 0
         self.create_touch_controls()
+        self.set_touch_layout(touch_settings or {}, scale_factor, screen_size)
+        
+        # Manette
+        self.joysticks = {}  # Id d'instance -> pygame.joystick.Joystick
+        self.gamepad_counts = {}
+        self.gamepad_axes = [0.0, 0.0]
+        self.gamepad_hat = (0, 0)
+        
+        # État par tick
+        self.tapped = set()  # Actions enfoncées depuis le dernier tick (même relâchées depuis)
+        self.held = frozenset()
+        self.pressed = frozenset()
+        self.released = frozenset()
         
-        # Configuration des touches
-        self.key_bindings = {
+        self.compile_bindings(key_bindings or {
             "move_up": [pygame.K_UP, pygame.K_w],
             "move_down": [pygame.K_DOWN, pygame.K_s],
             "move_left": [pygame.K_LEFT, pygame.K_a],
@@ -25,10 +74,33 @@ class ControlSystem:
             "interact": [pygame.K_e],
             "attack": [pygame.K_SPACE],
             "inventory": [pygame.K_i]
-        }
+        })
+    
+    def compile_bindings(self, key_bindings):
+        """Compile les bindings {action: [touches]} en {touche: (actions)}
+        
+        Les listes de compétences donnent une action par touche: skill_1, skill_2...
+        """
+        self.key_bindings = {action: list(keys) for action, keys in key_bindings.items()}
+        key_actions = {}
+        for action, keys in self.key_bindings.items():
+            for index, key in enumerate(keys):
+                name = f"skill_{index + 1}" if action == "skills" else action
+                key_actions.setdefault(key, []).append(name)
+        self.key_actions = {key: tuple(actions) for key, actions in key_actions.items()}
+        
+        # Les touches déjà enfoncées suivent les nouveaux bindings
+        self.keyboard_counts = {}
+        for key in self.keys_down:
+            for action in self.key_actions.get(key, ()):
+                self.keyboard_counts[action] = self.keyboard_counts.get(action, 0) + 1
+    
+    def rebind(self, action, keys):
+        self.key_bindings[action] = list(keys)
+        self.compile_bindings(self.key_bindings)
     
     def create_touch_controls(self):
-        """Crée les boutons de contrôle tactiles"""
+        """Crée les boutons de contrôle tactiles (placés par layout_touch_controls)"""
         # Zone de déplacement (joystick virtuel)
         self.touch_controls.append({
             "type": "joystick",
@@ -37,7 +109,7 @@ class ControlSystem:
             "direction": (0, 0)
         })
         
-        # Boutons d'action
+        # Boutons d'action, de droite à gauche
         self.touch_controls.append({
             "type": "button",
             "action": "interact",
@@ -59,69 +131,136 @@ class ControlSystem:
             "icon": "🎒"
         })
     
+    def set_touch_layout(self, touch_settings, scale_factor=1.0, screen_size=None):
+        """Place les contrôles et précalcule leurs surfaces
+        
+        Ne fait rien si l'opacité, la taille, l'échelle et l'écran n'ont pas changé.
+        """
+        screen_size = tuple(screen_size or self.screen_size)
+        key = (
+            touch_settings.get("opacity", 150),
+            touch_settings.get("size", 80),
+            scale_factor,
+            screen_size
+        )
+        if key == self.overlay_key:
+            return
+        self.overlay_key = key
+        self.screen_size = screen_size
+        opacity, size, scale_factor, _ = key
+        self.layout_touch_controls(int(size * scale_factor), scale_factor)
+        if self.touch_enabled:
+            self.build_overlay(opacity)
+    
+    def layout_touch_controls(self, button_size, scale_factor):
+        """Ancre les contrôles en bas de l'écran (taille 80, échelle 1: disposition 800x600 d'origine)"""
+        width, height = self.screen_size
+        joystick_size = button_size * 15 // 8
+        margin = int(50 * scale_factor)
+        spacing = button_size + int(20 * scale_factor)
+        right = width - int(20 * scale_factor) - button_size
+        for control in self.touch_controls:
+            if control["type"] == "joystick":
+                control["rect"] = pygame.Rect(margin, height - joystick_size, joystick_size, joystick_size)
+            else:
+                control["rect"] = pygame.Rect(right, height - joystick_size, button_size, button_size)
+                right -= spacing
+    
+    def build_overlay(self, opacity):
+        """Dessine une fois les fonds et icônes; seul le stick est dessiné à chaque frame"""
+        self.overlay = []
+        font = None
+        for control in self.touch_controls:
+            rect = control["rect"]
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            pygame.draw.circle(surface, (100, 100, 100, opacity), (rect.width // 2, rect.height // 2), rect.width // 2)
+            if control["type"] == "button":
+                font = font or get_font("Arial", max(8, rect.width * 3 // 10))
+                text = render_text(font, control["icon"], (255, 255, 255))
+                surface.blit(text, text.get_rect(center=(rect.width // 2, rect.height // 2)))
+            self.overlay.append((surface, rect))
+        
+        # Stick du joystick: un cercle de 20 px (échelle 1) qui se déplace de 30 px autour du centre
+        joystick = self.touch_controls[0]["rect"]
+        radius = max(2, joystick.width * 2 // 15)
+        self.knob_travel = joystick.width // 5
+        self.knob_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.knob_surface, (200, 200, 200, min(255, opacity + 50)), (radius, radius), radius)
+    
     def handle_event(self, event):
-        """Gère les événements d'entrée"""
-        # Réinitialiser les états
-        self.interact = False
-        self.attack = False
-        self.inventory = False
-        
-        # Contrôles clavier
-        if event.type == pygame.KEYDOWN:
-            if event.key in self.key_bindings["move_up"]:
-                self.move_up = True
-            elif event.key in self.key_bindings["move_down"]:
-                self.move_down = True
-            elif event.key in self.key_bindings["move_left"]:
-                self.move_left = True
-            elif event.key in self.key_bindings["move_right"]:
-                self.move_right = True
-            elif event.key in self.key_bindings["interact"]:
-                self.interact = True
-            elif event.key in self.key_bindings["attack"]:
-                self.attack = True
-            elif event.key in self.key_bindings["inventory"]:
-                self.inventory = True
-        
-        elif event.type == pygame.KEYUP:
-            if event.key in self.key_bindings["move_up"]:
-                self.move_up = False
-            elif event.key in self.key_bindings["move_down"]:
-                self.move_down = False
-            elif event.key in self.key_bindings["move_left"]:
-                self.move_left = False
-            elif event.key in self.key_bindings["move_right"]:
-                self.move_right = False
-        
-        # Contrôles tactiles
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            self.handle_touch_event(event.pos, True)
-        
-        elif event.type == pygame.MOUSEBUTTONUP:
-            self.handle_touch_event(event.pos, False)
-        
-        elif event.type == pygame.MOUSEMOTION:
-            self.handle_touch_drag(event.pos)
-    
-    def handle_touch_event(self, pos, is_pressed):
+        """Met à jour l'état des sources; les actions sont calculées par update()"""
+        event_type = event.type
+        if event_type == pygame.KEYDOWN:
+            if self.keyboard_enabled:
+                self.key_down(event.key)
+        elif event_type == pygame.KEYUP:
+            self.key_up(event.key)
+        
+        elif self.touch_enabled and event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
+            if event_type == pygame.MOUSEBUTTONDOWN:
+                self.touch_down("mouse", event.pos)
+            elif event_type == pygame.MOUSEBUTTONUP:
+                self.touch_up("mouse")
+            else:
+                self.touch_move("mouse", event.pos)
+        
+        elif self.touch_enabled and event_type in (pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION):
+            pos = (event.x * self.screen_size[0], event.y * self.screen_size[1])
+            if event_type == pygame.FINGERDOWN:
+                self.touch_down(event.finger_id, pos)
+            elif event_type == pygame.FINGERUP:
+                self.touch_up(event.finger_id)
+            else:
+                self.touch_move(event.finger_id, pos)
+        
+        elif self.gamepad_enabled:
+            self.handle_gamepad_event(event)
+    
+    def key_down(self, key):
+        if key in self.keys_down:
+            return  # Répétition
+        self.keys_down.add(key)
+        for action in self.key_actions.get(key, ()):
+            self.keyboard_counts[action] = self.keyboard_counts.get(action, 0) + 1
+            self.tapped.add(action)
+    
+    def key_up(self, key):
+        if key not in self.keys_down:
+            return
+        self.keys_down.discard(key)
+        for action in self.key_actions.get(key, ()):
+            self.keyboard_counts[action] -= 1
+    
+    def touch_down(self, pointer, pos):
         """Gère les événements tactiles"""
         for control in self.touch_controls:
             if control["rect"].collidepoint(pos):
-                if control["type"] == "joystick" and is_pressed:
+                self.touch_pointers[pointer] = control
+                if control["type"] == "joystick":
                     control["active"] = True
                     self.update_joystick_direction(pos, control)
-                elif control["type"] == "button" and is_pressed:
-                    setattr(self, control["action"], True)
-                elif control["type"] == "joystick" and not is_pressed:
-                    control["active"] = False
-                    control["direction"] = (0, 0)
-                    self.move_up = self.move_down = self.move_left = self.move_right = False
-    
-    def handle_touch_drag(self, pos):
+                else:
+                    self.touch_held.add(control["action"])
+                    self.tapped.add(control["action"])
+                return
+    
+    def touch_up(self, pointer):
+        # Le contrôle est relâché même si le doigt a glissé hors de sa zone
+        control = self.touch_pointers.pop(pointer, None)
+        if control is None:
+            return
+        if control["type"] == "joystick":
+            control["active"] = False
+            control["direction"] = (0, 0)
+            self.touch_moves = set()
+        else:
+            self.touch_held.discard(control["action"])
+    
+    def touch_move(self, pointer, pos):
         """Gère le glissement sur le joystick virtuel"""
-        for control in self.touch_controls:
-            if control["type"] == "joystick" and control["active"]:
-                self.update_joystick_direction(pos, control)
+        control = self.touch_pointers.get(pointer)
+        if control is not None and control["type"] == "joystick":
+            self.update_joystick_direction(pos, control)
     
     def update_joystick_direction(self, pos, joystick):
         """Met à jour la direction du joystick virtuel"""
@@ -137,21 +276,75 @@ class ControlSystem:
         norm_dy = dy / distance
         
         # Seuils pour activer les directions
-        self.move_up = norm_dy < -0.3
-        self.move_down = norm_dy > 0.3
-        self.move_left = norm_dx < -0.3
-        self.move_right = norm_dx > 0.3
-        
+        self.touch_moves = directions_from_axes(norm_dx, norm_dy, TOUCH_THRESHOLD)
         joystick["direction"] = (norm_dx, norm_dy)
     
+    def handle_gamepad_event(self, event):
+        event_type = event.type
+        if event_type == pygame.JOYBUTTONDOWN:
+            for action in GAMEPAD_BUTTONS.get(event.button, ()):
+                self.gamepad_counts[action] = self.gamepad_counts.get(action, 0) + 1
+                self.tapped.add(action)
+        elif event_type == pygame.JOYBUTTONUP:
+            for action in GAMEPAD_BUTTONS.get(event.button, ()):
+                self.gamepad_counts[action] = max(0, self.gamepad_counts.get(action, 0) - 1)
+        elif event_type == pygame.JOYAXISMOTION and event.axis < 2:
+            self.gamepad_axes[event.axis] = event.value
+        elif event_type == pygame.JOYHATMOTION and event.hat == 0:
+            self.gamepad_hat = event.value
+        elif event_type == pygame.JOYDEVICEADDED:
+            joystick = pygame.joystick.Joystick(event.device_index)
+            self.joysticks[joystick.get_instance_id()] = joystick
+        elif event_type == pygame.JOYDEVICEREMOVED:
+            self.joysticks.pop(event.instance_id, None)
+    
+    def update(self):
+        """Calcule l'état des actions pour ce tick (une fois par tick)"""
+        held = {action for action, count in self.keyboard_counts.items() if count}
+        held.update(action for action, count in self.gamepad_counts.items() if count)
+        held |= self.touch_held
+        held |= self.touch_moves
+        if self.gamepad_enabled:
+            held |= directions_from_axes(self.gamepad_axes[0], self.gamepad_axes[1], self.gamepad_deadzone)
+            held |= directions_from_axes(self.gamepad_hat[0], -self.gamepad_hat[1], 0.5)
+        
+        previous = self.held
+        self.pressed = frozenset((held - previous) | self.tapped)
+        self.released = frozenset((previous - held) | (self.tapped - held))
+        self.held = frozenset(held)
+        self.tapped = set()
+    
+    def is_pressed(self, action):
+        """Vrai au premier tick où l'action est enfoncée"""
+        return action in self.pressed
+    
+    def is_held(self, action):
+        return action in self.held
+    
+    def is_released(self, action):
+        return action in self.released
+    
+    def reset(self):
+        """Oublie toutes les entrées en cours (changement d'écran)"""
+        self.keys_down.clear()
+        self.keyboard_counts = {}
+        self.touch_pointers.clear()
+        self.touch_held.clear()
+        self.touch_moves = set()
+        self.gamepad_counts = {}
+        self.tapped = set()
+        self.held = self.pressed = self.released = frozenset()
+    
+    def get_direction(self):
+        """Direction de déplacement (-1, 0 ou 1 par axe)"""
+        held = self.held
+        dx = ("move_right" in held) - ("move_left" in held)
+        dy = ("move_down" in held) - ("move_up" in held)
+        return dx, dy
+    
     def get_movement_vector(self):
         """Retourne le vecteur de mouvement normalisé"""
-        dx, dy = 0, 0
-        
-        if self.move_up: dy -= 1
-        if self.move_down: dy += 1
-        if self.move_left: dx -= 1
-        if self.move_right: dx += 1
+        dx, dy = self.get_direction()
         
         # Normaliser le vecteur pour les déplacements diagonaux
         if dx != 0 and dy != 0:
@@ -162,40 +355,32 @@ class ControlSystem:
         return dx, dy
     
     def draw_touch_controls(self, screen):
-        """Dessine les contrôles tactiles à l'écran"""
-        for control in self.touch_controls:
-            if control["type"] == "joystick":
-                self.draw_joystick(screen, control)
-            elif control["type"] == "button":
-                self.draw_button(screen, control)
-    
-    def draw_joystick(self, screen, joystick):
-        """Dessine le joystick virtuel"""
-        # Cercle de fond (semi-transparent)
-        s = pygame.Surface((joystick["rect"].width, joystick["rect"].height), pygame.SRCALPHA)
-        pygame.draw.circle(s, (100, 100, 100, 150), 
-                          (joystick["rect"].width//2, joystick["rect"].height//2),
-                          joystick["rect"].width//2)
-        screen.blit(s, joystick["rect"])
+        """Dessine les contrôles tactiles à l'écran; retourne les zones dessinées"""
+        rects = []
+        for surface, rect in self.overlay:
+            screen.blit(surface, rect)
+            rects.append(rect)
         
         # Stick du joystick
+        joystick = self.touch_controls[0]
         if joystick["active"]:
-            stick_pos = (
-                joystick["rect"].centerx + joystick["direction"][0] * 30,
-                joystick["rect"].centery + joystick["direction"][1] * 30
+            center = (
+                joystick["rect"].centerx + joystick["direction"][0] * self.knob_travel,
+                joystick["rect"].centery + joystick["direction"][1] * self.knob_travel
             )
-            pygame.draw.circle(screen, (200, 200, 200, 200), stick_pos, 20)
-    
-    def draw_button(self, screen, button):
-        """Dessine un bouton tactile"""
-        # Fond du bouton (semi-transparent)
-        s = pygame.Surface((button["rect"].width, button["rect"].height), pygame.SRCALPHA)
-        pygame.draw.circle(s, (100, 100, 100, 150), 
-                          (button["rect"].width//2, button["rect"].height//2),
-                          button["rect"].width//2)
-        screen.blit(s, button["rect"])
-        
-        # Icône du bouton
-        font = pygame.font.SysFont("Arial", 24)
-        text = font.render(button["icon"], True, (255, 255, 255))
-        screen.blit(text, button["rect"].center)
+            screen.blit(self.knob_surface, self.knob_surface.get_rect(center=center))
+        return rects
+
+
+def directions_from_axes(x, y, threshold):
+    """Actions de déplacement d'un axe analogique (x, y dans [-1, 1])"""
+    directions = set()
+    if y < -threshold:
+        directions.add("move_up")
+    elif y > threshold:
+        directions.add("move_down")
+    if x < -threshold:
+        directions.add("move_left")
+    elif x > threshold:
+        directions.add("move_right")
+    return directions
@@ -1,4 +1,6 @@
 # dialogue.py - Système de dialogues avec les PNJ
+from entity_store import EntityStore
+
 class DialogueSystem:
     def __init__(self):
         self.dialogues = self.load_dialogues()
@@ -62,17 +64,30 @@ class DialogueSystem:
         self.current_line = 0
 
 class NPC:
-    def __init__(self, name, npc_type, position, dialogues):
+    INTERACTION_RANGE = 50
+    
+    def __init__(self, name, npc_type, position, dialogues, store=None):
+        self.store = store if store is not None else EntityStore(capacity=1)
+        self.index = self.store.allocate(self, "npc", position)
         self.name = name
         self.type = npc_type  # merchant, quest_giver, etc.
-        self.position = position
         self.dialogues = dialogues
-        self.interaction_range = 50
+        self.interaction_range = self.INTERACTION_RANGE
+    
+    @property
+    def position(self):
+        return self.store.positions[self.index]
+    
+    @position.setter
+    def position(self, value):
+        # Placement direct (téléportation): pas d'interpolation depuis l'ancienne position
+        self.store.positions[self.index] = value
+        self.store.previous_positions[self.index] = value
     
     def can_interact(self, player_position):
-        distance = ((self.position[0] - player_position[0])**2 + 
-                   (self.position[1] - player_position[1])**2)**0.5
-        return distance <= self.interaction_range
+        dx = self.position[0] - player_position[0]
+        dy = self.position[1] - player_position[1]
+        return dx * dx + dy * dy <= self.interaction_range * self.interaction_range
     
     def interact(self, dialogue_system):
         return dialogue_system.start_dialogue(self.name, "greeting")
@@ -0,0 +1,145 @@
+# entity_store.py - Stockage des entités en tableaux NumPy (structure de tableaux)
+import numpy as np
+
+
+class EntityStore:
+    """Positions, vitesses, PV, niveaux et types des entités en tableaux contigus
+
+    Monster et NPC ne sont que des vues sur une ligne du store: les systèmes
+    peuvent traiter toutes les entités d'un coup avec des opérations vectorisées.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)
+        self.previous_positions = np.zeros((capacity, 2), dtype=np.float64)  # Avant le dernier integrate
+        self.velocities = np.zeros((capacity, 2), dtype=np.float64)  # px par seconde
+        self.hp = np.zeros(capacity, dtype=np.int64)
+        self.max_hp = np.zeros(capacity, dtype=np.int64)
+        self.levels = np.zeros(capacity, dtype=np.int32)
+        self.type_ids = np.full(capacity, -1, dtype=np.int16)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.entities = [None] * capacity  # Index -> objet vue (Monster, NPC)
+        self.type_names = []  # Id de type -> nom
+        self.type_lookup = {}  # Nom -> id de type
+        self.free_indices = []
+        self.count = 0  # Nombre d'index déjà utilisés
+
+    def get_type_id(self, type_name):
+        type_id = self.type_lookup.get(type_name)
+        if type_id is None:
+            type_id = len(self.type_names)
+            self.type_names.append(type_name)
+            self.type_lookup[type_name] = type_id
+        return type_id
+
+    def allocate(self, entity, type_name, position, hp=0, level=0):
+        """Réserve une ligne pour une entité et retourne son index"""
+        if self.free_indices:
+            index = self.free_indices.pop()
+        else:
+            if self.count == self.capacity:
+                self.grow()
+            index = self.count
+            self.count += 1
+
+        self.positions[index] = position
+        self.previous_positions[index] = position
+        self.velocities[index] = 0.0
+        self.hp[index] = hp
+        self.max_hp[index] = hp
+        self.levels[index] = level
+        self.type_ids[index] = self.get_type_id(type_name)
+        self.alive[index] = True
+        self.entities[index] = entity
+        return index
+
+    def release(self, index):
+        self.alive[index] = False
+        self.type_ids[index] = -1
+        self.velocities[index] = 0.0
+        self.entities[index] = None
+        self.free_indices.append(index)
+
+    def grow(self):
+        """Double la capacité (les vues passent par l'index, elles restent valides)"""
+        new_capacity = self.capacity * 2
+        for name in ("positions", "previous_positions", "velocities"):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity, 2), dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        for name, fill in (("hp", 0), ("max_hp", 0), ("levels", 0), ("type_ids", -1), ("alive", False)):
+            old = getattr(self, name)
+            new = np.full(new_capacity, fill, dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.entities.extend([None] * (new_capacity - self.capacity))
+        self.capacity = new_capacity
+
+    def active_indices(self, type_name=None):
+        mask = self.alive[:self.count]
+        if type_name is not None:
+            mask = mask & (self.type_ids[:self.count] == self.type_lookup.get(type_name, -2))
+        return np.nonzero(mask)[0]
+
+    def integrate(self, dt, collision_grid=None, tile_size=16, size=16):
+        """Déplace toutes les entités vivantes selon leur vitesse (dt en ms)
+
+        Avec une grille de collision (tableau 2D, non nul = bloqué), les entités
+        dont la nouvelle boîte touche une tuile bloquée restent sur place.
+        Retourne les index effectivement déplacés.
+        """
+        # Point de départ de l'interpolation du rendu (immobiles compris)
+        self.previous_positions[:self.count] = self.positions[:self.count]
+        indices = np.nonzero(self.alive[:self.count] & np.any(self.velocities[:self.count] != 0, axis=1))[0]
+        if len(indices) == 0:
+            return indices
+
+        new_positions = self.positions[indices] + self.velocities[indices] * (dt / 1000.0)
+        if collision_grid is not None:
+            blocked = self.boxes_blocked(new_positions, collision_grid, tile_size, size)
+            indices = indices[~blocked]
+            new_positions = new_positions[~blocked]
+        self.positions[indices] = new_positions
+        return indices
+
+    def boxes_blocked(self, positions, collision_grid, tile_size, size):
+        """Pour chaque position, vrai si l'un des quatre coins touche une tuile bloquée"""
+        rows, cols = collision_grid.shape
+        blocked = np.zeros(len(positions), dtype=bool)
+        for offset_x in (0, size - 0.001):
+            for offset_y in (0, size - 0.001):
+                tx = np.floor((positions[:, 0] + offset_x) / tile_size).astype(np.int64)
+                ty = np.floor((positions[:, 1] + offset_y) / tile_size).astype(np.int64)
+                outside = (tx < 0) | (ty < 0) | (tx >= cols) | (ty >= rows)
+                blocked |= outside
+                inside = ~outside
+                blocked[inside] |= collision_grid[ty[inside], tx[inside]] != 0
+        return blocked
+
+    def distances_sq_to(self, point, indices=None):
+        """Distances au carré entre un point et les entités (toutes, ou indices)"""
+        if indices is None:
+            indices = self.active_indices()
+        delta = self.positions[indices] - np.asarray(point, dtype=np.float64)
+        return np.einsum("ij,ij->i", delta, delta)
+
+    def cull(self, rect, margin=16, type_name=None):
+        """Index des entités dont la position tombe dans rect (élargi de margin)"""
+        indices = self.active_indices(type_name)
+        positions = self.positions[indices]
+        x, y, width, height = rect
+        mask = (
+            (positions[:, 0] >= x - margin) & (positions[:, 0] <= x + width + margin)
+            & (positions[:, 1] >= y - margin) & (positions[:, 1] <= y + height + margin)
+        )
+        return indices[mask]
+
+    def interpolate(self, indices, alpha):
+        """Positions de rendu entre l'avant-dernier et le dernier pas simulé"""
+        previous = self.previous_positions[indices]
+        return previous + (self.positions[indices] - previous) * alpha
+
+    def get_entities(self, indices):
+        return [self.entities[i] for i in indices]
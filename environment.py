@@ -1,24 +1,31 @@
 # environment.py - Gestion de l'environnement et des zones
+import random
+import numpy as np
+from entity_store import EntityStore
+from spatial import SpatialHash
+from tilemap import TileMap, TILE_SIZE
+
 class Environment:
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()  # Génération du monde (reproductible si graine)
         self.zones = {
             "village": {
                 "monsters": [],
                 "npcs": ["marchand", "forgeron", "aubergiste"],
                 "background": "village_bg",
-                "music": "village_theme"
+                "music": "village"
             },
             "foret": {
                 "monsters": [("slime", 1), ("rat", 1), ("slime", 2)],
                 "npcs": ["chasseur"],
                 "background": "forest_bg",
-                "music": "forest_theme"
+                "music": "forest"
             },
             "marais": {
                 "monsters": [("slime", 3), ("rat", 4), ("slime", 5)],
                 "npcs": ["ermite"],
                 "background": "marsh_bg",
-                "music": "marsh_theme",
+                "music": "marsh",
                 "boss": "Korvash"
             }
         }
@@ -28,33 +35,145 @@ class Environment:
             "foret": {"x": (400, 800), "y": (0, 300)},
             "marais": {"x": (0, 400), "y": (300, 600)}
         }
+        self.current_zone = "village"
         
-        # Générer les monstres initiaux
-        self.generate_monsters()
+        # Carte en tuiles et grille de collision
+        self.tilemap = TileMap.load()
+        
+        # Index spatial des monstres et PNJs
+        self.spatial_index = SpatialHash(cell_size=64)
+        
+        # Données des monstres et PNJs en tableaux contigus
+        self.entity_store = EntityStore()
+        self.collision_grid = np.frombuffer(self.tilemap.collision, dtype=np.uint8).reshape(
+            self.tilemap.height, self.tilemap.width
+        )
+        
+        # Appelés pour chaque monstre retiré du monde (animations, IA)
+        self.removal_listeners = []
+        
+        # Les monstres d'une zone sont créés quand ses chunks sont chargés
     
     def generate_monsters(self):
-        from monsters import Slime, Rat
-        monster_classes = {"slime": Slime, "rat": Rat}
-        
-        for zone_name, zone_data in self.zones.items():
-            zone_data["monster_instances"] = []
-            for monster_type, level in zone_data["monsters"]:
-                # Position aléatoire dans la zone
-                x_min, x_max = self.zone_boundaries[zone_name]["x"]
-                y_min, y_max = self.zone_boundaries[zone_name]["y"]
-                x = random.randint(x_min, x_max)
-                y = random.randint(y_min, y_max)
-                
-                monster = monster_classes[monster_type](level, [x, y])
-                zone_data["monster_instances"].append(monster)
+        """(Re)génère les monstres de toutes les zones"""
+        for zone_name in self.zones:
+            self.generate_zone_monsters(zone_name)
+    
+    def ensure_zone_loaded(self, zone_name):
+        """Crée les monstres d'une zone si ce n'est pas encore fait"""
+        if "monster_instances" not in self.zones[zone_name]:
+            self.generate_zone_monsters(zone_name)
+    
+    def generate_zone_monsters(self, zone_name):
+        self.clear_zone_monsters(zone_name)
+        for monster_type, level in self.zones[zone_name]["monsters"]:
+            # Position aléatoire dans la zone
+            x_min, x_max = self.zone_boundaries[zone_name]["x"]
+            y_min, y_max = self.zone_boundaries[zone_name]["y"]
+            x = self.rng.randint(x_min, x_max)
+            y = self.rng.randint(y_min, y_max)
+            for _ in range(20):
+                if not self.check_collision([x, y]):
+                    break
+                x = self.rng.randint(x_min, x_max)
+                y = self.rng.randint(y_min, y_max)
+            
+            self.add_monster(zone_name, monster_type, level, [x, y])
+    
+    def clear_zone_monsters(self, zone_name):
+        zone_data = self.zones[zone_name]
+        for monster in zone_data.get("monster_instances", []):
+            self.spatial_index.remove(monster)
+            for listener in self.removal_listeners:
+                listener(monster)
+            monster.release()
+        zone_data["monster_instances"] = []
+    
+    def add_removal_listener(self, callback):
+        self.removal_listeners.append(callback)
+    
+    def add_monster(self, zone_name, monster_type, level, position):
+        from monsters import create_monster
+        monster = create_monster(monster_type, level, position, self.entity_store)
+        monster.zone = zone_name
+        self.zones[zone_name]["monster_instances"].append(monster)
+        self.spatial_index.insert(monster, "monster")
+        return monster
+    
+    def restore_zone_monsters(self, zone_name, monsters):
+        """Recrée les monstres d'une zone sauvegardée: [(type, niveau, position, pv)]"""
+        self.clear_zone_monsters(zone_name)
+        for monster_type, level, position, hp in monsters:
+            self.add_monster(zone_name, monster_type, level, position).hp = hp
     
     def get_monsters_in_current_zone(self, zone_name):
-        return self.zones[zone_name]["monster_instances"]
+        return self.zones[zone_name].get("monster_instances", [])
+    
+    def get_zone_music(self, zone_name):
+        return self.zones[zone_name]["music"]
+    
+    def get_zones_in_rect(self, rect):
+        """Zones dont les limites recouvrent un rectangle monde"""
+        zones = []
+        for zone_name, boundaries in self.zone_boundaries.items():
+            x_min, x_max = boundaries["x"]
+            y_min, y_max = boundaries["y"]
+            if rect.left <= x_max and rect.right >= x_min and rect.top <= y_max and rect.bottom >= y_min:
+                zones.append(zone_name)
+        return zones
+    
+    def register_entity(self, entity, tag):
+        """Ajoute une entité (PNJ, monstre) à l'index spatial"""
+        self.spatial_index.insert(entity, tag)
+    
+    def update_entity(self, entity):
+        """À appeler quand une entité indexée se déplace"""
+        self.spatial_index.update(entity)
+    
+    def remove_monster(self, monster):
+        """Retire un monstre vaincu de sa zone et de l'index"""
+        self.spatial_index.remove(monster)
+        instances = self.zones[monster.zone]["monster_instances"]
+        if monster in instances:
+            instances.remove(monster)
+            for listener in self.removal_listeners:
+                listener(monster)
+            monster.release()
+    
+    def update_entities(self, dt):
+        """Déplacement vectorisé de toutes les entités, puis mise à jour de l'index"""
+        moved = self.entity_store.integrate(dt, self.collision_grid, self.tilemap.tile_size)
+        for index in moved:
+            self.spatial_index.update(self.entity_store.entities[index])
+    
+    def get_visible_monsters(self, view_rect, zone_name, alpha=1.0):
+        """Monstres de la zone dans la vue (tri vectorisé sur les positions)
+        
+        Retourne des paires (monstre, position de rendu interpolée avec alpha).
+        """
+        indices = self.entity_store.cull(view_rect)
+        positions = self.entity_store.interpolate(indices, alpha)
+        return [
+            (entity, position) for entity, position in zip(self.entity_store.get_entities(indices), positions)
+            if getattr(entity, "zone", None) == zone_name
+        ]
+    
+    def query_radius(self, position, radius, tag=None):
+        return self.spatial_index.query_radius(position, radius, tag)
+    
+    def query_rect(self, x, y, width, height, tag=None):
+        return self.spatial_index.query_rect(x, y, width, height, tag)
+    
+    def nearest(self, position, max_radius, tag=None, predicate=None):
+        return self.spatial_index.nearest(position, max_radius, tag, predicate)
+    
+    def check_collision(self, position, size=TILE_SIZE):
+        """Collision d'une entité (carré de size px) avec la grille de tuiles"""
+        return self.tilemap.rect_collides(position[0], position[1], size, size)
     
-    def check_collision(self, position):
-        # Vérifier les collisions avec les obstacles
-        # À adapter selon votre carte
-        return False
+    def sweep(self, position, dx, dy, size=TILE_SIZE):
+        """Position atteinte après un déplacement axe par axe contre la grille"""
+        return self.tilemap.sweep(position[0], position[1], size, size, dx, dy)
     
     def get_zone_at_position(self, position):
         x, y = position
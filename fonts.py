@@ -0,0 +1,88 @@
+# fonts.py - Registre de polices et cache des textes rendus
+import pygame
+from collections import OrderedDict
+
+
+class FontRegistry:
+    """Polices partagées, créées une seule fois par (famille, taille, style)"""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, family, size, bold=False, italic=False):
+        key = (family, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.SysFont(family, size, bold=bold, italic=italic)
+            self.fonts[key] = font
+        return font
+
+    def clear(self):
+        self.fonts.clear()
+
+
+class TextCache:
+    """Cache LRU des surfaces de texte, borné en mémoire"""
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Équivalent de font.render(text, antialias, color), mis en cache"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        size = self.get_surface_bytes(surface)
+        if size > self.max_bytes:
+            return surface  # Trop gros pour être gardé
+
+        self.surfaces[key] = surface
+        self.used_bytes += size
+        while self.used_bytes > self.max_bytes:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.used_bytes -= self.get_surface_bytes(evicted)
+        return surface
+
+    def get_surface_bytes(self, surface):
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def get_stats(self):
+        """Compteurs du cache pour le profilage"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.surfaces),
+            "bytes": self.used_bytes
+        }
+
+    def clear(self):
+        self.surfaces.clear()
+        self.used_bytes = 0
+
+
+# Instances partagées par tout le jeu
+font_registry = FontRegistry()
+text_cache = TextCache()
+
+
+def get_font(family, size, bold=False, italic=False):
+    return font_registry.get(family, size, bold, italic)
+
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
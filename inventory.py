@@ -1,62 +1,247 @@
-# inventory.py - Système d'inventaire et d'équipement
-class Item:
-    def __init__(self, name, item_type, description, value, **kwargs):
-        self.name = name
-        self.type = item_type  # weapon, armor, consumable, etc.
-        self.description = description
-        self.value = value
-        
-        # Attributs spécifiques selon le type
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+# inventory.py - Registre des objets et inventaire indexé avec piles
+from collections import namedtuple
+
+# Objets du jeu: id -> (nom, type, description, valeur, attributs spécifiques)
+ITEM_DEFINITIONS = {
+    "gelee_visqueuse": ("Gelée visqueuse", "material", "Reste gluant d'un slime", 2, {"max_stack": 99}),
+    "petite_potion": ("Petite potion", "consumable", "Rend 30 PV", 10,
+                      {"effect": {"attribute": "hp", "amount": 30}, "max_stack": 20}),
+    "queue_de_rat": ("Queue de rat", "material", "Trophée peu ragoûtant", 1, {"max_stack": 99}),
+    "fromage_vole": ("Fromage volé", "consumable", "Rend 10 PV", 3,
+                     {"effect": {"attribute": "hp", "amount": 10}, "max_stack": 20}),
+    "epee_maudite": ("Épée maudite", "weapon", "Lame du Dévoreur", 250,
+                     {"damage": 30, "equip_slot": "weapon"}),
+    "amulette_des_marais": ("Amulette des marais", "accessory", "Pulse d'une lueur verdâtre", 150,
+                            {"equip_slot": "accessory"}),
+}
+
+EQUIP_SLOTS = ("weapon", "armor", "accessory")
+
+
+class ItemDefinition(namedtuple("ItemDefinition", (
+        "id", "name", "type", "description", "value",
+        "max_stack", "damage", "defense", "effect", "equip_slot"),
+        defaults=(1, 0, 0, None, None))):
+    """Données immuables d'un objet, partagées par toutes ses occurrences"""
+    __slots__ = ()
+
+
+class ItemRegistry:
+    """Registre central des définitions d'objets"""
 
-class Inventory:
     def __init__(self):
-        self.items = []
-        self.equipped = {
-            "weapon": None,
-            "armor": None,
-            "accessory": None
-        }
-        self.max_size = 20
+        self.definitions = {}
+
+    def register(self, item_id, name, item_type, description, value, **attributes):
+        definition = ItemDefinition(item_id, name, item_type, description, value, **attributes)
+        self.definitions[item_id] = definition
+        return definition
+
+    def get(self, item_id):
+        return self.definitions[item_id]
+
+    def __contains__(self, item_id):
+        return item_id in self.definitions
+
+
+ITEMS = ItemRegistry()
+for _item_id, (_name, _type, _description, _value, _attributes) in ITEM_DEFINITIONS.items():
+    ITEMS.register(_item_id, _name, _type, _description, _value, **_attributes)
+
+
+def get_item(item_id):
+    """Définition partagée d'un objet"""
+    return ITEMS.get(item_id)
+
+
+def get_item_name(item_id):
+    return ITEMS.get(item_id).name
+
+
+class InventoryEntry:
+    """Une case d'inventaire: id d'objet, quantité et données propres à l'occurrence"""
+    __slots__ = ("item_id", "count", "data")
+
+    def __init__(self, item_id, count=1, data=None):
+        self.item_id = item_id
+        self.count = count
+        self.data = data  # Ex: durabilité; les entrées avec données ne s'empilent pas
+
+    @property
+    def definition(self):
+        return ITEMS.get(self.item_id)
+
+
+def definition_field(name):
+    """Propriété en lecture seule déléguée à la définition partagée"""
+    return property(lambda entry: getattr(ITEMS.get(entry.item_id), name))
+
+
+# name, type, damage... viennent de la définition partagée
+for _field in ItemDefinition._fields[1:]:
+    setattr(InventoryEntry, _field, definition_field(_field))
+
+
+class Inventory:
+    """Inventaire à cases fixes, avec index par id d'objet et empilement"""
+
+    def __init__(self, max_size=20):
+        self.max_size = max_size
+        self.slots = [None] * max_size  # Index de case -> InventoryEntry
+        self.slots_by_item = {}  # Id d'objet -> {index de case: None} (ordre d'insertion)
+        self.free_slots = list(range(max_size - 1, -1, -1))  # Pile des cases libres
+        self.totals = {}  # Id d'objet -> quantité totale
+        self.equipped = {slot: None for slot in EQUIP_SLOTS}
         self.is_open = False
-    
-    def add_item(self, item):
-        if len(self.items) < self.max_size:
-            self.items.append(item)
-            return True
-        return False
-    
-    def remove_item(self, item):
-        if item in self.items:
-            self.items.remove(item)
-            return True
-        return False
-    
-    def equip(self, item):
-        if item in self.items and item.type in self.equipped:
-            # Déséquiper l'item actuel s'il y en a un
-            if self.equipped[item.type]:
-                self.unequip(item.type)
-            
-            self.equipped[item.type] = item
-            self.items.remove(item)
-    
-    def unequip(self, slot):
+
+    @property
+    def items(self):
+        """Entrées non vides, dans l'ordre des cases"""
+        return [entry for entry in self.slots if entry is not None]
+
+    def __len__(self):
+        return self.max_size - len(self.free_slots)
+
+    def get_slot(self, index):
+        return self.slots[index]
+
+    def count(self, item_id):
+        return self.totals.get(item_id, 0)
+
+    def has_item(self, item_id, count=1):
+        return self.totals.get(item_id, 0) >= count
+
+    def put(self, index, entry):
+        self.slots[index] = entry
+        self.slots_by_item.setdefault(entry.item_id, {})[index] = None
+        self.totals[entry.item_id] = self.totals.get(entry.item_id, 0) + entry.count
+
+    def clear_slot(self, index):
+        entry = self.slots[index]
+        self.slots[index] = None
+        indices = self.slots_by_item[entry.item_id]
+        del indices[index]
+        if not indices:
+            del self.slots_by_item[entry.item_id]
+        self.totals[entry.item_id] -= entry.count
+        if not self.totals[entry.item_id]:
+            del self.totals[entry.item_id]
+        self.free_slots.append(index)
+        return entry
+
+    def add_item(self, item_id, count=1, data=None):
+        """Ajoute des objets (en complétant les piles existantes); vrai si tout a tenu"""
+        definition = ITEMS.get(item_id)
+        if data is None and definition.max_stack > 1:
+            for index in self.slots_by_item.get(item_id, ()):
+                entry = self.slots[index]
+                if entry.data is not None or entry.count >= definition.max_stack:
+                    continue
+                added = min(count, definition.max_stack - entry.count)
+                entry.count += added
+                self.totals[item_id] += added
+                count -= added
+                if not count:
+                    return True
+
+        while count:
+            if not self.free_slots:
+                return False
+            added = min(count, definition.max_stack)
+            self.put(self.free_slots.pop(), InventoryEntry(item_id, added, data))
+            count -= added
+        return True
+
+    def remove_item(self, item_id, count=1):
+        """Retire count objets (des dernières piles d'abord); faux si pas assez"""
+        if self.totals.get(item_id, 0) < count:
+            return False
+        for index in reversed(list(self.slots_by_item[item_id])):
+            entry = self.slots[index]
+            removed = min(count, entry.count)
+            if removed == entry.count:
+                self.clear_slot(index)
+            else:
+                entry.count -= removed
+                self.totals[item_id] -= removed
+            count -= removed
+            if not count:
+                break
+        return True
+
+    def remove_slot(self, index):
+        """Vide une case et retourne son entrée"""
+        if self.slots[index] is None:
+            return None
+        return self.clear_slot(index)
+
+    def equip(self, index):
+        """Équipe l'objet de la case index dans son emplacement"""
+        entry = self.slots[index]
+        if entry is None or entry.equip_slot not in self.equipped:
+            return False
+        slot = entry.equip_slot
+        # Une pile reste en place: l'objet déséquipé a besoin d'une case libre
+        if self.equipped[slot] and entry.count > 1 and not self.free_slots:
+            return False
+        if entry.count > 1:
+            entry.count -= 1
+            self.totals[entry.item_id] -= 1
+            entry = InventoryEntry(entry.item_id, 1, entry.data)
+        else:
+            self.clear_slot(index)
+        # Déséquiper l'objet actuel s'il y en a un
         if self.equipped[slot]:
-            self.items.append(self.equipped[slot])
-            self.equipped[slot] = None
-    
+            self.unequip(slot)
+        self.equipped[slot] = entry
+        return True
+
+    def unequip(self, slot):
+        entry = self.equipped[slot]
+        if entry is None or not self.free_slots:
+            return False
+        self.equipped[slot] = None
+        self.put(self.free_slots.pop(), entry)
+        return True
+
     def toggle(self):
         self.is_open = not self.is_open
-    
-    def use_consumable(self, item, target):
-        if item in self.items and item.type == "consumable":
-            effect = item.effect
-            if hasattr(target, effect["attribute"]):
-                current_value = getattr(target, effect["attribute"])
-                setattr(target, effect["attribute"], min(
-                    getattr(target, "max_" + effect["attribute"], current_value + effect["amount"]),
-                    current_value + effect["amount"]
-                ))
-            self.remove_item(item)
+
+    def use_consumable(self, item_id, target):
+        if not self.has_item(item_id):
+            return False
+        definition = ITEMS.get(item_id)
+        if definition.type != "consumable":
+            return False
+        effect = definition.effect
+        if hasattr(target, effect["attribute"]):
+            current_value = getattr(target, effect["attribute"])
+            setattr(target, effect["attribute"], min(
+                getattr(target, "max_" + effect["attribute"], current_value + effect["amount"]),
+                current_value + effect["amount"]
+            ))
+        return self.remove_item(item_id)
+
+    def serialize(self):
+        """Forme compacte pour la sauvegarde"""
+        return {
+            "slots": [
+                [index, entry.item_id, entry.count, entry.data]
+                for index, entry in enumerate(self.slots) if entry is not None
+            ],
+            "equipped": {
+                slot: [entry.item_id, entry.data] if entry else None
+                for slot, entry in self.equipped.items()
+            },
+        }
+
+    def load(self, data):
+        """Restaure le contenu depuis serialize()"""
+        self.__init__(self.max_size)
+        for index, item_id, count, entry_data in data.get("slots", []):
+            if item_id in ITEMS and 0 <= index < self.max_size:
+                self.put(index, InventoryEntry(item_id, count, entry_data))
+        self.free_slots = [index for index in range(self.max_size - 1, -1, -1) if self.slots[index] is None]
+        for slot, value in data.get("equipped", {}).items():
+            if value and value[0] in ITEMS and slot in self.equipped:
+                self.equipped[slot] = InventoryEntry(value[0], 1, value[1])
@@ -0,0 +1,136 @@
+# loot.py - Tables de butin compilées: tirages pondérés O(1) et tirages par lots
+import random
+import numpy as np
+
+# Butin par type de monstre:
+#   guaranteed: objets toujours donnés
+#   weighted: (id d'objet ou None pour rien, poids), tiré rolls fois
+#   rare: (id d'objet, chance) tirés indépendamment
+LOOT_DEFINITIONS = {
+    "slime": {
+        "weighted": [("gelee_visqueuse", 70), (None, 30)],
+        "rare": [("petite_potion", 0.3)],
+    },
+    "rat": {
+        "weighted": [("queue_de_rat", 50), ("fromage_vole", 20), (None, 30)],
+    },
+    "Korvash le Dévoreur": {
+        "guaranteed": ["amulette_des_marais"],
+        "weighted": [("petite_potion", 60), ("fromage_vole", 40)],
+        "rolls": 2,
+        "rare": [("epee_maudite", 0.4)],
+    },
+}
+
+
+class AliasTable:
+    """Méthode d'alias de Vose: tirage pondéré en O(1) après une construction en O(n)"""
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        self.prob = np.ones(count)
+        self.alias = np.arange(count)
+
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Restes (erreurs d'arrondi): probabilité 1
+        self.prob_list = self.prob.tolist()
+        self.alias_list = self.alias.tolist()
+        self.count = count
+
+    def sample(self, rng=random):
+        column = int(rng.random() * self.count)
+        if rng.random() < self.prob_list[column]:
+            return column
+        return self.alias_list[column]
+
+    def sample_batch(self, generator, shape):
+        """Tirages vectorisés (generator: numpy.random.Generator)"""
+        columns = generator.integers(0, self.count, size=shape)
+        keep = generator.random(shape) < self.prob[columns]
+        return np.where(keep, columns, self.alias[columns])
+
+
+class LootTable:
+    """Table de butin compilée une fois par type de monstre et partagée"""
+
+    def __init__(self, guaranteed=(), weighted=(), rolls=1, rare=()):
+        self.guaranteed = tuple(guaranteed)
+        self.rolls = rolls if weighted else 0
+        self.outcomes = [item_id for item_id, _ in weighted]
+        weights = [weight for _, weight in weighted]
+        self.cumulative = np.cumsum(weights, dtype=np.float64) / sum(weights) if weights else np.zeros(0)
+        self.alias = AliasTable(weights) if weights else None
+        self.rare_items = [item_id for item_id, _ in rare]
+        self.rare_chances = np.array([chance for _, chance in rare], dtype=np.float64)
+        self.rare_chance_list = self.rare_chances.tolist()
+
+        # Colonnes des comptes retournés par roll_batch
+        self.item_ids = sorted(
+            set(self.guaranteed) | {item for item in self.outcomes if item} | set(self.rare_items)
+        )
+        column = {item_id: index for index, item_id in enumerate(self.item_ids)}
+        self.guaranteed_columns = [column[item_id] for item_id in self.guaranteed]
+        self.outcome_columns = np.array([column.get(item_id, -1) for item_id in self.outcomes], dtype=np.int64)
+        self.rare_columns = np.array([column[item_id] for item_id in self.rare_items], dtype=np.int64)
+
+    def roll(self, rng=random):
+        """Butin d'un monstre vaincu: liste d'ids d'objets"""
+        drops = list(self.guaranteed)
+        for _ in range(self.rolls):
+            item_id = self.outcomes[self.alias.sample(rng)]
+            if item_id is not None:
+                drops.append(item_id)
+        for item_id, chance in zip(self.rare_items, self.rare_chance_list):
+            if rng.random() < chance:
+                drops.append(item_id)
+        return drops
+
+    def roll_batch(self, kills, generator=None):
+        """Butin de kills monstres en un seul appel vectorisé
+
+        Retourne une matrice (kills, len(item_ids)) de quantités, colonnes dans
+        l'ordre de self.item_ids.
+        """
+        generator = generator or np.random.default_rng()
+        counts = np.zeros((kills, len(self.item_ids)), dtype=np.int32)
+        for column in self.guaranteed_columns:
+            counts[:, column] += 1
+
+        if self.rolls:
+            # Poids cumulés: un searchsorted pour tous les tirages
+            picks = np.searchsorted(self.cumulative, generator.random((kills, self.rolls)), side="right")
+            picks = np.minimum(picks, len(self.outcomes) - 1)
+            columns = self.outcome_columns[picks]
+            rows = np.broadcast_to(np.arange(kills)[:, None], columns.shape)
+            valid = columns >= 0
+            np.add.at(counts, (rows[valid], columns[valid]), 1)
+
+        if len(self.rare_items):
+            hits = generator.random((kills, len(self.rare_items))) < self.rare_chances
+            counts[:, self.rare_columns] += hits.astype(np.int32)
+        return counts
+
+    def totals(self, counts):
+        """{id d'objet: quantité} sur toutes les lignes d'un roll_batch"""
+        return {item_id: int(total) for item_id, total in zip(self.item_ids, counts.sum(axis=0)) if total}
+
+
+_compiled = {}
+
+
+def get_loot_table(monster_type):
+    """Table compilée du type de monstre (compilée au premier appel, puis partagée)"""
+    table = _compiled.get(monster_type)
+    if table is None:
+        table = LootTable(**LOOT_DEFINITIONS.get(monster_type, {}))
+        _compiled[monster_type] = table
+    return table
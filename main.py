@@ -1,36 +1,102 @@
 # main.py - Point d'entrée principal du jeu avec tous les systèmes
 import pygame
+import os
 import sys
-import random
+import argparse
+import hashlib
 from player import Player
 from environment import Environment
 from quests import QuestManager
-from inventory import Inventory
+from inventory import get_item_name
 from ui import UI
 from monsters import Slime, Rat, Korvash
 from dialogue import DialogueSystem, NPC
 from audio import AudioManager
-from save_system import SaveSystem
+from save_system import SaveSystem, AUTOSAVE_SLOT
+from save_format import THUMBNAIL_SIZE, SaveFormatError
+from autosave import AutosaveService
 from animation import AnimationManager
-from menu import MainMenu
+from menu import MainMenu, LoadMenu
 from config import Config
+from controls import ControlSystem
+from mobile_adapter import MobileAdapter
+from timing import SimulatedClock, FixedTimestep, FramePacer
+from renderer import DirtyRectRenderer
+from world_streaming import ChunkStreamer
+from atlas import SpriteAtlas
+from asset_loader import AssetLoader
+from fonts import get_font, render_text
+from combat import ATTACK, SKILL, FLEE, PlayerState, MonsterState, resolve_monster_action
+from monster_ai import MonsterAI, AIScheduler
+from pathfinding import FlowField, Pathfinder
+from tilemap import TILE_SIZE
+from rng import RandomStreams
+from replay import InputRecorder, InputPlayback, HASH_INTERVAL
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, record_path=None):
+        # Mode headless: pas de fenêtre ni de périphérique audio (bots, CI, benchmarks)
+        self.headless = headless
+        self.seed = seed  # None: nouvelle graine à chaque partie
+        self.record_path = record_path  # Enregistrer les entrées de la partie
+        # Simulation reproductible: pas de budget temps réel ni de calcul sur thread
+        self.deterministic = headless or record_path is not None
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        
         pygame.init()
         
         # Configuration
         self.config = Config()
-        self.screen = pygame.display.set_mode((800, 600))
+        self.screen = self.create_display()
         pygame.display.set_caption("Ycrad l'Aventurier")
-        self.clock = pygame.time.Clock()
+        
+        # Ajuster la configuration en fonction de la plateforme
+        self.mobile_adapter = MobileAdapter()
+        if self.mobile_adapter.is_mobile:
+            self.screen = pygame.display.get_surface()
+            self.config.set("controls", "keyboard_enabled", False)
+            self.config.set("controls", "touch_enabled", True)
+        
+        # Entrées: clavier, tactile et manette traduits en actions
+        self.control_system = self.create_control_system()
+        
+        # Rendu par zones modifiées
+        self.renderer = DirtyRectRenderer(
+            self.screen, self.config.get("graphics", "dirty_rects")
+        )
+        
+        # Simulation à pas fixe, rendu cadencé séparément
+        self.step_ms = 1000 / self.config.get("gameplay", "tick_rate")
+        self.timestep = FixedTimestep(self.step_ms)
+        self.clock = SimulatedClock(self.step_ms) if headless else pygame.time.Clock()
+        self.frame_pacer = FramePacer(
+            self.clock,
+            self.config.get("graphics", "framerate"),
+            self.config.get("graphics", "frame_pacing")
+        )
         self.running = True
         self.game_state = "menu"  # menu, playing, combat, dialogue, inventory, game_over
         
+        # Assets décodés en arrière-plan: le menu s'affiche sans attendre
+        # (chargement synchrone en mode headless)
+        self.asset_loader = None if headless else AssetLoader()
+        
         # Initialisation des systèmes
-        self.audio_manager = AudioManager()
-        self.save_system = SaveSystem()
-        self.animation_manager = AnimationManager()
+        self.audio_manager = AudioManager(
+            enabled=not headless,
+            loader=self.asset_loader,
+            music_cache_budget=self.config.get("audio", "music_cache_budget") * 1024 * 1024
+        )
+        self.save_system = SaveSystem(slot_count=self.config.get("gameplay", "save_slots"))
+        # Sauvegardes écrites sur un thread dédié (pas d'autosave sans fenêtre)
+        self.autosave = AutosaveService(
+            self.save_system,
+            self.config.get("gameplay", "autosave_interval"),
+            enabled=self.config.get("gameplay", "autosave") and not headless
+        )
+        self.animation_manager = AnimationManager(self.asset_loader)
         self.dialogue_system = DialogueSystem()
         
         # Chargement des assets
@@ -38,6 +104,7 @@ class Game:
         
         # Menu principal
         self.main_menu = MainMenu(self)
+        self.load_menu = LoadMenu(self)
         
         # Initialisation différée des systèmes de jeu
         self.player = None
@@ -52,11 +119,49 @@ class Game:
         self.combat_monster = None
         self.combat_turn = "player"
         self.combat_timer = 0
+        
+        # Flux aléatoires, temps de jeu et entrées rejouables
+        self.rng_streams = RandomStreams(seed)
+        self.combat_rng = self.rng_streams.get("combat")
+        self.tick = 0
+        self.game_time = 0.0  # En ms, avance d'un pas fixe par tick
+        self.input_recorder = None
+        self.input_playback = None
         self.interacting_npc = None
+        self.new_game_requested = False
+        self.previous_player_position = None
+        self.world_streamer = None
+        self.ai_scheduler = None
+        self.flow_field = None
         
         # Appliquer la configuration
         self.apply_config()
         
+    def create_control_system(self):
+        gamepad = self.config.get("controls", "gamepad")
+        if gamepad["enabled"] and not self.headless:
+            pygame.joystick.init()
+        control_system = ControlSystem(
+            self.config.get_key_bindings(),
+            keyboard_enabled=self.config.get("controls", "keyboard_enabled"),
+            touch_enabled=self.config.is_touch_enabled() and self.mobile_adapter.is_mobile,
+            gamepad_settings=gamepad,
+            touch_settings=self.config.get_touch_settings(),
+            scale_factor=self.mobile_adapter.scale_factor,
+            screen_size=self.screen.get_size()
+        )
+        return control_system
+    
+    def create_display(self):
+        """Crée la fenêtre en respectant le vsync de la configuration"""
+        if self.headless or not self.config.get("graphics", "vsync"):
+            return pygame.display.set_mode((800, 600))
+        try:
+            return pygame.display.set_mode((800, 600), pygame.SCALED, vsync=1)
+        except pygame.error:
+            # Vsync indisponible sur ce pilote
+            return pygame.display.set_mode((800, 600))
+    
     def load_assets(self):
         # Charger les sprites et images (à compléter avec vos assets)
         self.assets = {
@@ -65,11 +170,6 @@ class Game:
                 "slime": pygame.Surface((16, 16)),
                 "rat": pygame.Surface((16, 16)),
             },
-            "environments": {
-                "village": pygame.Surface((800, 600)),
-                "forest": pygame.Surface((800, 600)),
-                "marsh": pygame.Surface((800, 600)),
-            },
             "npcs": {
                 "merchant": pygame.Surface((16, 16)),
                 "blacksmith": pygame.Surface((16, 16)),
@@ -80,190 +180,365 @@ class Game:
         self.assets["player"].fill((0, 0, 255))  # Bleu pour le joueur
         self.assets["monsters"]["slime"].fill((0, 255, 0))  # Vert pour le slime
         self.assets["monsters"]["rat"].fill((139, 69, 19))  # Marron pour le rat
-        self.assets["environments"]["village"].fill((200, 200, 100))  # Jaune sable
-        self.assets["environments"]["forest"].fill((0, 100, 0))  # Vert forêt
-        self.assets["environments"]["marsh"].fill((70, 50, 30))  # Marron marais
         self.assets["npcs"]["merchant"].fill((255, 0, 0))  # Rouge marchand
         self.assets["npcs"]["blacksmith"].fill((100, 100, 100))  # Gris forgeron
+        
+        # Regrouper les sprites dans l'atlas, au format de l'écran
+        self.sprite_atlas = SpriteAtlas()
+        sprites = {("player",): self.assets["player"]}
+        for category in ("monsters", "npcs"):
+            for name, surface in self.assets[category].items():
+                sprites[(category, name)] = surface
+        packed = self.sprite_atlas.pack(sprites)
+        self.assets["player"] = packed[("player",)]
+        for category in ("monsters", "npcs"):
+            for name in self.assets[category]:
+                self.assets[category][name] = packed[(category, name)]
     
     def apply_config(self):
         # Appliquer les paramètres audio
-        self.audio_manager.set_music_volume(self.config.get("audio", "music_volume"))
-        self.audio_manager.set_sound_volume(self.config.get("audio", "sound_volume"))
+        self.config.apply_audio_settings(self.audio_manager)
         
         # Appliquer les paramètres graphiques
-        if self.config.get("graphics", "fullscreen"):
+        if self.config.get("graphics", "fullscreen") and not self.headless:
             self.screen = pygame.display.set_mode(
                 self.config.get("graphics", "resolution"), 
                 pygame.FULLSCREEN
             )
+            self.renderer.set_screen(self.screen)
+        
+        # Ensuite, seules les sections modifiées sont réappliquées
+        self.config.add_listener("audio", self.on_audio_config_changed)
+        self.config.add_listener("graphics", self.on_graphics_config_changed)
+        self.config.add_listener("gameplay", self.on_gameplay_config_changed)
+        self.config.add_listener("controls", self.on_controls_config_changed)
+    
+    def on_audio_config_changed(self, keys):
+        self.config.apply_audio_settings(self.audio_manager)
+    
+    def on_graphics_config_changed(self, keys):
+        if keys & {"resolution", "fullscreen", "vsync"} and not self.headless:
+            self.screen = self.config.apply_graphics_settings(self.screen)
+            self.renderer.set_screen(self.screen)
+            self.renderer.invalidate()
+            if self.mobile_adapter.is_mobile:
+                self.mobile_adapter.update_scale_factor(self.screen.get_size())
+            self.update_touch_layout()
+        if keys & {"framerate", "frame_pacing"}:
+            self.frame_pacer = FramePacer(
+                self.clock,
+                self.config.get("graphics", "framerate"),
+                self.config.get("graphics", "frame_pacing")
+            )
+    
+    def on_controls_config_changed(self, keys):
+        # Les touches déjà enfoncées gardent leur état: recompilation seulement
+        if keys <= {"keyboard", "touch"}:
+            if "keyboard" in keys:
+                self.control_system.compile_bindings(self.config.get_key_bindings())
+            if "touch" in keys:
+                self.update_touch_layout()
+        else:
+            self.control_system = self.create_control_system()
+    
+    def update_touch_layout(self):
+        # Les surfaces des contrôles ne sont redessinées que si l'opacité, la taille ou l'échelle changent
+        self.control_system.set_touch_layout(
+            self.config.get_touch_settings(),
+            self.mobile_adapter.scale_factor,
+            self.screen.get_size()
+        )
+    
+    def on_gameplay_config_changed(self, keys):
+        self.autosave.enabled = self.config.get("gameplay", "autosave") and not self.headless
+        self.autosave.interval = self.config.get("gameplay", "autosave_interval") * 1000
+        self.save_system.slot_count = self.config.get("gameplay", "save_slots")
     
     def initialize_game(self):
         """Initialise tous les systèmes pour une nouvelle partie"""
+        self.rng_streams = RandomStreams(self.seed)
+        self.combat_rng = self.rng_streams.get("combat")
+        self.tick = 0
+        self.game_time = 0.0
+        # Les touches du menu (dont celle qui lance la partie) ne sont pas enregistrées
+        self.control_system.reset()
+        if self.record_path:
+            self.input_recorder = InputRecorder(
+                self.record_path, self.rng_streams.seed, self.config.get("gameplay", "tick_rate")
+            )
+        
         self.player = Player("Ycrad", "warrior")
-        self.environment = Environment()
+        self.environment = Environment(self.rng_streams.get("world"))
+        self.create_world()
         self.quest_manager = QuestManager()
-        self.inventory = Inventory()
+        self.inventory = self.player.inventory
         self.ui = UI(self.player, self.inventory, self.quest_manager)
-        
-        # Créer les PNJs
-        self.npcs = [
-            NPC("marchand", "merchant", [200, 200], self.dialogue_system),
-            NPC("forgeron", "blacksmith", [300, 250], self.dialogue_system)
-        ]
-        
-        # Générer les monstres initiaux
-        self.environment.generate_monsters()
+        self.create_npcs()
+        self.autosave.reset(self.game_time)
         
         # Jouer la musique du village
         self.audio_manager.play_music("village")
         
         self.game_state = "playing"
     
+    def create_npcs(self):
+        self.npcs = [
+            NPC("marchand", "merchant", [200, 200], self.dialogue_system, self.environment.entity_store),
+            NPC("forgeron", "blacksmith", [300, 250], self.dialogue_system, self.environment.entity_store)
+        ]
+        for npc in self.npcs:
+            self.environment.register_entity(npc, "npc")
+    
+    def start_new_game(self):
+        """Demande une partie: lancée entre deux frames, une fois les assets chargés"""
+        self.new_game_requested = True
+    
+    def check_new_game(self):
+        if self.new_game_requested and (not self.asset_loader or self.asset_loader.is_done()):
+            self.new_game_requested = False
+            self.initialize_game()
+    
     def load_game(self, slot=0):
         """Charge une partie sauvegardée"""
-        save_data = self.save_system.load_game(slot)
+        self.rng_streams = RandomStreams(self.seed)
+        self.combat_rng = self.rng_streams.get("combat")
+        environment = Environment(self.rng_streams.get("world"))
+        try:
+            save_data = self.save_system.load_game(slot, environment)
+        except (OSError, SaveFormatError) as e:
+            print(f"Erreur de chargement de la sauvegarde {slot}: {e}")
+            save_data = None
         if save_data:
-            # Reconstruire l'état du jeu à partir des données sauvegardées
-            self.player = Player(save_data["player"]["name"], save_data["player"]["current_class"])
-            self.player.__dict__.update(save_data["player"])
-            
-            self.environment = Environment()
-            self.environment.current_zone = save_data["environment"]["current_zone"]
-            
-            self.quest_manager = QuestManager()
-            # Reconstruire les quêtes...
-            
-            self.inventory = Inventory()
-            # Reconstruire l'inventaire...
+            # Joueur, quêtes et monstres reconstruits par save_format
+            self.player = save_data["player"]
+            self.environment = environment
+            self.quest_manager = save_data["quest_manager"]
+            self.current_zone = self.environment.current_zone
+            self.tick = 0
+            self.game_time = save_data["play_time"] * 1000
+            self.control_system.reset()
+            self.create_world()
             
+            self.inventory = self.player.inventory
             self.ui = UI(self.player, self.inventory, self.quest_manager)
+            self.create_npcs()
+            self.autosave.reset(self.game_time)
             
             self.game_state = "playing"
-            self.audio_manager.play_music(self.environment.current_zone)
+            self.audio_manager.play_music(self.environment.get_zone_music(self.current_zone))
+    
+    def create_world(self):
+        """Prépare le chargement par chunks du monde autour du joueur"""
+        # Les monstres de la partie précédente n'existent plus
+        self.animation_manager.clear()
+        self.environment.add_removal_listener(self.on_monster_removed)
+        
+        # IA des monstres: pas de budget ni de thread quand la simulation doit être reproductible
+        if self.flow_field:
+            self.flow_field.shutdown()
+        self.flow_field = FlowField(self.environment.tilemap, threaded=not self.deterministic)
+        budget_ms = None if self.deterministic else self.config.get("gameplay", "ai_budget_ms")
+        self.ai_scheduler = AIScheduler(
+            self.environment,
+            MonsterAI(
+                rng=self.rng_streams.get("ai"),
+                flow_field=self.flow_field,
+                pathfinder=Pathfinder(self.environment.tilemap)
+            ),
+            budget_ms=budget_ms
+        )
+        
+        # Le premier chargement de chunks crée les monstres proches et leurs animations
+        self.world_streamer = ChunkStreamer(
+            self.environment.tilemap,
+            self.screen.get_size(),
+            self.config.get("graphics", "chunk_memory_budget") * 1024 * 1024,
+            self.on_chunk_loaded
+        )
+        self.world_streamer.update(self.player.position)
+        
+        # Un changement de tuile recompose son chunk: tout redessiner
+        self.environment.tilemap.add_listener(lambda tx, ty: self.renderer.invalidate())
+    
+    def on_monster_removed(self, monster):
+        """Libère l'animation et l'état d'IA d'un monstre vaincu ou déchargé"""
+        self.animation_manager.remove(monster)
+        self.ai_scheduler.forget(monster)
+    
+    def on_chunk_loaded(self, chunk):
+        # Précharger les monstres et la musique des zones du chunk
+        for zone_name in self.environment.get_zones_in_rect(chunk.rect):
+            self.environment.ensure_zone_loaded(zone_name)
+            for monster in self.environment.get_monsters_in_current_zone(zone_name):
+                self.animation_manager.play(monster, monster.type, "idle")
+            self.audio_manager.prefetch_music(self.environment.get_zone_music(zone_name))
+    
+    def update_world_streaming(self):
+        velocity = (0, 0)
+        if self.previous_player_position:
+            velocity = (
+                self.player.position[0] - self.previous_player_position[0],
+                self.player.position[1] - self.previous_player_position[1]
+            )
+        self.world_streamer.update(self.player.position, velocity)
     
     def handle_events(self):
-        for event in pygame.event.get():
+        if self.input_playback:
+            events = self.input_playback.events_for(self.tick)
+        else:
+            events = pygame.event.get()
+        if self.input_recorder:
+            self.input_recorder.record_events(self.tick, events)
+        
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             
-            # Gestion des événements selon l'état du jeu
+            # Le jeu lit des actions (voir step); les menus gardent leurs événements
+            self.control_system.handle_event(event)
+            
             if self.game_state == "menu":
                 self.main_menu.handle_input(event)
             
-            elif self.game_state == "playing":
-                self.handle_playing_events(event)
-            
-            elif self.game_state == "combat":
-                self.handle_combat_events(event)
-            
-            elif self.game_state == "dialogue":
-                self.handle_dialogue_events(event)
+            elif self.game_state == "load_menu":
+                self.load_menu.handle_input(event)
             
             # Gestion des clics pour l'UI
             if self.ui:
                 self.ui.handle_event(event, self)
     
-    def handle_playing_events(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_e:
-                # Tentative d'interaction avec un PNJ
-                for npc in self.npcs:
-                    if npc.can_interact(self.player.position):
-                        self.interacting_npc = npc
-                        self.game_state = "dialogue"
-                        npc.interact(self.dialogue_system)
-                        break
-                else:
-                    # Si aucun PNJ, ouvrir l'inventaire
-                    self.inventory.toggle()
-            
-            elif event.key == pygame.K_q:
-                self.quest_manager.show_quests = not self.quest_manager.show_quests
-            
-            elif event.key == pygame.K_SPACE:
-                self.attempt_attack()
-            
-            elif event.key == pygame.K_s:
-                # Sauvegarder la partie
-                self.save_system.save_game(
-                    self.player, self.environment, self.quest_manager
-                )
-                self.ui.messages.append("Partie sauvegardée!")
-    
-    def handle_combat_events(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_1:  # Attaque normale
-                damage = self.player.attack(self.combat_monster)
-                self.ui.combat_messages.append(f"Ycrad inflige {damage} dégâts!")
-                self.combat_turn = "monster"
-                self.combat_timer = pygame.time.get_ticks()
-            
-            elif event.key == pygame.K_2 and len(self.player.skills) > 1:  # Compétence 1
-                damage = self.player.use_skill(1, self.combat_monster)
-                self.ui.combat_messages.append(
-                    f"Ycrad utilise {self.player.skills[1].name} et inflige {damage} dégâts!"
-                )
-                self.combat_turn = "monster"
-                self.combat_timer = pygame.time.get_ticks()
-            
-            elif event.key == pygame.K_3:  # Fuir
-                if random.random() < 0.5:  # 50% de chance de fuite
-                    self.ui.combat_messages.append("Vous avez fui le combat!")
-                    self.game_state = "playing"
-                else:
-                    self.ui.combat_messages.append("Fuite échouée!")
-                    self.combat_turn = "monster"
-                    self.combat_timer = pygame.time.get_ticks()
-    
-    def handle_dialogue_events(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_RETURN:
-                next_line = self.dialogue_system.next_line()
-                if not next_line:
-                    self.game_state = "playing"
-                    self.interacting_npc = None
-            
-            elif event.key == pygame.K_ESCAPE:
-                self.dialogue_system.end_dialogue()
+    def handle_playing_actions(self):
+        controls = self.control_system
+        if controls.is_pressed("interact"):
+            # Tentative d'interaction avec le PNJ le plus proche
+            npc = self.environment.nearest(
+                self.player.position, NPC.INTERACTION_RANGE, "npc",
+                lambda n: n.can_interact(self.player.position)
+            )
+            if npc:
+                self.interacting_npc = npc
+                self.game_state = "dialogue"
+                npc.interact(self.dialogue_system)
+                return
+            # Si aucun PNJ, ouvrir l'inventaire
+            self.inventory.toggle()
+        
+        if controls.is_pressed("inventory"):
+            self.inventory.toggle()
+        
+        if controls.is_pressed("quests"):
+            self.quest_manager.show_quests = not self.quest_manager.show_quests
+        
+        if controls.is_pressed("save"):
+            # Sauvegarder la partie (écrite en arrière-plan, voir poll_saves)
+            self.save_game()
+        
+        if controls.is_pressed("attack"):
+            self.attempt_attack()
+    
+    def handle_combat_actions(self):
+        # Touches de compétence 1 à 3: attaque, compétence 1, fuite
+        controls = self.control_system
+        if self.combat_turn != "player":
+            return
+        if controls.is_pressed("skill_1") or controls.is_pressed("attack"):  # Attaque normale
+            self.perform_player_action(ATTACK)
+        
+        elif controls.is_pressed("skill_2") and len(self.player.skills) > 1:  # Compétence 1
+            self.perform_player_action(SKILL, 1)
+        
+        elif controls.is_pressed("skill_3"):  # Fuir
+            self.perform_player_action(FLEE)
+    
+    def update_dialogue_state(self):
+        controls = self.control_system
+        if controls.is_pressed("confirm"):
+            next_line = self.dialogue_system.next_line()
+            if not next_line:
                 self.game_state = "playing"
                 self.interacting_npc = None
+        
+        elif controls.is_pressed("pause"):
+            self.dialogue_system.end_dialogue()
+            self.game_state = "playing"
+            self.interacting_npc = None
     
     def attempt_attack(self):
-        # Vérifier s'il y a un monstre à proximité pour combattre
-        for monster in self.environment.get_monsters_in_current_zone(self.current_zone):
-            distance = self.calculate_distance(self.player.position, monster.position)
-            if distance < 50:
-                self.start_combat(monster)
-                self.audio_manager.play_sound("combat_start")
-                break
+        # Vérifier s'il y a un monstre de la zone à proximité pour combattre
+        monster = self.environment.nearest(
+            self.player.position, 50, "monster",
+            lambda m: m.zone == self.current_zone
+        )
+        if monster:
+            self.start_combat(monster)
+            self.audio_manager.play_sound("combat_start")
     
     def start_combat(self, monster):
         self.game_state = "combat"
         self.combat_monster = monster
         self.combat_turn = "player"
-        self.combat_timer = pygame.time.get_ticks()
+        self.combat_timer = self.get_ticks()
         self.audio_manager.play_music("combat")
     
+    def perform_player_action(self, action, skill_index=0):
+        """Fait jouer le joueur via le moteur de combat puis affiche le résultat"""
+        result = self.player.act(self.combat_monster, action, skill_index, self.combat_rng)
+        self.show_turn_result(result)
+        if not result.success:
+            return  # Action impossible: le joueur rejoue
+        if result.fled:
+            self.game_state = "playing"
+            self.audio_manager.play_music(self.environment.get_zone_music(self.current_zone))
+            return
+        self.combat_turn = "monster"
+        self.combat_timer = self.get_ticks()
+    
+    def perform_monster_action(self):
+        player_state = PlayerState.from_player(self.player)
+        monster_state = MonsterState.from_monster(
+            self.combat_monster, self.config.get_difficulty_multiplier()
+        )
+        result = resolve_monster_action(player_state, monster_state, self.combat_rng)
+        player_state.apply_to(self.player)
+        self.show_turn_result(result)
+        self.combat_turn = "player"
+        self.combat_timer = self.get_ticks()
+        return result
+    
+    def show_turn_result(self, result):
+        """Traduit un TurnResult en messages de combat"""
+        messages = self.ui.combat_messages
+        if result.actor == "monster":
+            messages.append(f"Le {self.combat_monster.name} inflige {result.damage} dégâts!")
+        elif not result.success:
+            if result.reason == "cooldown":
+                messages.append(f"{result.skill_name} n'est pas encore prête!")
+            elif result.reason == "mp":
+                messages.append(f"Pas assez de MP pour {result.skill_name}!")
+            else:
+                messages.append("Compétence indisponible!")
+        elif result.action == FLEE:
+            messages.append("Vous avez fui le combat!" if result.fled else "Fuite échouée!")
+        elif result.action == SKILL:
+            messages.append(f"Ycrad utilise {result.skill_name} et inflige {result.damage} dégâts!")
+        else:
+            messages.append(f"Ycrad inflige {result.damage} dégâts!")
+        if result.critical:
+            messages.append("Coup critique!")
+    
     def resolve_combat_turn(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.get_ticks()
         
         if self.combat_turn == "player" and current_time - self.combat_timer > 2000:
             # Tour du joueur timeout, attaque automatique
-            damage = self.player.attack(self.combat_monster)
-            self.ui.combat_messages.append(f"Ycrad inflige {damage} dégâts!")
-            self.combat_turn = "monster"
-            self.combat_timer = current_time
+            self.perform_player_action(ATTACK)
         
         elif self.combat_turn == "monster" and current_time - self.combat_timer > 2000:
             # Tour du monstre
-            damage = self.combat_monster.attack(self.player)
-            self.ui.combat_messages.append(f"Le {self.combat_monster.name} inflige {damage} dégâts!")
-            self.combat_turn = "player"
-            self.combat_timer = current_time
+            result = self.perform_monster_action()
             
             # Vérifier la victoire/défaite
-            if self.player.hp <= 0:
+            if result.target_defeated:
                 self.ui.combat_messages.append("Vous avez été vaincu!")
                 self.game_state = "game_over"
                 self.audio_manager.play_sound("game_over")
@@ -277,66 +552,108 @@ class Game:
             self.player.gain_xp(xp_gained)
             self.player.gold += gold_gained
             
-            loot = self.combat_monster.generate_loot()
-            for item in loot:
-                self.inventory.add_item(item)
+            loot = self.combat_monster.generate_loot(self.rng_streams.get("loot"))
+            for item_id in loot:
+                self.inventory.add_item(item_id)
             
             self.ui.messages.append(
-                f"Victoire! +{xp_gained} XP, +{gold_gained} or, butin: {', '.join([i.name for i in loot])}"
+                f"Victoire! +{xp_gained} XP, +{gold_gained} or, butin: {', '.join(get_item_name(i) for i in loot)}"
             )
             
             self.game_state = "playing"
-            self.audio_manager.play_music(self.current_zone)
+            self.audio_manager.play_music(self.environment.get_zone_music(self.current_zone))
             self.audio_manager.play_sound("victory")
             
             # Mettre à jour les quêtes
             self.quest_manager.on_monster_killed(self.combat_monster.type)
+            self.environment.remove_monster(self.combat_monster)
+    
+    def get_ticks(self):
+        """Temps de jeu en ms: avance d'un pas fixe par tick, indépendant de l'horloge murale"""
+        return int(self.game_time)
+    
+    def get_state_hash(self):
+        """Empreinte de l'état de la simulation (joueur, monstres) pour vérifier un rejeu"""
+        digest = hashlib.sha1()
+        player = self.player
+        digest.update(repr((
+            self.game_state, self.current_zone, [float(v) for v in player.position],
+            player.hp, player.mp, player.xp, player.level, player.gold
+        )).encode("utf-8"))
+        store = self.environment.entity_store
+        for array in (store.positions, store.hp, store.alive):
+            digest.update(array[:store.count].tobytes())
+        return digest.hexdigest()[:16]
     
-    def calculate_distance(self, pos1, pos2):
-        return ((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)**0.5
+    def step(self, dt):
+        """Avance la simulation d'un pas fixe de dt ms"""
+        if self.player:
+            self.previous_player_position = list(self.player.position)
+        self.control_system.update()
+        self.update(dt)
+        self.tick += 1
+        self.game_time += dt
+        
+        if self.player and self.tick % HASH_INTERVAL == 0:
+            if self.input_recorder:
+                self.input_recorder.record_hash(self.tick, self.get_state_hash())
+            elif self.input_playback:
+                self.input_playback.check_hash(self.tick, self.get_state_hash())
     
-    def update(self):
+    def update(self, dt):
         # Mettre à jour selon l'état du jeu
         if self.game_state == "menu":
             self.main_menu.update()
         
         elif self.game_state == "playing":
-            self.update_playing_state()
+            self.update_playing_state(dt)
+            if self.autosave.is_due(self.game_time):
+                self.save_game(AUTOSAVE_SLOT, automatic=True)
         
         elif self.game_state == "combat":
             self.update_combat_state()
         
+        elif self.game_state == "dialogue":
+            self.update_dialogue_state()
+        
         # Mettre à jour les animations
-        self.animation_manager.update(self.clock.get_time())
+        self.animation_manager.update(dt)
     
-    def update_playing_state(self):
-        # Mettre à jour la position du joueur
-        keys = pygame.key.get_pressed()
-        dx, dy = 0, 0
+    def update_playing_state(self, dt):
+        self.handle_playing_actions()
+        if self.game_state != "playing":
+            return  # Dialogue ou combat engagé ce tick
         
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]: dx = -1
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]: dx = 1
-        if keys[pygame.K_UP] or keys[pygame.K_w]: dy = -1
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]: dy = 1
+        # Mettre à jour la position du joueur (vecteur normalisé: pas plus rapide en diagonale)
+        dx, dy = self.control_system.get_movement_vector()
         
         if dx != 0 or dy != 0:
-            self.player.move(dx, dy)
+            previous_position = list(self.player.position)
             
-            # Vérifier les collisions avec l'environnement
-            if self.environment.check_collision(self.player.position):
-                self.player.move(-dx, -dy)
+            # Déplacement axe par axe contre la grille de collision
+            distance = self.player.speed * dt / 1000
+            self.player.move_and_collide(dx * distance, dy * distance, self.environment)
             
             # Vérifier les collisions avec les PNJs
-            for npc in self.npcs:
-                if self.calculate_distance(self.player.position, npc.position) < 20:
-                    self.player.move(-dx, -dy)
-                    break
+            if self.environment.query_radius(self.player.position, 20, "npc"):
+                self.player.position = previous_position
             
             # Mettre à jour l'animation de marche
-            self.animation_manager.play_animation("player", "walk")
+            self.animation_manager.play("player", "player", "walk")
         else:
             # Animation idle si pas de mouvement
-            self.animation_manager.play_animation("player", "idle")
+            self.animation_manager.play("player", "player", "idle")
+        
+        # Champ de flux vers le joueur (recalculé quand il change de tuile)
+        half = TILE_SIZE / 2
+        self.flow_field.update((self.player.position[0] + half, self.player.position[1] + half))
+        
+        # Faire réfléchir les monstres proches, puis les déplacer (vectorisé)
+        self.ai_scheduler.update(self.player.position, self.current_zone, dt)
+        self.environment.update_entities(dt)
+        
+        # Charger les chunks autour du joueur et dans sa direction
+        self.update_world_streaming()
         
         # Vérifier les déclencheurs de quêtes
         self.quest_manager.check_triggers(self.player.position)
@@ -345,13 +662,39 @@ class Game:
         new_zone = self.environment.get_zone_at_position(self.player.position)
         if new_zone != self.current_zone:
             self.current_zone = new_zone
+            self.environment.current_zone = new_zone
             self.ui.messages.append(f"Vous entrez dans {new_zone}")
-            self.audio_manager.play_music(new_zone)
+            self.audio_manager.play_music(self.environment.get_zone_music(new_zone))
     
     def update_combat_state(self):
+        self.handle_combat_actions()
         self.resolve_combat_turn()
     
-    def render(self):
+    def interpolate_position(self, previous, current, alpha):
+        """Position de rendu entre les deux derniers états simulés"""
+        if previous is None:
+            return current
+        return (
+            previous[0] + (current[0] - previous[0]) * alpha,
+            previous[1] + (current[1] - previous[1]) * alpha
+        )
+    
+    def to_screen(self, position):
+        """Convertit une position monde en position écran selon la caméra"""
+        camera_x, camera_y = self.world_streamer.camera
+        return (position[0] - camera_x, position[1] - camera_y)
+    
+    def render(self, alpha=1.0):
+        # L'exploration ne redessine que les zones modifiées
+        if self.game_state == "playing":
+            self.render_playing_state(alpha)
+            if not self.headless:
+                self.renderer.present()
+            return
+        
+        # Les autres écrans sont redessinés entièrement
+        self.renderer.invalidate()
+        
         # Effacer l'écran
         self.screen.fill((0, 0, 0))
         
@@ -359,8 +702,8 @@ class Game:
         if self.game_state == "menu":
             self.main_menu.draw(self.screen)
         
-        elif self.game_state == "playing":
-            self.render_playing_state()
+        elif self.game_state == "load_menu":
+            self.load_menu.draw(self.screen)
         
         elif self.game_state == "combat":
             self.render_combat_state()
@@ -372,33 +715,42 @@ class Game:
             self.render_game_over()
         
         # Mettre à jour l'affichage
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
     
-    def render_playing_state(self):
-        # Dessiner l'environnement
-        self.screen.blit(self.assets["environments"][self.current_zone], (0, 0))
+    def render_playing_state(self, alpha=1.0):
+        # Restaurer l'environnement sous les zones de la frame précédente
+        camera = self.world_streamer.camera
+        self.renderer.begin_frame(self.world_streamer, camera)
         
         # Dessiner les PNJs
         for npc in self.npcs:
-            self.screen.blit(self.assets["npcs"][npc.type], npc.position)
-        
-        # Dessiner les monstres
-        for monster in self.environment.get_monsters_in_current_zone(self.current_zone):
-            self.screen.blit(self.assets["monsters"][monster.type], monster.position)
-        
-        # Dessiner le joueur avec animation
-        player_frame = self.animation_manager.get_current_frame()
+            self.renderer.draw(self.assets["npcs"][npc.type], self.to_screen(npc.position))
+        
+        # Dessiner les monstres, interpolés entre les deux derniers pas
+        view_rect = self.world_streamer.get_view_rect()
+        for monster, position in self.environment.get_visible_monsters(view_rect, self.current_zone, alpha):
+            frame = self.animation_manager.get_frame(monster) or self.assets["monsters"][monster.type]
+            self.renderer.draw(frame, self.to_screen(position))
+        
+        # Dessiner le joueur avec animation, interpolé entre les deux derniers pas
+        player_position = self.to_screen(self.interpolate_position(
+            self.previous_player_position, self.player.position, alpha
+        ))
+        player_frame = self.animation_manager.get_frame("player")
         if player_frame:
-            self.screen.blit(player_frame, self.player.position)
+            self.renderer.draw(player_frame, player_position)
         else:
-            self.screen.blit(self.assets["player"], self.player.position)
+            self.renderer.draw(self.assets["player"], player_position)
         
-        # Dessiner l'UI
-        self.ui.draw(self.screen, self.game_state)
+        # Dessiner l'UI (HUD et overlays)
+        self.renderer.track(self.ui.draw(self.screen, self.game_state))
+        if self.control_system.touch_enabled:
+            self.renderer.track(self.control_system.draw_touch_controls(self.screen))
     
     def render_combat_state(self):
         # Fond de combat
-        self.screen.fill((30, 0, 0))  Fond rouge sombre
+        self.screen.fill((30, 0, 0))  # Fond rouge sombre
         
         # Dessiner le joueur et le monstre
         self.screen.blit(self.assets["player"], (200, 300))
@@ -409,7 +761,7 @@ class Game:
     
     def render_dialogue_state(self):
         # Dessiner l'environnement en arrière-plan
-        self.screen.blit(self.assets["environments"][self.current_zone], (0, 0))
+        self.world_streamer.draw(self.screen)
         
         # Boîte de dialogue
         dialogue_box = pygame.Surface((700, 150), pygame.SRCALPHA)
@@ -419,34 +771,130 @@ class Game:
         # Texte de dialogue
         current_line = self.dialogue_system.get_current_line()
         if current_line:
-            font = pygame.font.SysFont("Arial", 20)
-            text = font.render(current_line, True, (255, 255, 255))
+            font = get_font("Arial", 20)
+            text = render_text(font, current_line, (255, 255, 255))
             self.screen.blit(text, (70, 420))
             
             # Indicateur de continuation
-            continue_text = font.render("Appuyez sur ENTREE pour continuer...", True, (200, 200, 200))
+            continue_text = render_text(font, "Appuyez sur ENTREE pour continuer...", (200, 200, 200))
             self.screen.blit(continue_text, (70, 470))
     
     def render_game_over(self):
         self.screen.fill((0, 0, 0))
-        font = pygame.font.SysFont("Arial", 48)
-        text = font.render("GAME OVER", True, (255, 0, 0))
+        font = get_font("Arial", 48)
+        text = render_text(font, "GAME OVER", (255, 0, 0))
         self.screen.blit(text, (400 - text.get_width() // 2, 250))
         
-        font = pygame.font.SysFont("Arial", 24)
-        restart_text = font.render("Appuyez sur R pour recommencer", True, (255, 255, 255))
+        font = get_font("Arial", 24)
+        restart_text = render_text(font, "Appuyez sur R pour recommencer", (255, 255, 255))
         self.screen.blit(restart_text, (400 - restart_text.get_width() // 2, 320))
     
+    def save_game(self, slot=0, automatic=False):
+        """Capture l'état et la miniature; l'écriture se fait en arrière-plan"""
+        self.autosave.save(
+            self.player, self.environment, self.quest_manager, self.game_time / 1000,
+            slot, automatic, self.capture_thumbnail()
+        )
+    
+    def capture_thumbnail(self):
+        """Dernière image affichée, réduite pour le menu de chargement (octets RGB)"""
+        thumbnail = pygame.transform.smoothscale(self.screen, THUMBNAIL_SIZE)
+        return pygame.image.tobytes(thumbnail, "RGB")
+    
+    def show_load_menu(self):
+        self.load_menu.open()
+        self.game_state = "load_menu"
+    
+    def poll_saves(self):
+        """Annonce les sauvegardes terminées et leur durée"""
+        for result in self.autosave.poll():
+            if result.error:
+                self.ui.messages.append(f"Échec de la sauvegarde: {result.error}")
+                continue
+            label = "Sauvegarde automatique" if result.automatic else "Partie sauvegardée!"
+            self.ui.messages.append(f"{label} ({result.snapshot_ms + result.write_ms:.0f} ms)")
+    
     def run(self):
         while self.running:
+            frame_ms = self.frame_pacer.tick()
+            if self.asset_loader:
+                self.asset_loader.poll()
+            self.poll_saves()
+            self.config.update()
+            self.check_new_game()
             self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(60)
-        
+            
+            # Autant de pas fixes que le temps écoulé le demande
+            for _ in range(self.timestep.advance(frame_ms)):
+                self.step(self.step_ms)
+            
+            self.render(self.timestep.get_alpha())
+        
+        if self.input_recorder:
+            self.input_recorder.save(self.tick)
+            print(f"Partie enregistrée: {self.record_path} ({self.tick} ticks)")
+        self.autosave.shutdown()
+        self.config.flush()
+        if self.asset_loader:
+            self.asset_loader.shutdown()
+        if self.flow_field:
+            self.flow_field.shutdown()
         pygame.quit()
         sys.exit()
+    
+    def run_headless(self, max_ticks=None):
+        """Boucle sans rendu ni limite de framerate, avec horloge simulée"""
+        while self.running and (max_ticks is None or self.clock.tick_count < max_ticks):
+            self.check_new_game()
+            self.handle_events()
+            self.step(self.step_ms)
+            self.clock.tick()
+        
+        tps = self.clock.get_real_tps()
+        print(f"Simulation headless: {self.clock.tick_count} ticks, {tps:.0f} ticks/s")
+        return tps
+    
+    def run_replay(self, playback):
+        """Rejoue un enregistrement sans rendu, à vitesse maximale; vrai si les hashes concordent"""
+        self.seed = playback.seed
+        self.input_playback = playback
+        self.step_ms = 1000 / playback.tick_rate
+        self.initialize_game()
+        while self.running and self.tick < playback.ticks:
+            self.handle_events()
+            self.step(self.step_ms)
+            self.clock.tick()
+        
+        tps = self.clock.get_real_tps()
+        print(f"Rejeu: {self.tick} ticks, {tps:.0f} ticks/s")
+        for tick, expected, actual in playback.mismatches[:5]:
+            print(f"Divergence au tick {tick}: attendu {expected}, obtenu {actual}")
+        return not playback.mismatches
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Ycrad l'Aventurier")
+    parser.add_argument("--headless", action="store_true",
+                        help="Simulation sans fenêtre ni audio, à vitesse maximale")
+    parser.add_argument("--ticks", type=int, default=10000,
+                        help="Nombre de ticks à simuler en mode headless")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Graine des flux aléatoires (partie reproductible)")
+    parser.add_argument("--record", metavar="FICHIER",
+                        help="Enregistre les entrées de la partie pour un rejeu")
+    parser.add_argument("--replay", metavar="FICHIER",
+                        help="Rejoue un enregistrement en headless et vérifie les hashes d'état")
+    args = parser.parse_args()
+    
+    if args.replay:
+        game = Game(headless=True)
+        identical = game.run_replay(InputPlayback.load(args.replay))
+        pygame.quit()
+        sys.exit(0 if identical else 1)
+    elif args.headless:
+        game = Game(headless=True, seed=args.seed)
+        game.initialize_game()
+        game.run_headless(args.ticks)
+        pygame.quit()
+    else:
+        game = Game(seed=args.seed, record_path=args.record)
+        game.run()
@@ -1,11 +1,15 @@
 # menu.py - Système de menu principal
+import pygame
+from fonts import get_font, render_text
+from save_format import THUMBNAIL_SIZE
+
 class MainMenu:
     def __init__(self, game):
         self.game = game
         self.options = ["Nouvelle Partie", "Charger Partie", "Options", "Quitter"]
         self.selected_option = 0
-        self.font = pygame.font.SysFont("Arial", 32)
-        self.title_font = pygame.font.SysFont("Arial", 48, bold=True)
+        self.font = get_font("Arial", 32)
+        self.title_font = get_font("Arial", 48, bold=True)
         
         # Animation de fond
         self.background = self.create_animated_background()
@@ -25,19 +29,31 @@ class MainMenu:
         screen.blit(self.background, (0, 0))
         
         # Dessiner le titre
-        title = self.title_font.render("YCRAD L'AVENTURIER", True, (255, 215, 0))
+        title = render_text(self.title_font, "YCRAD L'AVENTURIER", (255, 215, 0))
         screen.blit(title, (400 - title.get_width() // 2, 100))
         
         # Dessiner les options
         for i, option in enumerate(self.options):
             color = (255, 255, 255) if i == self.selected_option else (150, 150, 150)
-            text = self.font.render(option, True, color)
+            text = render_text(self.font, option, color)
             screen.blit(text, (400 - text.get_width() // 2, 250 + i * 50))
         
+        # Barre de chargement des assets de jeu
+        loader = self.game.asset_loader
+        if loader and not loader.is_done():
+            self.draw_loading_bar(screen, loader.get_progress())
+        
         # Dessiner les informations de copyright
-        copyright_text = self.font.render("© 2024 VotreStudio", True, (100, 100, 100))
+        copyright_text = render_text(self.font, "© 2024 VotreStudio", (100, 100, 100))
         screen.blit(copyright_text, (400 - copyright_text.get_width() // 2, 550))
     
+    def draw_loading_bar(self, screen, progress):
+        pygame.draw.rect(screen, (50, 50, 50), (250, 480, 300, 12))
+        pygame.draw.rect(screen, (255, 215, 0), (250, 480, 300 * progress, 12))
+        pygame.draw.rect(screen, (200, 200, 200), (250, 480, 300, 12), 1)
+        label = render_text(self.font, f"Chargement... {int(progress * 100)}%", (150, 150, 150))
+        screen.blit(label, (400 - label.get_width() // 2, 500))
+    
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP:
@@ -56,3 +72,73 @@ class MainMenu:
             self.game.show_options_menu()
         elif self.selected_option == 3:  # Quitter
             self.game.running = False
+
+
+class LoadMenu:
+    """Choix d'une sauvegarde, construit depuis l'index des slots"""
+    VISIBLE_ROWS = 6
+    
+    def __init__(self, game):
+        self.game = game
+        self.font = get_font("Arial", 24)
+        self.small_font = get_font("Arial", 18)
+        self.title_font = get_font("Arial", 40, bold=True)
+        self.slots = []
+        self.thumbnails = {}  # Slot -> Surface
+        self.selected = 0
+        self.scroll = 0
+    
+    def open(self):
+        self.slots = self.game.save_system.get_save_slots()
+        self.thumbnails = {
+            slot["slot"]: pygame.image.frombytes(slot["thumbnail"], THUMBNAIL_SIZE, "RGB")
+            for slot in self.slots if slot["exists"] and slot["thumbnail"]
+        }
+        self.selected = 0
+        self.scroll = 0
+    
+    def draw(self, screen):
+        title = render_text(self.title_font, "Charger une partie", (255, 215, 0))
+        screen.blit(title, (400 - title.get_width() // 2, 40))
+        
+        row_height = THUMBNAIL_SIZE[1] + 32
+        visible = self.slots[self.scroll:self.scroll + self.VISIBLE_ROWS]
+        for row, slot in enumerate(visible, start=self.scroll):
+            y = 110 + (row - self.scroll) * row_height
+            selected = row == self.selected
+            color = (255, 255, 255) if selected else (150, 150, 150)
+            if selected:
+                pygame.draw.rect(screen, (60, 60, 90), (90, y - 6, 620, row_height - 8))
+            
+            label = "Sauvegarde auto" if slot["slot"] == "auto" else f"Emplacement {slot['slot'] + 1}"
+            screen.blit(render_text(self.font, label, color), (250, y))
+            if not slot["exists"]:
+                screen.blit(render_text(self.small_font, "Vide", (100, 100, 100)), (250, y + 28))
+                continue
+            
+            thumbnail = self.thumbnails.get(slot["slot"])
+            if thumbnail:
+                screen.blit(thumbnail, (110, y))
+            pygame.draw.rect(screen, color, (110, y, THUMBNAIL_SIZE[0], THUMBNAIL_SIZE[1]), 1)
+            minutes, seconds = divmod(int(slot["play_time"]), 60)
+            hours, minutes = divmod(minutes, 60)
+            details = (f"{slot['player_name']} - niveau {slot['player_level']} - {slot['zone']}"
+                       f" - {hours}:{minutes:02d}:{seconds:02d}")
+            screen.blit(render_text(self.small_font, details, color), (250, y + 28))
+        
+        hint = render_text(self.small_font, "Entrée: charger   Échap: retour", (100, 100, 100))
+        screen.blit(hint, (400 - hint.get_width() // 2, 560))
+    
+    def handle_input(self, event):
+        if event.type != pygame.KEYDOWN or not self.slots:
+            return
+        if event.key == pygame.K_UP:
+            self.selected = (self.selected - 1) % len(self.slots)
+        elif event.key == pygame.K_DOWN:
+            self.selected = (self.selected + 1) % len(self.slots)
+        elif event.key == pygame.K_ESCAPE:
+            self.game.game_state = "menu"
+        elif event.key == pygame.K_RETURN and self.slots[self.selected]["exists"]:
+            self.game.load_game(self.slots[self.selected]["slot"])
+        # Garder la sélection visible
+        self.scroll = min(max(self.scroll, self.selected - self.VISIBLE_ROWS + 1), self.selected)
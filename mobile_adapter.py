@@ -28,7 +28,7 @@ class MobileAdapter:
         screen_width, screen_height = info.current_w, info.current_h
         
         # Calculer le facteur d'échelle
-        self.scale_factor = min(screen_width / 800, screen_height / 600)
+        self.update_scale_factor((screen_width, screen_height))
         
         # Configurer pour le tactile
         pygame.display.set_mode((screen_width, screen_height), pygame.FULLSCREEN)
@@ -36,6 +36,10 @@ class MobileAdapter:
         # Ajuster la taille de police
         pygame.font.init()
         
+    def update_scale_factor(self, screen_size):
+        """Échelle par rapport à la résolution de référence 800x600"""
+        self.scale_factor = min(screen_size[0] / 800, screen_size[1] / 600)
+    
     def scale_value(self, value):
         """Met à l'échelle une valeur selon l'écran"""
         return int(value * self.scale_factor)
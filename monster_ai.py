@@ -0,0 +1,182 @@
+# monster_ai.py - Comportement des monstres et ordonnanceur à niveaux de détail
+import math
+import random
+import time
+from collections import deque
+from tilemap import TILE_SIZE
+
+
+class MonsterAI:
+    """Décide de la vitesse d'un monstre: poursuite du joueur ou errance"""
+
+    def __init__(self, aggro_radius=120, contact_radius=18, rng=None, flow_field=None, pathfinder=None):
+        self.aggro_radius = aggro_radius
+        self.contact_radius = contact_radius
+        self.rng = rng or random.Random()
+        self.flow_field = flow_field  # Champ de flux vers le joueur (contourne les obstacles)
+        self.pathfinder = pathfinder  # A* par monstre quand le champ ne donne pas de direction
+
+    def think(self, monster, player_position, elapsed_ms, zone_bounds=None):
+        dx = player_position[0] - monster.position[0]
+        dy = player_position[1] - monster.position[1]
+        dist_sq = dx * dx + dy * dy
+
+        if dist_sq < self.aggro_radius * self.aggro_radius:
+            # Poursuite, arrêt au contact
+            if dist_sq < self.contact_radius * self.contact_radius:
+                monster.velocity = (0.0, 0.0)
+                return
+            direction = None
+            half = TILE_SIZE / 2
+            center = (monster.position[0] + half, monster.position[1] + half)
+            if self.flow_field is not None:
+                direction = self.flow_field.sample(center)
+            if direction is None and self.pathfinder is not None \
+                    and (self.flow_field is None or not self.flow_field.covers(center)):
+                # Champ pas encore prêt ou tuile hors du champ
+                direction = self.path_direction(center, (player_position[0] + half, player_position[1] + half))
+            if direction is None:
+                # Même tuile que le joueur ou aucun chemin: ligne droite
+                distance = math.sqrt(dist_sq)
+                direction = (dx / distance, dy / distance)
+            monster.velocity = (direction[0] * monster.speed, direction[1] * monster.speed)
+            return
+
+        # Errance: nouvelle direction de temps en temps
+        monster.wander_timer = getattr(monster, "wander_timer", 0) - elapsed_ms
+        if monster.wander_timer > 0 and not self.outside_zone(monster, zone_bounds):
+            return
+        monster.wander_timer = self.rng.uniform(1000, 3000)
+
+        if self.outside_zone(monster, zone_bounds):
+            # Revenir vers le centre de sa zone
+            center_x = sum(zone_bounds["x"]) / 2
+            center_y = sum(zone_bounds["y"]) / 2
+            angle = math.atan2(center_y - monster.position[1], center_x - monster.position[0])
+        elif self.rng.random() < 0.4:
+            monster.velocity = (0.0, 0.0)
+            return
+        else:
+            angle = self.rng.uniform(0, 2 * math.pi)
+        speed = monster.speed * 0.5
+        monster.velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
+
+    def path_direction(self, start, goal):
+        """Direction unitaire vers la tuile suivante du chemin A*, ou None"""
+        path = self.pathfinder.find_path_world(start, goal)
+        if path is None or len(path) < 2:
+            return None  # Inaccessible ou même tuile
+        dx = path[1][0] - start[0]
+        dy = path[1][1] - start[1]
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance == 0:
+            return None
+        return (dx / distance, dy / distance)
+
+    def outside_zone(self, monster, zone_bounds):
+        if zone_bounds is None:
+            return False
+        x, y = monster.position[0], monster.position[1]
+        return not (zone_bounds["x"][0] <= x <= zone_bounds["x"][1]
+                    and zone_bounds["y"][0] <= y <= zone_bounds["y"][1])
+
+
+class AIScheduler:
+    """Fait penser les monstres à une fréquence qui dépend de leur distance au joueur
+
+    Proches: chaque frame. Moyens: toutes les mid_interval frames. Lointains:
+    toutes les far_interval frames. Autres zones: endormis. Le travail qui ne
+    tient pas dans budget_ms est reporté à la frame suivante.
+    """
+
+    def __init__(self, environment, ai=None, budget_ms=2.0, near_radius=150, far_radius=400,
+                 mid_interval=4, far_interval=16):
+        self.environment = environment
+        self.ai = ai or MonsterAI()
+        self.budget_ms = budget_ms  # None: pas de limite (simulation déterministe)
+        self.near_radius = near_radius
+        self.far_radius = far_radius
+        self.mid_interval = mid_interval
+        self.far_interval = far_interval
+        self.frame = 0
+        self.queue = deque()
+        self.queued = set()
+        self.last_think = {}  # Monstre -> frame de sa dernière réflexion
+        self.awake_zone = None
+        self.stats = {"thought": 0, "carried_over": 0}
+
+    def update(self, player_position, zone_name, dt):
+        self.frame += 1
+        if zone_name != self.awake_zone:
+            self.sleep_zone(self.awake_zone)
+            self.awake_zone = zone_name
+
+        self.schedule(player_position, zone_name)
+        self.process(player_position, zone_name, dt)
+
+    def schedule(self, player_position, zone_name):
+        """Met en file les monstres dont le tour de réflexion est venu"""
+        monsters = self.environment.get_monsters_in_current_zone(zone_name)
+        if not monsters:
+            return
+
+        store = self.environment.entity_store
+        distances_sq = store.distances_sq_to(player_position, [monster.index for monster in monsters])
+        near_sq = self.near_radius * self.near_radius
+        far_sq = self.far_radius * self.far_radius
+
+        for monster, dist_sq in zip(monsters, distances_sq):
+            if monster in self.queued:
+                continue
+            if dist_sq < near_sq:
+                interval = 1
+            elif dist_sq < far_sq:
+                interval = self.mid_interval
+            else:
+                interval = self.far_interval
+            if self.frame - self.last_think.get(monster, -interval) < interval:
+                continue
+
+            self.queued.add(monster)
+            if interval == 1:
+                self.queue.appendleft(monster)  # Les proches passent en premier
+            else:
+                self.queue.append(monster)
+
+    def process(self, player_position, zone_name, dt):
+        """Fait penser les monstres en file, dans la limite du budget de la frame"""
+        zone_bounds = self.environment.zone_boundaries.get(zone_name)
+        deadline = None
+        if self.budget_ms is not None:
+            deadline = time.perf_counter() + self.budget_ms / 1000
+
+        while self.queue:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            monster = self.queue.popleft()
+            self.queued.discard(monster)
+            if monster.hp <= 0 or getattr(monster, "zone", zone_name) != zone_name:
+                continue
+            elapsed = (self.frame - self.last_think.get(monster, self.frame - 1)) * dt
+            self.ai.think(monster, player_position, elapsed, zone_bounds)
+            self.last_think[monster] = self.frame
+            self.stats["thought"] += 1
+
+        self.stats["carried_over"] = len(self.queue)
+
+    def sleep_zone(self, zone_name):
+        """Arrête les monstres d'une zone que le joueur a quittée"""
+        if zone_name is None:
+            return
+        for monster in self.environment.get_monsters_in_current_zone(zone_name):
+            monster.velocity = (0.0, 0.0)
+            self.last_think.pop(monster, None)
+        self.queue = deque(m for m in self.queue if getattr(m, "zone", None) != zone_name)
+        self.queued = set(self.queue)
+
+    def forget(self, monster):
+        """À appeler quand un monstre est retiré du monde"""
+        self.last_think.pop(monster, None)
+        if monster in self.queued:
+            self.queued.discard(monster)
+            self.queue.remove(monster)
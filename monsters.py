@@ -1,15 +1,69 @@
 # monsters.py - Système de monstres et boss
+import random
+from entity_store import EntityStore
+from loot import get_loot_table
+
 class Monster:
-    def __init__(self, monster_type, level, position):
+    """Vue sur une ligne de l'EntityStore (position, PV et niveau y sont stockés)"""
+    
+    def __init__(self, monster_type, level, position, store=None):
+        self.store = store if store is not None else EntityStore(capacity=1)
+        self.index = self.store.allocate(self, monster_type, position)
         self.type = monster_type
         self.name = monster_type.capitalize()
         self.level = level
-        self.position = position
         self.hp = self.max_hp = 20 + (level * 10)
         self.damage = 5 + level
         self.xp_reward = 10 + (level * 5)
         self.gold_reward = 5 + level
-        self.loot_table = []
+        self.speed = 40  # px par seconde
+        self.loot_table = get_loot_table(monster_type)  # Partagée par tous les monstres du type
+    
+    @property
+    def position(self):
+        return self.store.positions[self.index]
+    
+    @position.setter
+    def position(self, value):
+        # Placement direct (téléportation): pas d'interpolation depuis l'ancienne position
+        self.store.positions[self.index] = value
+        self.store.previous_positions[self.index] = value
+    
+    @property
+    def velocity(self):
+        return self.store.velocities[self.index]
+    
+    @velocity.setter
+    def velocity(self, value):
+        self.store.velocities[self.index] = value
+    
+    @property
+    def hp(self):
+        return int(self.store.hp[self.index])
+    
+    @hp.setter
+    def hp(self, value):
+        self.store.hp[self.index] = value
+    
+    @property
+    def max_hp(self):
+        return int(self.store.max_hp[self.index])
+    
+    @max_hp.setter
+    def max_hp(self, value):
+        self.store.max_hp[self.index] = value
+    
+    @property
+    def level(self):
+        return int(self.store.levels[self.index])
+    
+    @level.setter
+    def level(self, value):
+        self.store.levels[self.index] = value
+    
+    def release(self):
+        """Libère la ligne du store (monstre retiré du monde)"""
+        self.store.release(self.index)
     
     def take_damage(self, damage):
         self.hp -= damage
@@ -19,36 +73,32 @@ class Monster:
         damage = self.damage
         return target.take_damage(damage)
     
-    def generate_loot(self):
-        # Générer du loot aléatoire basé sur la table de butin
-        import random
-        loot = []
-        for item, chance in self.loot_table:
-            if random.random() < chance:
-                loot.append(item)
-        return loot
+    def generate_loot(self, rng=random):
+        """Ids des objets laissés par le monstre"""
+        return self.loot_table.roll(rng)
 
 class Slime(Monster):
-    def __init__(self, level, position):
-        super().__init__("slime", level, position)
+    def __init__(self, level, position, store=None):
+        super().__init__("slime", level, position, store)
         self.hp = self.max_hp = 15 + (level * 8)
         self.damage = 3 + level
-        self.loot_table = [("Gelée visqueuse", 0.7), ("Petite potion", 0.3)]
+        self.speed = 25
 
 class Rat(Monster):
-    def __init__(self, level, position):
-        super().__init__("rat", level, position)
+    def __init__(self, level, position, store=None):
+        super().__init__("rat", level, position, store)
         self.hp = self.max_hp = 12 + (level * 6)
         self.damage = 4 + level
-        self.loot_table = [("Queue de rat", 0.5), ("Fromage volé", 0.2)]
+        self.speed = 60
 
 class Boss(Monster):
-    def __init__(self, boss_name, level, position):
-        super().__init__(boss_name, level, position)
+    def __init__(self, boss_name, level, position, store=None):
+        super().__init__(boss_name, level, position, store)
         self.hp = self.max_hp = 100 + (level * 50)
         self.damage = 15 + (level * 3)
         self.xp_reward = 100 + (level * 25)
         self.gold_reward = 50 + (level * 10)
+        self.speed = 30
         self.special_attacks = []
     
     def use_special_attack(self, target):
@@ -56,7 +106,16 @@ class Boss(Monster):
         pass
 
 class Korvash(Boss):
-    def __init__(self, level, position):
-        super().__init__("Korvash le Dévoreur", level, position)
-        self.loot_table = [("Épée maudite", 0.4), ("Amulette des marais", 0.6)]
+    def __init__(self, level, position, store=None):
+        super().__init__("Korvash le Dévoreur", level, position, store)
         self.special_attacks = ["Empoisonnement", "Étreinte mortelle"]
+
+MONSTER_CLASSES = {
+    "slime": Slime,
+    "rat": Rat,
+    "Korvash le Dévoreur": Korvash
+}
+
+def create_monster(monster_type, level, position, store=None):
+    """Crée un monstre à partir de son type (génération de zone, chargement)"""
+    return MONSTER_CLASSES[monster_type](level, position, store)
@@ -0,0 +1,239 @@
+# pathfinding.py - A* avec cache de chemins et champ de flux vers le joueur
+import heapq
+import math
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from tilemap import BLOCKING
+
+# Voisins 8-directions: (dx, dy, coût)
+NEIGHBORS = [
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+]
+
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+def blocked_grid(tilemap):
+    """Grille booléenne (hauteur, largeur) des tuiles infranchissables"""
+    grid = np.frombuffer(bytes(tilemap.collision), dtype=np.uint8).reshape(tilemap.height, tilemap.width)
+    return (grid & BLOCKING) != 0
+
+
+class Pathfinder:
+    """A* sur la grille de collision, avec un cache LRU des chemins calculés"""
+
+    def __init__(self, tilemap, cache_size=256):
+        self.tilemap = tilemap
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (départ, arrivée) -> liste de tuiles ou None
+        self.stats = {"hits": 0, "misses": 0}
+        tilemap.add_listener(self.on_tile_changed)
+
+    def on_tile_changed(self, tx, ty):
+        self.cache.clear()  # Les chemins en cache peuvent traverser la tuile
+
+    def can_step(self, tx, ty, dx, dy):
+        """Pas de coin coupé en diagonale"""
+        if self.tilemap.is_blocked(tx + dx, ty + dy):
+            return False
+        if dx and dy:
+            return not self.tilemap.is_blocked(tx + dx, ty) and not self.tilemap.is_blocked(tx, ty + dy)
+        return True
+
+    def find_path(self, start, goal):
+        """Chemin de tuiles de start à goal (inclus), ou None si inaccessible"""
+        key = (tuple(start), tuple(goal))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return self.cache[key]
+
+        self.stats["misses"] += 1
+        path = self.search(*key)
+        self.cache[key] = path
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return path
+
+    def search(self, start, goal):
+        if self.tilemap.is_blocked(*goal):
+            return None
+
+        def heuristic(tile):
+            # Distance octile
+            dx, dy = abs(tile[0] - goal[0]), abs(tile[1] - goal[1])
+            return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+
+        open_heap = [(heuristic(start), 0.0, start)]
+        came_from = {start: None}
+        costs = {start: 0.0}
+        while open_heap:
+            _, cost, tile = heapq.heappop(open_heap)
+            if tile == goal:
+                path = []
+                while tile is not None:
+                    path.append(tile)
+                    tile = came_from[tile]
+                path.reverse()
+                return path
+            if cost > costs[tile]:
+                continue  # Entrée périmée
+            for dx, dy, step in NEIGHBORS:
+                if not self.can_step(tile[0], tile[1], dx, dy):
+                    continue
+                neighbor = (tile[0] + dx, tile[1] + dy)
+                new_cost = cost + step
+                if new_cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = new_cost
+                    came_from[neighbor] = tile
+                    heapq.heappush(open_heap, (new_cost + heuristic(neighbor), new_cost, neighbor))
+        return None
+
+    def find_path_world(self, start_pos, goal_pos):
+        """Chemin entre deux positions monde, en centres de tuiles"""
+        size = self.tilemap.tile_size
+        start = (int(start_pos[0] // size), int(start_pos[1] // size))
+        goal = (int(goal_pos[0] // size), int(goal_pos[1] // size))
+        path = self.find_path(start, goal)
+        if path is None:
+            return None
+        return [(tx * size + size / 2, ty * size + size / 2) for tx, ty in path]
+
+
+def compute_flow_field(blocked, target, max_distance=None):
+    """Distances (en pas) à target et direction de descente pour chaque tuile
+
+    Retourne (distances, directions): directions[ty, tx] = (dx, dy) vers la
+    tuile voisine la plus proche de la cible, (0, 0) sur la cible ou si inaccessible.
+    """
+    height, width = blocked.shape
+    distances = np.full((height, width), UNREACHABLE, dtype=np.int32)
+    tx, ty = target
+    if 0 <= tx < width and 0 <= ty < height and not blocked[ty, tx]:
+        # Parcours en largeur (4 voisins) depuis la cible
+        distances[ty, tx] = 0
+        queue = deque([(tx, ty)])
+        while queue:
+            x, y = queue.popleft()
+            distance = distances[y, x] + 1
+            if max_distance is not None and distance > max_distance:
+                continue
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if 0 <= nx < width and 0 <= ny < height and not blocked[ny, nx] \
+                        and distances[ny, nx] == UNREACHABLE:
+                    distances[ny, nx] = distance
+                    queue.append((nx, ny))
+
+    # Direction: voisin de plus petite distance (8 voisins, sans couper les coins)
+    padded = np.full((height + 2, width + 2), UNREACHABLE, dtype=np.int64)
+    padded[1:-1, 1:-1] = distances
+    candidates = []
+    for dx, dy, _ in NEIGHBORS:
+        shifted = padded[1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx].copy()
+        if dx and dy:
+            corner_blocked = (padded[1:-1, 1 + dx:width + 1 + dx] == UNREACHABLE) | \
+                             (padded[1 + dy:height + 1 + dy, 1:-1] == UNREACHABLE)
+            shifted[corner_blocked] = UNREACHABLE
+        candidates.append(shifted)
+    candidates = np.stack(candidates)
+    best = np.argmin(candidates, axis=0)
+    improves = (np.take_along_axis(candidates, best[None], axis=0)[0] < distances) & ~blocked
+
+    steps = np.array([(dx, dy) for dx, dy, _ in NEIGHBORS], dtype=np.float64)
+    steps /= np.linalg.norm(steps, axis=1)[:, None]
+    directions = np.where(improves[..., None], steps[best], 0.0)
+    return distances, directions
+
+
+class FlowField:
+    """Champ de flux vers une cible (le joueur), partagé par tous les monstres
+
+    Recalculé seulement quand la cible change de tuile ou que la carte change.
+    En mode threaded, le calcul tourne sur un thread et l'ancien champ reste
+    utilisable en attendant.
+    """
+
+    def __init__(self, tilemap, max_distance=None, threaded=False):
+        self.tilemap = tilemap
+        self.max_distance = max_distance  # En tuiles, None = toute la carte
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="flowfield") if threaded else None
+        self.future = None
+        self.target = None  # Tuile cible du champ courant
+        self.requested = None  # Dernière tuile cible demandée
+        self.distances = None
+        self.directions = None
+        self.map_changed = False
+        self.stats = {"recomputes": 0}
+        tilemap.add_listener(self.on_tile_changed)
+
+    def on_tile_changed(self, tx, ty):
+        self.map_changed = True
+
+    def get_tile(self, position):
+        size = self.tilemap.tile_size
+        return (int(position[0] // size), int(position[1] // size))
+
+    def update(self, target_position):
+        """À appeler à chaque frame avec la position (centre) de la cible"""
+        if self.future is not None and self.future.done():
+            self.target, (self.distances, self.directions) = self.future.result()
+            self.future = None
+
+        tile = self.get_tile(target_position)
+        if tile == self.requested and not self.map_changed:
+            return
+        if self.future is not None:
+            return  # Calcul en cours: la nouvelle tuile sera prise à la frame suivante
+
+        self.requested = tile
+        self.map_changed = False
+        self.stats["recomputes"] += 1
+        blocked = blocked_grid(self.tilemap)
+        if self.executor is None:
+            self.target = tile
+            self.distances, self.directions = compute_flow_field(blocked, tile, self.max_distance)
+        else:
+            self.future = self.executor.submit(self.compute, blocked, tile)
+
+    def compute(self, blocked, tile):
+        return tile, compute_flow_field(blocked, tile, self.max_distance)
+
+    def sample(self, position):
+        """Direction unitaire (dx, dy) vers la cible depuis position, O(1)
+
+        None si le champ n'est pas prêt ou si la tuile ne mène pas à la cible.
+        """
+        if self.directions is None:
+            return None
+        tx, ty = self.get_tile(position)
+        if not (0 <= tx < self.tilemap.width and 0 <= ty < self.tilemap.height):
+            return None
+        dx, dy = self.directions[ty, tx]
+        if dx == 0 and dy == 0:
+            return None
+        return (dx, dy)
+
+    def distance(self, position):
+        """Nombre de pas jusqu'à la cible, ou None si inaccessible"""
+        if self.distances is None:
+            return None
+        tx, ty = self.get_tile(position)
+        if not (0 <= tx < self.tilemap.width and 0 <= ty < self.tilemap.height):
+            return None
+        distance = self.distances[ty, tx]
+        return None if distance == UNREACHABLE else int(distance)
+
+    def covers(self, position):
+        """Faux si le champ n'est pas prêt ou s'arrête avant position (max_distance)
+
+        Sur un champ complet, une tuile sans distance est vraiment inaccessible.
+        """
+        if self.distances is None:
+            return False
+        return self.max_distance is None or self.distance(position) is not None
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,8 @@
 # player.py - Système de joueur avancé avec classes et compétences
 import pygame
-import math
+import random
+from inventory import Inventory
+from combat import ATTACK, SKILL, PlayerState, MonsterState, resolve_player_action
 
 class Player:
     def __init__(self, name, starting_class):
@@ -13,21 +15,13 @@ class Player:
         self.mp = 50
         self.max_mp = 50
         self.position = [400, 300]
-        self.speed = 3.0
+        self.speed = 180.0  # px par seconde (3 px par frame à 60 FPS)
         self.is_moving = False
         self.direction = "down"  # down, up, left, right
         self.gold = 50
         
-        # Équipement
-        self.equipment = {
-            "weapon": None,
-            "armor": None,
-            "accessory": None
-        }
-        
-        # Inventaire
-        self.inventory = []
-        self.max_inventory_size = 20
+        # Inventaire (unique, partagé avec l'UI et la sauvegarde) et équipement
+        self.inventory = Inventory(max_size=20)
         
         # Système de classes
         self.classes = {
@@ -52,75 +46,22 @@ class Player:
         # Cooldowns des compétences
         self.skill_cooldowns = {}
     
-    def update(self, control_system, environment, npcs, dt):
-        """Met à jour le joueur avec les entrées de contrôle"""
-        dx, dy = control_system.get_movement_vector()
-        
-        # Mettre à jour la direction
-        if dx > 0: self.direction = "right"
-        elif dx < 0: self.direction = "left"
-        if dy > 0: self.direction = "down"
-        elif dy < 0: self.direction = "up"
-        
-        if dx != 0 or dy != 0:
-            self.is_moving = True
-            
-            # Normaliser le vecteur de mouvement pour les déplacements diagonaux
-            if dx != 0 and dy != 0:
-                magnitude = math.sqrt(dx**2 + dy**2)
-                dx /= magnitude
-                dy /= magnitude
-            
-            # Calculer la nouvelle position
-            new_x = self.position[0] + dx * self.speed
-            new_y = self.position[1] + dy * self.speed
-            
-            # Vérifier les collisions
-            if not self.check_collisions([new_x, new_y], environment, npcs):
-                self.position[0] = new_x
-                self.position[1] = new_y
-        else:
-            self.is_moving = False
-        
-        # Mettre à jour les cooldowns
-        self.update_cooldowns(dt)
-    
-    def update_cooldowns(self, dt):
-        """Met à jour les cooldowns des compétences"""
-        for skill_name in list(self.skill_cooldowns.keys()):
-            self.skill_cooldowns[skill_name] -= dt
-            if self.skill_cooldowns[skill_name] <= 0:
-                del self.skill_cooldowns[skill_name]
-    
-    def check_collisions(self, position, environment, npcs):
-        """Vérifie les collisions avec l'environnement et les PNJs"""
-        # Collision avec l'environnement
-        if environment.check_collision(position):
-            return True
-        
-        # Collision avec les PNJs
-        for npc in npcs:
-            distance = self.calculate_distance(position, npc.position)
-            if distance < 25:  # Rayon de collision
-                return True
-        
-        return False
+    def move_and_collide(self, dx, dy, environment):
+        """Déplace le joueur en glissant le long des obstacles de la carte"""
+        self.position[0], self.position[1] = environment.sweep(self.position, dx, dy)
     
-    def calculate_distance(self, pos1, pos2):
-        return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
+    def attack(self, target, rng=random):
+        """Attaque basique; retourne un TurnResult"""
+        return self.act(target, ATTACK, rng=rng)
     
-    def attack(self, target):
-        """Attaque basique"""
-        base_damage = self.calculate_damage()
-        damage = target.take_damage(base_damage)
-        
-        # Chance de coup critique
-        if self.check_critical_hit():
-            damage *= self.stats["critical_multiplier"]
-            damage = int(damage)
-            return damage, True  # Retourne les dégâts et si c'est un critique
-        
-        return damage, False
+    def act(self, target, action, skill_index=0, rng=random):
+        """Résout une action contre un monstre avec le moteur de combat"""
+        player_state = PlayerState.from_player(self)
+        monster_state = MonsterState.from_monster(target)
+        result = resolve_player_action(player_state, monster_state, action, rng, skill_index)
+        player_state.apply_to(self)
+        monster_state.apply_to(target)
+        return result
     
     def calculate_damage(self):
         """Calcule les dégâts en fonction de la classe et des stats"""
@@ -140,33 +81,9 @@ class Player:
         
         return int(base_damage)
     
-    def check_critical_hit(self):
-        """Vérifie si l'attaque est un coup critique"""
-        return random.random() < self.stats["critical_chance"]
-    
-    def use_skill(self, skill_index, target):
-        """Utilise une compétence"""
-        if skill_index >= len(self.skills):
-            return 0, False
-        
-        skill = self.skills[skill_index]
-        
-        # Vérifier le cooldown
-        if skill.name in self.skill_cooldowns:
-            return 0, False
-        
-        # Vérifier le coût en MP
-        if self.mp < skill.mp_cost:
-            return 0, False
-        
-        # Utiliser la compétence
-        self.mp -= skill.mp_cost
-        damage, is_critical = skill.use(self, target)
-        
-        # Appliquer le cooldown
-        self.skill_cooldowns[skill.name] = skill.cooldown
-        
-        return damage, is_critical
+    def use_skill(self, skill_index, target, rng=random):
+        """Utilise une compétence (MP et cooldown vérifiés); retourne un TurnResult"""
+        return self.act(target, SKILL, skill_index, rng)
     
     def take_damage(self, damage):
         """Reçoit des dégâts"""
@@ -218,7 +135,12 @@ class Player:
         """Améliore les stats secondaires au level up"""
         stat_improvements = self.current_class.get_stat_improvements()
         for stat, value in stat_improvements.items():
-            self.stats[stat] += value
+            if stat == "mp":
+                # Bonus de MP maximum (Mage)
+                self.max_mp += value
+                self.mp = self.max_mp
+            else:
+                self.stats[stat] += value
     
     def learn_new_skills(self):
         """Apprend de nouvelles compétences au level up"""
@@ -227,6 +149,13 @@ class Player:
             if skill not in self.skills:
                 self.skills.append(skill)
     
+    def get_class_key(self):
+        """Clé de la classe actuelle dans self.classes ("warrior"...)"""
+        for key, character_class in self.classes.items():
+            if character_class is self.current_class:
+                return key
+        return None
+    
     def change_class(self, new_class_name):
         """Change de classe"""
         if new_class_name in self.classes:
@@ -236,46 +165,33 @@ class Player:
             return True
         return False
     
-    def add_item(self, item):
+    @property
+    def equipment(self):
+        """Emplacement -> entrée équipée (tenu par l'inventaire)"""
+        return self.inventory.equipped
+    
+    def add_item(self, item_id, count=1):
         """Ajoute un objet à l'inventaire"""
-        if len(self.inventory) < self.max_inventory_size:
-            self.inventory.append(item)
-            return True
-        return False
+        return self.inventory.add_item(item_id, count)
     
-    def remove_item(self, item):
+    def remove_item(self, item_id, count=1):
         """Retire un objet de l'inventaire"""
-        if item in self.inventory:
-            self.inventory.remove(item)
-            return True
-        return False
+        return self.inventory.remove_item(item_id, count)
     
-    def equip(self, item):
-        """Équipe un objet"""
-        if item in self.inventory and item.equip_slot in self.equipment:
-            # Déséquiper l'objet actuel
-            if self.equipment[item.equip_slot]:
-                self.unequip(item.equip_slot)
-            
-            # Équiper le nouvel objet
-            self.equipment[item.equip_slot] = item
-            self.inventory.remove(item)
-            
+    def equip(self, slot_index):
+        """Équipe l'objet d'une case de l'inventaire"""
+        if self.inventory.equip(slot_index):
             # Appliquer les bonus de l'équipement
             self.apply_equipment_bonuses()
-            
             return True
         return False
     
     def unequip(self, slot):
         """Déséquipe un objet"""
-        if self.equipment[slot]:
-            self.inventory.append(self.equipment[slot])
-            
+        item = self.equipment[slot]
+        if item and self.inventory.unequip(slot):
             # Retirer les bonus de l'équipement
-            self.remove_equipment_bonuses(self.equipment[slot])
-            
-            self.equipment[slot] = None
+            self.remove_equipment_bonuses(item)
             return True
         return False
     
@@ -362,18 +278,10 @@ class Skill:
         self.name = name
         self.mp_cost = mp_cost
         self.base_damage = base_damage
-        self.cooldown = cooldown  # en secondes
+        self.cooldown = cooldown  # en tours de combat
     
-    def use(self, user, target):
-        damage = self.base_damage + (user.level * 2)
-        actual_damage = target.take_damage(damage)
-        
-        # Effets spéciaux selon le nom de la compétence
-        if "empoisonnée" in self.name.lower():
-            # Appliquer un poison
-            pass
-        elif "cri" in self.name.lower():
-            # Appliquer un buff
-            pass
-        
-        return actual_damage, False
+    def use(self, user, target, rng=random):
+        """Utilise la compétence pour user; retourne un TurnResult"""
+        # Une compétence absente de la liste du joueur donne un échec "unknown_skill"
+        index = next((i for i, skill in enumerate(user.skills) if skill.name == self.name), -1)
+        return user.use_skill(index, target, rng)
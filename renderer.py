@@ -0,0 +1,82 @@
+# renderer.py - Rendu par rectangles modifiés (dirty rects)
+import pygame
+
+
+class DirtyRectRenderer:
+    """Ne pousse à l'écran que les zones modifiées depuis la frame précédente"""
+
+    def __init__(self, screen, enabled=True, full_flip_ratio=0.4):
+        self.screen = screen
+        self.enabled = enabled
+        self.full_flip_ratio = full_flip_ratio  # Au-delà, un flip complet est moins cher
+        self.background = None
+        self.camera = None
+        self.dirty_rects = []
+        self.previous_rects = []  # Zones dessinées à la frame précédente, à effacer
+        self.current_rects = []
+        self.full_redraw = True
+
+    def set_screen(self, screen):
+        """Change la surface d'affichage (changement de résolution, plein écran)"""
+        self.screen = screen
+        self.invalidate()
+
+    def invalidate(self):
+        """Force un redessin complet à la prochaine frame"""
+        self.full_redraw = True
+
+    def begin_frame(self, background, camera=(0, 0)):
+        """Restaure le fond sous les zones dessinées à la frame précédente
+        
+        background doit fournir draw(screen, rect=None); un déplacement de la
+        caméra impose un redessin complet.
+        """
+        if (self.full_redraw or not self.enabled or background is not self.background
+                or camera != self.camera):
+            self.background = background
+            self.camera = camera
+            background.draw(self.screen)
+            self.full_redraw = True
+        else:
+            for rect in self.previous_rects:
+                background.draw(self.screen, rect)
+                self.dirty_rects.append(rect)
+        self.current_rects = []
+
+    def draw(self, surface, position):
+        """Dessine une surface et enregistre la zone modifiée"""
+        rect = self.screen.blit(surface, position)
+        self.track(rect)
+        return rect
+
+    def track(self, rects):
+        """Enregistre une ou plusieurs zones dessinées hors du renderer (UI, overlays)"""
+        if isinstance(rects, pygame.Rect):
+            rects = [rects]
+        for rect in rects:
+            if rect.width and rect.height:
+                self.current_rects.append(rect)
+                self.dirty_rects.append(rect)
+
+    def get_dirty_area(self):
+        """Surface totale (approchée) des zones modifiées"""
+        screen_rect = self.screen.get_rect()
+        area = 0
+        for rect in self.dirty_rects:
+            clipped = rect.clip(screen_rect)
+            area += clipped.width * clipped.height
+        return area
+
+    def present(self):
+        """Met à jour l'écran: zones modifiées seulement, ou flip complet si trop grand"""
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        if (self.full_redraw or not self.enabled
+                or self.get_dirty_area() > screen_area * self.full_flip_ratio):
+            pygame.display.flip()
+        elif self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
+
+        self.previous_rects = self.current_rects
+        self.current_rects = []
+        self.dirty_rects = []
+        self.full_redraw = False
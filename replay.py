@@ -0,0 +1,92 @@
+# replay.py - Enregistrement des entrées par tick et rejeu déterministe
+import json
+import pygame
+
+RECORDING_VERSION = 2  # 1: touches maintenues enregistrées à part
+HASH_INTERVAL = 60  # Un hash d'état toutes les 60 ticks (1 s de jeu)
+
+# Événements rejoués; les autres (fenêtre, audio...) n'influencent pas la simulation.
+# Les actions maintenues se déduisent des événements: ils suffisent au rejeu.
+RECORDED_EVENTS = {
+    pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL,
+    pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION,
+    pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYAXISMOTION, pygame.JOYHATMOTION,
+}
+
+
+def serialize_event(event):
+    attrs = {}
+    for name, value in event.dict.items():
+        if isinstance(value, (bool, int, float, str)):
+            attrs[name] = value
+        elif isinstance(value, (tuple, list)):
+            attrs[name] = list(value)
+    return [event.type, attrs]
+
+
+def deserialize_event(event_type, attrs):
+    attrs = {name: tuple(value) if isinstance(value, list) else value for name, value in attrs.items()}
+    return pygame.event.Event(event_type, attrs)
+
+
+class InputRecorder:
+    """Capture les événements de chaque tick d'une partie"""
+
+    def __init__(self, path, seed, tick_rate):
+        self.path = path
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.events = []  # [tick, type, attributs]
+        self.hashes = []  # [tick, hash de l'état]
+        self.ticks = 0
+
+    def record_events(self, tick, events):
+        for event in events:
+            if event.type in RECORDED_EVENTS:
+                self.events.append([tick] + serialize_event(event))
+
+    def record_hash(self, tick, state_hash):
+        self.hashes.append([tick, state_hash])
+
+    def save(self, ticks):
+        self.ticks = ticks
+        data = {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "tick_rate": self.tick_rate,
+            "ticks": ticks,
+            "events": self.events,
+            "hashes": self.hashes,
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(",", ":"))
+
+
+class InputPlayback:
+    """Source d'entrées lue depuis un enregistrement"""
+
+    def __init__(self, data):
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Version d'enregistrement non supportée: {data.get('version')}")
+        self.seed = data["seed"]
+        self.tick_rate = data["tick_rate"]
+        self.ticks = data["ticks"]
+        self.events = {}
+        for tick, event_type, attrs in data["events"]:
+            self.events.setdefault(tick, []).append(deserialize_event(event_type, attrs))
+        self.hashes = {tick: state_hash for tick, state_hash in data["hashes"]}
+        self.mismatches = []  # (tick, attendu, obtenu)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def events_for(self, tick):
+        return self.events.pop(tick, [])
+
+    def check_hash(self, tick, state_hash):
+        expected = self.hashes.get(tick)
+        if expected is not None and expected != state_hash:
+            self.mismatches.append((tick, expected, state_hash))
@@ -0,0 +1,23 @@
+# rng.py - Flux aléatoires reproductibles, un par sous-système
+import random
+import zlib
+
+
+class RandomStreams:
+    """Un random.Random par sous-système, tous dérivés d'une seule graine
+
+    Chaque flux a sa propre graine (graine de la partie + nom du flux): tirer
+    plus de butin ne décale pas la génération du monde, et inversement.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.streams = {}
+
+    def get(self, name):
+        stream = self.streams.get(name)
+        if stream is None:
+            # crc32 plutôt que hash(): stable d'un processus à l'autre
+            stream = random.Random(self.seed * 1000003 + zlib.crc32(name.encode("utf-8")))
+            self.streams[name] = stream
+        return stream
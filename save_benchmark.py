@@ -0,0 +1,93 @@
+# save_benchmark.py - Compare taille et temps de sauvegarde/chargement JSON vs binaire
+#
+# Exemple: python save_benchmark.py --monsters 2000 --repeat 5
+import argparse
+import os
+import random
+import tempfile
+import time
+from environment import Environment
+from inventory import ITEM_DEFINITIONS
+from player import Player
+from quests import QuestManager
+from save_format import COMPRESSION_NAMES
+from save_system import SaveSystem
+
+
+def build_state(monsters_per_zone, seed):
+    """Partie chargée: toutes les zones peuplées, inventaire plein, une quête en cours"""
+    rng = random.Random(seed)
+    player = Player("Ycrad", "mage")
+    while player.level < 10:
+        player.xp = player.xp_to_next_level
+        player.level_up()
+    item_ids = list(ITEM_DEFINITIONS)
+    while len(player.inventory) < player.inventory.max_size:
+        if not player.inventory.add_item(rng.choice(item_ids), rng.randint(1, 5)):
+            break
+
+    environment = Environment(rng)
+    for zone_name, bounds in environment.zone_boundaries.items():
+        environment.ensure_zone_loaded(zone_name)
+        monster_types = [monster_type for monster_type, _ in environment.zones[zone_name]["monsters"]] or ["slime"]
+        for _ in range(monsters_per_zone):
+            position = [rng.uniform(*bounds["x"]), rng.uniform(*bounds["y"])]
+            monster = environment.add_monster(zone_name, rng.choice(monster_types), rng.randint(1, 10), position)
+            monster.hp = rng.randint(1, monster.max_hp)
+
+    quest_manager = QuestManager()
+    quest_manager.accept_quest(0)
+    quest_manager.quests["active"][0].progress["slime"] = 3
+    return player, environment, quest_manager
+
+
+def measure(function, repeat, prepare=None):
+    """Meilleur temps (ms) sur repeat appels; prepare() fournit les arguments hors chrono"""
+    best = None
+    for _ in range(repeat):
+        args = prepare() if prepare else ()
+        start = time.perf_counter()
+        function(*args)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des formats de sauvegarde")
+    parser.add_argument("--monsters", type=int, default=1000, help="Monstres ajoutés par zone")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    player, environment, quest_manager = build_state(args.monsters, args.seed)
+    total_monsters = sum(len(zone.get("monster_instances", [])) for zone in environment.zones.values())
+
+    with tempfile.TemporaryDirectory() as save_dir:
+        save_system = SaveSystem(save_dir)
+        rows = []
+
+        save_ms = measure(lambda: save_system.save_game_json(player, environment, quest_manager, 0), args.repeat)
+        load_ms = measure(lambda: save_system.load_game_json(0), args.repeat)
+        rows.append(("json", os.path.getsize(save_system.get_save_path(0, "json")), save_ms, load_ms))
+
+        for slot, (name, compression) in enumerate(COMPRESSION_NAMES.items(), start=1):
+            save_ms = measure(
+                lambda: save_system.save_game(player, environment, quest_manager, slot, 0.0, compression),
+                args.repeat
+            )
+            load_ms = measure(
+                lambda target: save_system.load_game(slot, target), args.repeat,
+                prepare=lambda: (Environment(),)
+            )
+            rows.append((f"binaire/{name}", os.path.getsize(save_system.get_save_path(slot)), save_ms, load_ms))
+
+    print(f"{total_monsters} monstres, {len(player.inventory)} cases d'inventaire, meilleur de {args.repeat}")
+    print(f"{'format':<16}{'taille (o)':>12}{'sauvegarde (ms)':>18}{'chargement (ms)':>18}")
+    for name, size, save_ms, load_ms in rows:
+        print(f"{name:<16}{size:>12}{save_ms:>18.2f}{load_ms:>18.2f}")
+    print("Chargement JSON: lecture seule; binaire: joueur, quêtes et monstres reconstruits")
+
+
+if __name__ == "__main__":
+    main()
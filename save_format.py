@@ -0,0 +1,423 @@
+# save_format.py - Format de sauvegarde binaire versionné et compressé
+#
+# Fichier: en-tête fixe (magic, version, compression, taille), métadonnées de
+# taille fixe (lisibles sans décompresser), puis une charge utile compressée
+# faite de sections écrites par des sérialiseurs explicites.
+import json
+import lzma
+import struct
+import sys
+import time
+import zlib
+from array import array
+import numpy as np
+from inventory import EQUIP_SLOTS
+from player import Player
+from quests import QuestManager
+
+MAGIC = b"YCRD"
+FORMAT_VERSION = 2  # 1: sans bloc de métadonnées
+
+HEADER = struct.Struct("<4sHBxI")  # magic, version, compression, taille décompressée
+METADATA = struct.Struct("<32s12s16sHdd")  # nom, classe, zone, niveau, temps de jeu, date
+THUMBNAIL_SIZE = (48, 36)
+THUMBNAIL_BYTES = THUMBNAIL_SIZE[0] * THUMBNAIL_SIZE[1] * 3  # RGB
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZMA = 2
+COMPRESSORS = {
+    COMPRESSION_NONE: (lambda data: data, lambda data: data),
+    COMPRESSION_ZLIB: (lambda data: zlib.compress(data, 6), zlib.decompress),
+    COMPRESSION_LZMA: (lzma.compress, lzma.decompress),
+}
+COMPRESSION_NAMES = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "lzma": COMPRESSION_LZMA}
+
+INT_STATS = ("strength", "dexterity", "intelligence", "defense")
+FLOAT_STATS = ("critical_chance", "critical_multiplier")
+
+
+class SaveFormatError(Exception):
+    pass
+
+
+def fixed_bytes(text, size):
+    """Chaîne UTF-8 tronquée à size octets, sans couper de caractère"""
+    return text.encode("utf-8")[:size].decode("utf-8", "ignore").encode("utf-8")
+
+
+def fixed_text(data):
+    return data.rstrip(b"\0").decode("utf-8", "ignore")
+
+
+class SaveMetadata:
+    """Ce que le menu de chargement affiche d'une sauvegarde"""
+    __slots__ = ("name", "class_key", "zone", "level", "play_time", "timestamp")
+
+    def __init__(self, name, class_key, zone, level, play_time, timestamp):
+        self.name = name
+        self.class_key = class_key
+        self.zone = zone
+        self.level = level
+        self.play_time = play_time  # En secondes
+        self.timestamp = timestamp
+
+    def pack(self):
+        return METADATA.pack(
+            fixed_bytes(self.name, 32), fixed_bytes(self.class_key or "", 12),
+            fixed_bytes(self.zone, 16), self.level, self.play_time, self.timestamp
+        )
+
+    @classmethod
+    def unpack_from(cls, data, offset=0):
+        name, class_key, zone, level, play_time, timestamp = METADATA.unpack_from(data, offset)
+        return cls(fixed_text(name), fixed_text(class_key), fixed_text(zone), level, play_time, timestamp)
+
+
+class BinaryWriter:
+    """Accumule des valeurs packées en little-endian"""
+
+    def __init__(self):
+        self.parts = []
+
+    def pack(self, fmt, *values):
+        self.parts.append(struct.pack("<" + fmt, *values))
+
+    def string(self, text):
+        data = (text or "").encode("utf-8")
+        self.pack("H", len(data))
+        self.parts.append(data)
+
+    def array(self, typecode, values):
+        """Tableau contigu (codes de type du module array, lus par BinaryReader.array)"""
+        values = np.ascontiguousarray(values, dtype=np.dtype(typecode).newbyteorder("<"))
+        self.pack("I", values.size)
+        self.parts.append(values.tobytes())
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+
+class BinaryReader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt):
+        layout = struct.Struct("<" + fmt)
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values if len(values) > 1 else values[0]
+
+    def string(self):
+        length = self.unpack("H")
+        text = bytes(self.take(length)).decode("utf-8")
+        return text
+
+    def array(self, typecode):
+        count = self.unpack("I")
+        values = array(typecode)
+        values.frombytes(self.take(count * values.itemsize))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def take(self, size):
+        """size octets suivants; SaveFormatError si la charge utile est trop courte"""
+        if self.offset + size > len(self.data):
+            raise SaveFormatError("Sauvegarde tronquée")
+        data = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return data
+
+
+# --- Joueur -----------------------------------------------------------------
+
+def snapshot_player(player):
+    """Copie des champs sauvegardés: le joueur peut changer pendant l'écriture"""
+    return {
+        "name": player.name,
+        "class_key": player.get_class_key(),
+        "progress": (player.level, player.xp, player.xp_to_next_level),
+        "resources": (player.hp, player.max_hp, player.mp, player.max_mp, player.gold),
+        "position": (float(player.position[0]), float(player.position[1])),
+        "int_stats": tuple(int(player.stats[stat]) for stat in INT_STATS),
+        "float_stats": tuple(float(player.stats[stat]) for stat in FLOAT_STATS),
+        "cooldowns": tuple(player.skill_cooldowns.items()),
+        "inventory": snapshot_inventory(player.inventory),
+    }
+
+
+def write_player(writer, snapshot):
+    writer.string(snapshot["name"])
+    writer.string(snapshot["class_key"])
+    writer.pack("HII", *snapshot["progress"])
+    writer.pack("iiiiI", *snapshot["resources"])
+    writer.pack("dd", *snapshot["position"])
+    writer.pack("iiii", *snapshot["int_stats"])
+    writer.pack("dd", *snapshot["float_stats"])
+    writer.pack("B", len(snapshot["cooldowns"]))
+    for name, remaining in snapshot["cooldowns"]:
+        writer.string(name)
+        writer.pack("d", remaining)
+    write_inventory(writer, snapshot["inventory"])
+
+
+def read_player(reader):
+    name = reader.string()
+    player = Player(name, reader.string())
+    player.level, player.xp, player.xp_to_next_level = reader.unpack("HII")
+    player.hp, player.max_hp, player.mp, player.max_mp, player.gold = reader.unpack("iiiiI")
+    player.position = list(reader.unpack("dd"))
+    player.stats.update(zip(INT_STATS, reader.unpack("iiii")))
+    player.stats.update(zip(FLOAT_STATS, reader.unpack("dd")))
+    player.skill_cooldowns = {reader.string(): reader.unpack("d") for _ in range(reader.unpack("B"))}
+    player.skills = player.current_class.get_skills_for_level(player.level)
+    read_inventory(reader, player.inventory)
+    return player
+
+
+# --- Inventaire -------------------------------------------------------------
+
+def read_entry_data(reader):
+    text = reader.string()
+    return json.loads(text) if text else None
+
+
+def snapshot_inventory(inventory):
+    # Données d'occurrence figées en JSON dès la capture
+    def frozen(data):
+        return json.dumps(data) if data is not None else ""
+    entries = tuple(
+        (index, entry.count, entry.item_id, frozen(entry.data))
+        for index, entry in enumerate(inventory.slots) if entry is not None
+    )
+    equipped = tuple(
+        (entry.item_id, frozen(entry.data)) if entry else ("", "")
+        for entry in (inventory.equipped[slot] for slot in EQUIP_SLOTS)
+    )
+    return inventory.max_size, entries, equipped
+
+
+def write_inventory(writer, snapshot):
+    max_size, entries, equipped = snapshot
+    writer.pack("HH", max_size, len(entries))
+    for index, count, item_id, data in entries:
+        writer.pack("HI", index, count)
+        writer.string(item_id)
+        writer.string(data)
+    for item_id, data in equipped:
+        writer.string(item_id)
+        writer.string(data)
+
+
+def read_inventory(reader, inventory):
+    max_size, count = reader.unpack("HH")
+    slots = []
+    for _ in range(count):
+        index, amount = reader.unpack("HI")
+        slots.append([index, reader.string(), amount, read_entry_data(reader)])
+    equipped = {}
+    for slot in EQUIP_SLOTS:
+        item_id = reader.string()
+        data = read_entry_data(reader)
+        equipped[slot] = [item_id, data] if item_id else None
+    inventory.max_size = max_size
+    inventory.load({"slots": slots, "equipped": equipped})
+    return inventory
+
+
+# --- Quêtes -----------------------------------------------------------------
+
+def snapshot_quests(quest_manager):
+    return tuple(
+        tuple((quest.title, quest.completed, tuple(quest.progress.items())) for quest in quests)
+        for quests in (quest_manager.available_quests, quest_manager.quests["active"],
+                       quest_manager.quests["completed"])
+    )
+
+
+def write_quests(writer, snapshot):
+    for quests in snapshot:
+        writer.pack("H", len(quests))
+        for title, completed, progress in quests:
+            writer.string(title)
+            writer.pack("?B", completed, len(progress))
+            for target, amount in progress:
+                writer.string(target)
+                writer.pack("I", amount)
+
+
+def read_quests(reader):
+    """Les quêtes sont retrouvées par titre parmi les définitions du QuestManager"""
+    quest_manager = QuestManager()
+    definitions = {quest.title: quest for quest in quest_manager.available_quests}
+    lists = []
+    for _ in range(3):
+        quests = []
+        for _ in range(reader.unpack("H")):
+            title = reader.string()
+            completed, progress_count = reader.unpack("?B")
+            progress = {reader.string(): reader.unpack("I") for _ in range(progress_count)}
+            quest = definitions.get(title)
+            if quest is not None:
+                quest.completed = completed
+                quest.progress.update(progress)
+                quests.append(quest)
+        lists.append(quests)
+    quest_manager.available_quests, quest_manager.quests["active"], quest_manager.quests["completed"] = lists
+    return quest_manager
+
+
+# --- Environnement ----------------------------------------------------------
+
+def snapshot_environment(environment):
+    """Colonnes des monstres copiées depuis l'EntityStore (indexation numpy = copie)"""
+    store = environment.entity_store
+    zones = []
+    for zone_name, zone_data in environment.zones.items():
+        monsters = zone_data.get("monster_instances")
+        if monsters is None:
+            zones.append((zone_name, None))  # Zone jamais chargée: générée à la demande au chargement
+            continue
+        indices = np.fromiter((monster.index for monster in monsters), dtype=np.intp, count=len(monsters))
+        type_ids, type_indices = np.unique(store.type_ids[indices], return_inverse=True)
+        types = [store.type_names[type_id] for type_id in type_ids]
+        zones.append((zone_name, (
+            types, type_indices, store.levels[indices], store.hp[indices], store.positions[indices]
+        )))
+    return environment.current_zone, zones
+
+
+def write_environment(writer, snapshot):
+    current_zone, zones = snapshot
+    writer.string(current_zone)
+    writer.pack("B", len(zones))
+    for zone_name, columns in zones:
+        writer.string(zone_name)
+        writer.pack("?", columns is not None)
+        if columns is None:
+            continue
+        # Colonnes: table des types, puis tableaux contigus
+        types, type_indices, levels, hps, positions = columns
+        writer.pack("B", len(types))
+        for monster_type in types:
+            writer.string(monster_type)
+        writer.array("B", type_indices)
+        writer.array("H", levels)
+        writer.array("i", hps)
+        writer.array("d", positions)
+
+
+def read_environment(reader, environment):
+    """Restaure zone courante et monstres dans un Environment neuf"""
+    environment.current_zone = reader.string()
+    for _ in range(reader.unpack("B")):
+        zone_name = reader.string()
+        if not reader.unpack("?"):
+            continue
+        types = [reader.string() for _ in range(reader.unpack("B"))]
+        type_indices = reader.array("B")
+        levels = reader.array("H")
+        hps = reader.array("i")
+        positions = reader.array("d")
+        if zone_name not in environment.zones:
+            continue
+        environment.restore_zone_monsters(zone_name, [
+            (types[type_indices[i]], levels[i], [positions[2 * i], positions[2 * i + 1]], hps[i])
+            for i in range(len(type_indices))
+        ])
+    return environment
+
+
+# --- Fichier complet --------------------------------------------------------
+
+class SaveSnapshot:
+    """État de la partie figé sur le thread principal, encodable depuis un autre thread"""
+    __slots__ = ("player", "quests", "environment", "play_time", "metadata", "thumbnail")
+
+    def __init__(self, player, environment, quest_manager, play_time=0.0, thumbnail=None):
+        self.player = snapshot_player(player)
+        self.quests = snapshot_quests(quest_manager)
+        self.environment = snapshot_environment(environment)
+        self.play_time = play_time
+        self.metadata = SaveMetadata(
+            player.name, self.player["class_key"], environment.current_zone,
+            player.level, play_time, time.time()
+        )
+        self.thumbnail = thumbnail  # THUMBNAIL_BYTES octets RGB ou None
+
+
+def encode_snapshot(snapshot, compression=COMPRESSION_ZLIB):
+    writer = BinaryWriter()
+    writer.pack("d", snapshot.play_time)
+    write_player(writer, snapshot.player)
+    write_quests(writer, snapshot.quests)
+    write_environment(writer, snapshot.environment)
+    payload = writer.getvalue()
+    compress = COMPRESSORS[compression][0]
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, compression, len(payload))
+    return header + snapshot.metadata.pack() + compress(payload)
+
+
+def encode_save(player, environment, quest_manager, play_time=0.0, compression=COMPRESSION_ZLIB):
+    return encode_snapshot(SaveSnapshot(player, environment, quest_manager, play_time), compression)
+
+
+def read_header(data):
+    """(version, compression, taille, métadonnées ou None, début de la charge utile)"""
+    if len(data) < HEADER.size:
+        raise SaveFormatError("Sauvegarde tronquée")
+    magic, version, compression, size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveFormatError("Ce fichier n'est pas une sauvegarde")
+    if version == 1:
+        return version, compression, size, None, HEADER.size
+    if version != FORMAT_VERSION:
+        raise SaveFormatError(f"Version de sauvegarde non supportée: {version}")
+    if len(data) < HEADER.size + METADATA.size:
+        raise SaveFormatError("Sauvegarde tronquée")
+    return version, compression, size, SaveMetadata.unpack_from(data, HEADER.size), HEADER.size + METADATA.size
+
+
+def read_metadata(path):
+    """Métadonnées d'un fichier de sauvegarde: seuls les premiers octets sont lus"""
+    with open(path, 'rb') as f:
+        return read_header(f.read(HEADER.size + METADATA.size))[3]
+
+
+def read_payload(data):
+    """Vérifie l'en-tête et retourne la charge utile décompressée"""
+    _, compression, size, _, offset = read_header(data)
+    if compression not in COMPRESSORS:
+        raise SaveFormatError(f"Compression inconnue: {compression}")
+
+    try:
+        payload = COMPRESSORS[compression][1](data[offset:])
+    except (zlib.error, lzma.LZMAError) as e:
+        raise SaveFormatError(f"Sauvegarde corrompue: {e}") from e
+    if len(payload) != size:
+        raise SaveFormatError("Sauvegarde corrompue")
+    return payload
+
+
+def decode_save(data, environment):
+    """Reconstruit joueur, quêtes et monstres; retourne un dict de la partie chargée"""
+    payload = read_payload(data)
+    reader = BinaryReader(payload)
+    try:
+        play_time = reader.unpack("d")
+        player = read_player(reader)
+        quest_manager = read_quests(reader)
+        read_environment(reader, environment)
+    except (struct.error, KeyError, IndexError, ValueError, UnicodeDecodeError) as e:
+        # Enregistrement mal formé: longueur, clé de classe ou type de monstre inconnus
+        raise SaveFormatError(f"Sauvegarde corrompue: {e}") from e
+    if reader.offset != len(payload):
+        raise SaveFormatError("Sauvegarde corrompue: données en trop")
+    return {
+        "player": player,
+        "quest_manager": quest_manager,
+        "environment": environment,
+        "play_time": play_time,
+    }
@@ -1,14 +1,144 @@
 # save_system.py - Système de sauvegarde et chargement
 import json
 import os
+import struct
+import threading
+import time
+from save_format import (
+    COMPRESSION_ZLIB, METADATA, THUMBNAIL_BYTES, SaveFormatError, SaveMetadata, SaveSnapshot,
+    decode_save, encode_snapshot, fixed_bytes, fixed_text, read_metadata
+)
+
+AUTOSAVE_SLOT = "auto"
+
+INDEX_MAGIC = b"YCRI"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sHH")  # magic, version, nombre d'entrées
+INDEX_SLOT = struct.Struct("<8s?")  # slot, miniature présente
+INDEX_ENTRY_SIZE = INDEX_SLOT.size + METADATA.size + THUMBNAIL_BYTES
+
+
+class SaveIndex:
+    """Fichier d'index des slots: métadonnées et miniature de chaque sauvegarde
+
+    Entrées de taille fixe, réécrites à chaque sauvegarde: le menu de
+    chargement ne lit que ce fichier, quels que soient le nombre et la
+    taille des sauvegardes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}  # Slot (str) -> (SaveMetadata, miniature RGB ou None)
+        self.lock = threading.Lock()  # Mis à jour depuis le thread de sauvegarde
+
+    def load(self):
+        """Faux si l'index est absent ou illisible"""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            magic, version, count = INDEX_HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return False
+        if magic != INDEX_MAGIC or version != INDEX_VERSION \
+                or len(data) != INDEX_HEADER.size + count * INDEX_ENTRY_SIZE:
+            return False
+
+        entries = {}
+        offset = INDEX_HEADER.size
+        for _ in range(count):
+            slot, has_thumbnail = INDEX_SLOT.unpack_from(data, offset)
+            metadata = SaveMetadata.unpack_from(data, offset + INDEX_SLOT.size)
+            start = offset + INDEX_SLOT.size + METADATA.size
+            thumbnail = data[start:start + THUMBNAIL_BYTES] if has_thumbnail else None
+            entries[fixed_text(slot)] = (metadata, thumbnail)
+            offset += INDEX_ENTRY_SIZE
+        with self.lock:
+            self.entries = entries
+        return True
+
+    def get(self, slot):
+        with self.lock:
+            return self.entries.get(str(slot))
+
+    def update(self, slot, metadata, thumbnail=None, write=True):
+        with self.lock:
+            self.entries[str(slot)] = (metadata, thumbnail)
+            if write:
+                self.write()
+
+    def write(self):
+        parts = [INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(self.entries))]
+        for slot, (metadata, thumbnail) in self.entries.items():
+            parts.append(INDEX_SLOT.pack(fixed_bytes(slot, 8), thumbnail is not None))
+            parts.append(metadata.pack())
+            parts.append(thumbnail if thumbnail is not None else bytes(THUMBNAIL_BYTES))
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(b"".join(parts))
+        os.replace(temp_path, self.path)
+
 
 class SaveSystem:
-    def __init__(self, save_dir="saves"):
+    def __init__(self, save_dir="saves", slot_count=3):
         self.save_dir = save_dir
+        self.slot_count = slot_count
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
+        self.index = SaveIndex(os.path.join(save_dir, "index.bin"))
+        if not self.index.load():
+            self.rebuild_index()
+    
+    def rebuild_index(self):
+        """Reconstruit l'index depuis les en-têtes des sauvegardes (sans miniatures)"""
+        for filename in os.listdir(self.save_dir):
+            if not (filename.startswith("save_") and filename.endswith(".sav")):
+                continue
+            try:
+                metadata = read_metadata(os.path.join(self.save_dir, filename))
+            except (OSError, SaveFormatError):
+                continue
+            if metadata is not None:
+                self.index.update(filename[len("save_"):-len(".sav")], metadata, write=False)
+        with self.index.lock:
+            self.index.write()
+    
+    def get_save_path(self, slot, extension="sav"):
+        return os.path.join(self.save_dir, f"save_{slot}.{extension}")
+    
+    def save_game(self, player, environment, quest_manager, slot=0, play_time=0.0,
+                  compression=COMPRESSION_ZLIB, thumbnail=None):
+        """Sauvegarde binaire (voir save_format.py)"""
+        snapshot = SaveSnapshot(player, environment, quest_manager, play_time, thumbnail)
+        self.write_snapshot(slot, snapshot, compression)
+        return True
+    
+    def write_snapshot(self, slot, snapshot, compression=COMPRESSION_ZLIB):
+        """Encode et écrit un instantané puis met l'index à jour; retourne la taille écrite"""
+        data = encode_snapshot(snapshot, compression)
+        self.write_save(slot, data)
+        self.index.update(slot, snapshot.metadata, snapshot.thumbnail)
+        return len(data)
+    
+    def write_save(self, slot, data):
+        """Écriture atomique: fichier temporaire puis renommage (jamais de slot à moitié écrit)"""
+        save_path = self.get_save_path(slot)
+        temp_path = save_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, save_path)
+    
+    def load_game(self, slot, environment):
+        """Recharge joueur, quêtes et monstres dans environment; None si le slot est vide"""
+        save_path = self.get_save_path(slot)
+        if not os.path.exists(save_path):
+            return None
+        with open(save_path, 'rb') as f:
+            return decode_save(f.read(), environment)
     
-    def save_game(self, player, environment, quest_manager, slot=0):
+    def save_game_json(self, player, environment, quest_manager, slot=0):
+        """Ancien format JSON (gardé pour comparaison, voir save_benchmark.py)"""
         save_data = {
             "player": {
                 "name": player.name,
@@ -22,11 +152,7 @@ class SaveSystem:
                 "current_class": player.current_class.name,
                 "position": player.position,
                 "gold": player.gold,
-                "inventory": [item.__dict__ for item in player.inventory],
-                "equipment": {
-                    slot: item.__dict__ if item else None 
-                    for slot, item in player.equipment.items()
-                }
+                "inventory": player.inventory.serialize()  # Cases et équipement
             },
             "quests": {
                 "active": [quest.__dict__ for quest in quest_manager.quests["active"]],
@@ -37,17 +163,17 @@ class SaveSystem:
                 "current_zone": environment.current_zone,
                 "monsters": self.serialize_monsters(environment)
             },
-            "timestamp": pygame.time.get_ticks()
+            "timestamp": time.time()
         }
         
-        save_path = os.path.join(self.save_dir, f"save_{slot}.json")
+        save_path = self.get_save_path(slot, "json")
         with open(save_path, 'w') as f:
             json.dump(save_data, f, indent=2)
         
         return True
     
-    def load_game(self, slot=0):
-        save_path = os.path.join(self.save_dir, f"save_{slot}.json")
+    def load_game_json(self, slot=0):
+        save_path = self.get_save_path(slot, "json")
         if not os.path.exists(save_path):
             return None
         
@@ -64,24 +190,30 @@ class SaveSystem:
                 serialized[zone_name].append({
                     "type": monster.type,
                     "level": monster.level,
-                    "position": monster.position,
+                    "position": [float(v) for v in monster.position],
                     "hp": monster.hp
                 })
         return serialized
     
     def get_save_slots(self):
+        """Slots du menu de chargement, lus depuis l'index (aucun fichier de sauvegarde ouvert)"""
         slots = []
-        for i in range(3):  # 3 slots de sauvegarde
-            if os.path.exists(os.path.join(self.save_dir, f"save_{i}.json")):
-                with open(os.path.join(self.save_dir, f"save_{i}.json"), 'r') as f:
-                    data = json.load(f)
-                    slots.append({
-                        "slot": i,
-                        "exists": True,
-                        "player_name": data["player"]["name"],
-                        "player_level": data["player"]["level"],
-                        "timestamp": data["timestamp"]
-                    })
-            else:
-                slots.append({"slot": i, "exists": False})
+        for slot in [AUTOSAVE_SLOT] + list(range(self.slot_count)):
+            entry = self.index.get(slot)
+            if entry is None:
+                if slot != AUTOSAVE_SLOT:
+                    slots.append({"slot": slot, "exists": False})
+                continue
+            metadata, thumbnail = entry
+            slots.append({
+                "slot": slot,
+                "exists": True,
+                "player_name": metadata.name,
+                "player_class": metadata.class_key,
+                "player_level": metadata.level,
+                "zone": metadata.zone,
+                "play_time": metadata.play_time,
+                "timestamp": metadata.timestamp,
+                "thumbnail": thumbnail
+            })
         return slots
@@ -0,0 +1,99 @@
+# spatial.py - Index spatial en grille uniforme pour les requêtes de proximité
+
+
+class SpatialHash:
+    """Grille uniforme: chaque entité est rangée dans la cellule de sa position"""
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {entité: tag}
+        self.entity_cells = {}  # entité -> (cx, cy)
+
+    def get_cell(self, position):
+        return (int(position[0] // self.cell_size), int(position[1] // self.cell_size))
+
+    def insert(self, entity, tag=None):
+        """Enregistre une entité (tag optionnel: "monster", "npc"...)"""
+        cell = self.get_cell(entity.position)
+        self.cells.setdefault(cell, {})[entity] = tag
+        self.entity_cells[entity] = cell
+
+    def remove(self, entity):
+        cell = self.entity_cells.pop(entity, None)
+        if cell is None:
+            return False
+        bucket = self.cells[cell]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[cell]
+        return True
+
+    def update(self, entity):
+        """À appeler après un déplacement; ne fait rien si la cellule n'a pas changé"""
+        old_cell = self.entity_cells.get(entity)
+        if old_cell is None:
+            return
+        new_cell = self.get_cell(entity.position)
+        if new_cell != old_cell:
+            tag = self.cells[old_cell][entity]
+            self.remove(entity)
+            self.cells.setdefault(new_cell, {})[entity] = tag
+            self.entity_cells[entity] = new_cell
+
+    def clear(self):
+        self.cells.clear()
+        self.entity_cells.clear()
+
+    def iter_cells(self, min_x, min_y, max_x, max_y):
+        """Parcourt les cellules occupées qui recouvrent un rectangle"""
+        cx_min, cy_min = self.get_cell((min_x, min_y))
+        cx_max, cy_max = self.get_cell((max_x, max_y))
+        for cx in range(cx_min, cx_max + 1):
+            for cy in range(cy_min, cy_max + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    yield bucket
+
+    def query_rect(self, x, y, width, height, tag=None):
+        """Entités dont la position est dans le rectangle"""
+        results = []
+        for bucket in self.iter_cells(x, y, x + width, y + height):
+            for entity, entity_tag in bucket.items():
+                if tag is not None and entity_tag != tag:
+                    continue
+                px, py = entity.position[0], entity.position[1]
+                if x <= px <= x + width and y <= py <= y + height:
+                    results.append(entity)
+        return results
+
+    def query_radius(self, position, radius, tag=None):
+        """Entités à moins de radius de position (distances au carré)"""
+        x, y = position[0], position[1]
+        radius_sq = radius * radius
+        results = []
+        for bucket in self.iter_cells(x - radius, y - radius, x + radius, y + radius):
+            for entity, entity_tag in bucket.items():
+                if tag is not None and entity_tag != tag:
+                    continue
+                dx = entity.position[0] - x
+                dy = entity.position[1] - y
+                if dx * dx + dy * dy <= radius_sq:
+                    results.append(entity)
+        return results
+
+    def nearest(self, position, max_radius, tag=None, predicate=None):
+        """Entité la plus proche dans max_radius, ou None"""
+        x, y = position[0], position[1]
+        best = None
+        best_dist_sq = max_radius * max_radius
+        for bucket in self.iter_cells(x - max_radius, y - max_radius, x + max_radius, y + max_radius):
+            for entity, entity_tag in bucket.items():
+                if tag is not None and entity_tag != tag:
+                    continue
+                dx = entity.position[0] - x
+                dy = entity.position[1] - y
+                dist_sq = dx * dx + dy * dy
+                if dist_sq <= best_dist_sq and (predicate is None or predicate(entity)):
+                    best = entity
+                    best_dist_sq = dist_sq
+        return best
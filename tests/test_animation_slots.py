@@ -0,0 +1,36 @@
+# test_animation_slots.py - Les monstres chargés avec le monde ont leur état d'animation
+import pytest
+from main import Game
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # config.json et sauvegardes hors du dépôt
+    game = Game(headless=True, seed=1)
+    yield game
+    game.flow_field.shutdown()
+
+
+def animated_monsters(game):
+    animations = game.animation_manager
+    monsters = [
+        monster for zone in game.environment.zones.values() for monster in zone.get("monster_instances", [])
+        if monster.hp > 0 and (monster.type, "idle") in animations.clip_ids
+    ]
+    assert monsters, "aucun monstre animé chargé"
+    return monsters
+
+
+def test_monsters_have_slots_after_new_game(game):
+    game.initialize_game()
+    slots = game.animation_manager.entity_slots
+    assert all(monster in slots for monster in animated_monsters(game))
+
+
+def test_slots_follow_a_second_new_game(game):
+    game.initialize_game()
+    game.initialize_game()
+    slots = game.animation_manager.entity_slots
+    monsters = animated_monsters(game)
+    assert all(monster in slots for monster in monsters)
+    assert len(slots) == len(monsters)
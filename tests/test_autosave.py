@@ -0,0 +1,31 @@
+# test_autosave.py - Les demandes en attente sont regroupées par slot
+import threading
+from autosave import AutosaveService
+
+
+class BlockingSaveSystem:
+    """Enregistre l'ordre des écritures; la première attend le feu vert"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.written = []
+
+    def write_snapshot(self, slot, snapshot, compression):
+        self.release.wait(5)
+        self.written.append((slot, snapshot))
+        return 0
+
+
+def test_queued_saves_coalesce_per_slot(monkeypatch):
+    monkeypatch.setattr("autosave.SaveSnapshot", lambda player, *args: player)
+    save_system = BlockingSaveSystem()
+    service = AutosaveService(save_system)
+
+    service.save("first", None, None, 1.0, slot=0)
+    service.save("manual", None, None, 2.0, slot=0)  # En attente pendant la première écriture
+    service.save("auto-old", None, None, 3.0, slot="auto", automatic=True)
+    service.save("auto-new", None, None, 4.0, slot="auto", automatic=True)
+    save_system.release.set()
+    service.shutdown()
+
+    assert save_system.written == [(0, "first"), (0, "manual"), ("auto", "auto-new")]
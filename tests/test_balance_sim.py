@@ -0,0 +1,23 @@
+# test_balance_sim.py - La sortie par défaut (stdout) est un CSV valide
+import csv
+import io
+import os
+import subprocess
+import sys
+from balance_sim import COLUMNS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_default_output_is_csv():
+    env = dict(os.environ)
+    env.pop("PYGAME_HIDE_SUPPORT_PROMPT", None)  # Comme depuis un terminal
+    result = subprocess.run(
+        [sys.executable, "balance_sim.py", "--classes", "warrior", "--levels", "1-2",
+         "--monsters", "slime", "--difficulties", "normal", "--fights", "5", "--workers", "1"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    rows = list(csv.reader(io.StringIO(result.stdout)))
+    assert rows[0] == list(COLUMNS)
+    assert len(rows) == 3
+    assert all(len(row) == len(COLUMNS) for row in rows)
@@ -0,0 +1,42 @@
+# test_inventory.py - Équipement avec un inventaire plein
+import copy
+import pickle
+from inventory import Inventory, InventoryEntry
+
+
+def full_inventory_with_equipped_sword():
+    inventory = Inventory(max_size=2)
+    inventory.add_item("epee_maudite")
+    inventory.equip(0)
+    # Pile de deux épées (données d'occurrence distinctes de l'épée équipée) et une case pleine
+    inventory.put(inventory.free_slots.pop(), InventoryEntry("epee_maudite", 2, {"durability": 5}))
+    inventory.add_item("gelee_visqueuse")
+    assert not inventory.free_slots
+    return inventory
+
+
+def test_equip_from_stack_without_room_keeps_equipped_item():
+    inventory = full_inventory_with_equipped_sword()
+    equipped = inventory.equipped["weapon"]
+    stack_index = next(iter(inventory.slots_by_item["epee_maudite"]))
+
+    assert not inventory.equip(stack_index)
+    assert inventory.equipped["weapon"] is equipped
+    assert inventory.get_slot(stack_index).count == 2
+    assert inventory.count("epee_maudite") == 2
+
+
+def test_equip_single_item_swaps_into_freed_slot():
+    inventory = Inventory(max_size=1)
+    inventory.add_item("epee_maudite")
+    assert inventory.equip(0)
+    inventory.add_item("epee_maudite", data={"durability": 5})
+    assert inventory.equip(0)
+    assert inventory.equipped["weapon"].data == {"durability": 5}
+    assert inventory.get_slot(0).data is None
+
+
+def test_entry_copy_and_pickle():
+    entry = InventoryEntry("petite_potion", 3)
+    for clone in (copy.copy(entry), pickle.loads(pickle.dumps(entry))):
+        assert (clone.item_id, clone.count, clone.name) == ("petite_potion", 3, entry.name)
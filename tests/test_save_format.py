@@ -0,0 +1,39 @@
+# test_save_format.py - Sauvegardes tronquées ou corrompues
+import random
+import pytest
+from environment import Environment
+from player import Player
+from quests import QuestManager
+from save_format import (
+    COMPRESSION_ZLIB, FORMAT_VERSION, HEADER, METADATA, SaveFormatError, decode_save, encode_save, read_header
+)
+
+
+def make_save():
+    environment = Environment(random.Random(1))
+    environment.ensure_zone_loaded("foret")
+    data = encode_save(Player("Ycrad", "mage"), environment, QuestManager(), 12.5, COMPRESSION_ZLIB)
+    assert read_header(data)[0] == FORMAT_VERSION
+    return data
+
+
+def test_round_trip():
+    loaded = decode_save(make_save(), Environment())
+    assert loaded["player"].name == "Ycrad"
+    assert loaded["play_time"] == 12.5
+
+
+def test_truncated_save():
+    data = make_save()
+    for length in (HEADER.size + METADATA.size + 1, len(data) // 2, len(data) - 1):
+        with pytest.raises(SaveFormatError):
+            decode_save(data[:length], Environment())
+
+
+def test_bit_flipped_save():
+    data = make_save()
+    for offset in range(HEADER.size + METADATA.size, len(data)):
+        corrupted = bytearray(data)
+        corrupted[offset] ^= 0x10
+        with pytest.raises(SaveFormatError):
+            decode_save(bytes(corrupted), Environment())
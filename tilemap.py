@@ -0,0 +1,190 @@
+# tilemap.py - Carte en tuiles 16x16 avec grille de collision précalculée
+import os
+import pygame
+
+TILE_SIZE = 16
+
+# Drapeaux de collision (un octet par tuile)
+SOLID = 1  # Murs, arbres: bloquent tout
+WATER = 2  # Eau: bloque la marche
+
+# Couches statiques de la carte, dessinées dans cet ordre
+LAYERS = ("ground", "walls", "decorations")
+
+# Sols: id -> (drapeaux, couleur)
+GROUND_TYPES = {
+    0: (0, (90, 160, 70)),      # Herbe
+    1: (0, (200, 200, 100)),    # Sable du village
+    2: (0, (0, 100, 0)),        # Sol de forêt
+    3: (0, (70, 50, 30)),       # Boue du marais
+    4: (WATER, (40, 70, 160)),  # Eau
+    5: (0, (120, 120, 110)),    # Pavés
+}
+
+# Murs et obstacles: id -> drapeaux (0 = aucun)
+WALL_TYPES = {
+    0: 0,
+    1: SOLID,  # Mur
+    2: SOLID,  # Arbre
+}
+
+# Décorations sans collision: 0 = aucune, 1 = fleur, 2 = caillou, 3 = roseau
+DECORATION_CHANCE = 6  # Pourcentage de tuiles libres décorées
+
+# Caractère du fichier de carte -> (sol, mur)
+TILE_CHARS = {
+    ".": (0, 0),
+    ",": (1, 0),
+    "f": (2, 0),
+    "m": (3, 0),
+    "~": (4, 0),
+    "#": (5, 1),
+    "T": (2, 2),
+}
+BLOCKING = SOLID | WATER
+
+DEFAULT_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps", "monde.map")
+
+
+class TileMap:
+    def __init__(self, width, height, tile_size=TILE_SIZE):
+        self.width = width  # En tuiles
+        self.height = height
+        self.tile_size = tile_size
+        self.layers = {layer: bytearray(width * height) for layer in LAYERS}  # Id de tuile par couche
+        self.collision = bytearray(width * height)  # Drapeaux de collision
+        self.listeners = []  # Callbacks(tx, ty) appelés quand une tuile change
+
+    @classmethod
+    def load(cls, path=DEFAULT_MAP):
+        """Charge une carte texte (un caractère par tuile)"""
+        if not os.path.exists(path):
+            # Carte ouverte par défaut, à la taille de l'écran
+            return cls(800 // TILE_SIZE, 600 // TILE_SIZE)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = [line.rstrip("\n") for line in f if line.strip()]
+
+        tilemap = cls(max(len(row) for row in rows), len(rows))
+        for ty, row in enumerate(rows):
+            for tx, char in enumerate(row):
+                ground, wall = TILE_CHARS.get(char, TILE_CHARS["."])
+                tilemap.set_tile(tx, ty, ground, "ground")
+                tilemap.set_tile(tx, ty, wall, "walls")
+        tilemap.place_decorations()
+        return tilemap
+
+    def place_decorations(self):
+        """Décore quelques tuiles libres, toujours les mêmes pour une carte donnée"""
+        decorations = self.layers["decorations"]
+        ground_layer = self.layers["ground"]
+        for index in range(self.width * self.height):
+            if self.collision[index]:
+                continue
+            tx, ty = index % self.width, index // self.width
+            if (tx * 73856093 ^ ty * 19349663) % 100 >= DECORATION_CHANCE:
+                continue
+            ground = ground_layer[index]
+            decorations[index] = 3 if ground == 3 else (2 if ground in (1, 5) else 1)
+
+    def in_bounds(self, tx, ty):
+        return 0 <= tx < self.width and 0 <= ty < self.height
+
+    def get_tile(self, tx, ty, layer="ground"):
+        return self.layers[layer][ty * self.width + tx]
+
+    def set_tile(self, tx, ty, tile_id, layer="ground"):
+        """Change une tuile, met à jour sa collision et prévient les caches"""
+        index = ty * self.width + tx
+        self.layers[layer][index] = tile_id
+        self.collision[index] = (
+            GROUND_TYPES[self.layers["ground"][index]][0] | WALL_TYPES[self.layers["walls"][index]]
+        )
+        for listener in self.listeners:
+            listener(tx, ty)
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def is_blocked(self, tx, ty):
+        """Recherche O(1) dans la grille; hors carte = bloqué"""
+        if not self.in_bounds(tx, ty):
+            return True
+        return self.collision[ty * self.width + tx] & BLOCKING != 0
+
+    def is_blocked_at(self, x, y):
+        return self.is_blocked(int(x // self.tile_size), int(y // self.tile_size))
+
+    def rect_collides(self, x, y, width, height):
+        """Vérifie les quelques tuiles recouvertes par un rectangle"""
+        size = self.tile_size
+        tx_min = int(x // size)
+        ty_min = int(y // size)
+        tx_max = int((x + width - 0.001) // size)
+        ty_max = int((y + height - 0.001) // size)
+        for ty in range(ty_min, ty_max + 1):
+            for tx in range(tx_min, tx_max + 1):
+                if self.is_blocked(tx, ty):
+                    return True
+        return False
+
+    def sweep(self, x, y, width, height, dx, dy):
+        """Déplacement axe par axe: glisse le long des murs au lieu de s'arrêter"""
+        size = self.tile_size
+
+        new_x = x + dx
+        if dx and self.rect_collides(new_x, y, width, height):
+            if dx > 0:
+                new_x = int((new_x + width - 0.001) // size) * size - width
+            else:
+                new_x = (int(new_x // size) + 1) * size
+
+        new_y = y + dy
+        if dy and self.rect_collides(new_x, new_y, width, height):
+            if dy > 0:
+                new_y = int((new_y + height - 0.001) // size) * size - height
+            else:
+                new_y = (int(new_y // size) + 1) * size
+
+        return new_x, new_y
+
+    def draw_tile(self, surface, layer, tile_id, x, y):
+        """Dessine une tuile d'une couche à la position (x, y) de la surface"""
+        size = self.tile_size
+        if layer == "ground":
+            surface.fill(GROUND_TYPES[tile_id][1], (x, y, size, size))
+        elif layer == "walls":
+            if tile_id == 1:  # Mur
+                pygame.draw.rect(surface, (90, 90, 90), (x, y, size, size))
+                pygame.draw.rect(surface, (60, 60, 60), (x, y, size, size), 1)
+                pygame.draw.line(surface, (60, 60, 60), (x, y + size // 2), (x + size - 1, y + size // 2))
+            elif tile_id == 2:  # Arbre
+                pygame.draw.rect(surface, (90, 60, 30), (x + 6, y + 10, 4, 6))
+                pygame.draw.circle(surface, (20, 60, 20), (x + size // 2, y + 6), 6)
+        elif layer == "decorations":
+            if tile_id == 1:  # Fleur
+                pygame.draw.circle(surface, (230, 200, 60), (x + 5, y + 6), 2)
+                pygame.draw.circle(surface, (220, 90, 120), (x + 11, y + 10), 2)
+            elif tile_id == 2:  # Caillou
+                pygame.draw.ellipse(surface, (150, 150, 140), (x + 4, y + 8, 7, 5))
+            elif tile_id == 3:  # Roseau
+                for offset in (5, 8, 11):
+                    pygame.draw.line(surface, (110, 130, 50), (x + offset, y + 14), (x + offset, y + 4))
+
+    def render(self):
+        """Dessine toute la carte sur une surface"""
+        return self.render_region(0, 0, self.width, self.height)
+
+    def render_region(self, tx, ty, tiles_w, tiles_h):
+        """Compose les couches statiques d'un rectangle de tuiles sur une nouvelle surface"""
+        size = self.tile_size
+        surface = pygame.Surface((tiles_w * size, tiles_h * size))
+        for layer in LAYERS:
+            tiles = self.layers[layer]
+            for y in range(tiles_h):
+                row = (ty + y) * self.width + tx
+                for x in range(tiles_w):
+                    tile_id = tiles[row + x]
+                    if tile_id or layer == "ground":
+                        self.draw_tile(surface, layer, tile_id, x * size, y * size)
+        return surface
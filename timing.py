@@ -0,0 +1,89 @@
+# timing.py - Horloges du jeu (réelle et simulée)
+import time
+
+
+class SimulatedClock:
+    """Horloge simulée compatible avec pygame.time.Clock pour le mode headless"""
+
+    def __init__(self, step_ms=1000 / 60):
+        self.step_ms = step_ms  # Durée simulée d'un tick en ms
+        self.ticks = 0.0  # Temps simulé écoulé en ms
+        self.tick_count = 0
+        self.last_time = 0
+        self.started_at = None  # Au premier tick: l'initialisation n'est pas comptée
+        self.timed_from = 0  # Premier tick mesuré
+
+    def tick(self, framerate=0):
+        """Avance le temps simulé d'un pas, sans jamais attendre"""
+        if self.started_at is None:
+            # Le premier tick s'est exécuté avant cette mesure
+            self.started_at = time.perf_counter()
+            self.timed_from = self.tick_count + 1
+        self.ticks += self.step_ms
+        self.tick_count += 1
+        self.last_time = self.step_ms
+        return self.step_ms
+
+    def get_time(self):
+        """Durée simulée du dernier tick en ms"""
+        return self.last_time
+
+    def get_ticks(self):
+        """Équivalent simulé de pygame.time.get_ticks()"""
+        return int(self.ticks)
+
+    def get_fps(self):
+        return 1000 / self.step_ms
+
+    def get_real_tps(self):
+        """Ticks réellement exécutés par seconde depuis le premier tick"""
+        if self.started_at is None:
+            return 0.0
+        elapsed = time.perf_counter() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return (self.tick_count - self.timed_from) / elapsed
+
+
+class FixedTimestep:
+    """Accumulateur à pas fixe: découple la simulation du rendu"""
+
+    def __init__(self, step_ms, max_steps=5):
+        self.step_ms = step_ms
+        self.max_steps = max_steps  # Évite la spirale de la mort sur les frames très lentes
+        self.accumulator = 0.0
+
+    def advance(self, frame_ms):
+        """Ajoute la durée de la frame et retourne le nombre de pas à simuler"""
+        self.accumulator += frame_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            # Trop de retard: on abandonne le temps excédentaire
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step_ms
+        else:
+            self.accumulator -= steps * self.step_ms
+        return steps
+
+    def get_alpha(self):
+        """Fraction du pas suivant déjà écoulée, pour interpoler le rendu"""
+        return self.accumulator / self.step_ms
+
+
+class FramePacer:
+    """Politique de cadencement des frames: sleep, busy ou uncapped"""
+
+    MODES = ("sleep", "busy", "uncapped")
+
+    def __init__(self, clock, framerate=60, mode="sleep"):
+        self.clock = clock
+        self.framerate = framerate
+        self.mode = mode if mode in self.MODES else "sleep"
+
+    def tick(self):
+        """Attend la frame suivante selon la politique et retourne sa durée en ms"""
+        if self.mode == "busy":
+            return self.clock.tick_busy_loop(self.framerate)
+        if self.mode == "uncapped":
+            return self.clock.tick()
+        return self.clock.tick(self.framerate)
@@ -1,99 +1,113 @@
 # ui.py - Interface utilisateur
+import pygame
+from fonts import get_font, render_text
+
 class UI:
-    def __init__(self, player, inventory):
+    def __init__(self, player, inventory, quest_manager):
         self.player = player
         self.inventory = inventory
-        self.font = pygame.font.SysFont("Arial", 16)
+        self.quest_manager = quest_manager
+        self.font = get_font("Arial", 16)
         self.messages = []
         self.combat_messages = []
     
     def draw(self, screen, game_state):
+        """Dessine l'interface et retourne les zones modifiées de l'écran"""
+        dirty_rects = []
+        
         # Dessiner la barre de vie
-        self.draw_bar(screen, 10, 10, 200, 20, self.player.hp / self.player.max_hp, (255, 0, 0))
+        dirty_rects.append(self.draw_bar(screen, 10, 10, 200, 20, self.player.hp / self.player.max_hp, (255, 0, 0)))
         
         # Dessiner la barre de mana
-        self.draw_bar(screen, 10, 40, 200, 20, self.player.mp / self.player.max_mp, (0, 0, 255))
+        dirty_rects.append(self.draw_bar(screen, 10, 40, 200, 20, self.player.mp / self.player.max_mp, (0, 0, 255)))
         
         # Afficher le niveau et l'XP
-        level_text = self.font.render(f"Niveau: {self.player.level} XP: {self.player.xp}/{self.player.xp_to_next_level}", True, (255, 255, 255))
-        screen.blit(level_text, (10, 70))
+        level_text = render_text(self.font, f"Niveau: {self.player.level} XP: {self.player.xp}/{self.player.xp_to_next_level}", (255, 255, 255))
+        dirty_rects.append(screen.blit(level_text, (10, 70)))
         
         # Afficher la classe actuelle
-        class_text = self.font.render(f"Classe: {self.player.current_class.name}", True, (255, 255, 255))
-        screen.blit(class_text, (10, 90))
+        class_text = render_text(self.font, f"Classe: {self.player.current_class.name}", (255, 255, 255))
+        dirty_rects.append(screen.blit(class_text, (10, 90)))
         
         # Afficher l'or
-        gold_text = self.font.render(f"Or: {self.player.gold}", True, (255, 215, 0))
-        screen.blit(gold_text, (10, 110))
+        gold_text = render_text(self.font, f"Or: {self.player.gold}", (255, 215, 0))
+        dirty_rects.append(screen.blit(gold_text, (10, 110)))
         
         # Afficher les messages récents
         for i, message in enumerate(self.messages[-3:]):
-            msg_text = self.font.render(message, True, (255, 255, 255))
-            screen.blit(msg_text, (10, 140 + i * 20))
+            msg_text = render_text(self.font, message, (255, 255, 255))
+            dirty_rects.append(screen.blit(msg_text, (10, 140 + i * 20)))
         
         # Interface spécifique selon l'état du jeu
         if game_state == "combat":
-            self.draw_combat_ui(screen)
+            dirty_rects.extend(self.draw_combat_ui(screen))
         elif self.inventory.is_open:
-            self.draw_inventory(screen)
-        elif self.player.quest_manager.show_quests:
-            self.draw_quests(screen)
+            dirty_rects.extend(self.draw_inventory(screen))
+        elif self.quest_manager.show_quests:
+            dirty_rects.extend(self.draw_quests(screen))
+        
+        return dirty_rects
     
     def draw_bar(self, screen, x, y, width, height, ratio, color):
         pygame.draw.rect(screen, (50, 50, 50), (x, y, width, height))
         pygame.draw.rect(screen, color, (x, y, width * ratio, height))
-        pygame.draw.rect(screen, (200, 200, 200), (x, y, width, height), 2)
+        return pygame.draw.rect(screen, (200, 200, 200), (x, y, width, height), 2)
     
     def draw_combat_ui(self, screen):
         # Fond semi-transparent pour l'interface de combat
         s = pygame.Surface((800, 200), pygame.SRCALPHA)
         s.fill((0, 0, 0, 200))
-        screen.blit(s, (0, 400))
+        panel_rect = screen.blit(s, (0, 400))
         
         # Afficher les messages de combat
         for i, message in enumerate(self.combat_messages[-5:]):
-            msg_text = self.font.render(message, True, (255, 255, 255))
+            msg_text = render_text(self.font, message, (255, 255, 255))
             screen.blit(msg_text, (20, 410 + i * 20))
         
         # Afficher les actions de combat
         actions = ["Attaquer", "Compétence", "Objet", "Fuir"]
         for i, action in enumerate(actions):
-            action_text = self.font.render(f"{i+1}. {action}", True, (255, 255, 255))
+            action_text = render_text(self.font, f"{i+1}. {action}", (255, 255, 255))
             screen.blit(action_text, (600, 410 + i * 30))
+        
+        return [panel_rect]
     
     def draw_inventory(self, screen):
         # Fond de l'inventaire
         s = pygame.Surface((600, 400), pygame.SRCALPHA)
         s.fill((0, 0, 0, 220))
-        screen.blit(s, (100, 100))
+        panel_rect = screen.blit(s, (100, 100))
         
         # Titre
-        title = self.font.render("INVENTAIRE", True, (255, 255, 255))
+        title = render_text(self.font, "INVENTAIRE", (255, 255, 255))
         screen.blit(title, (350, 110))
         
         # Équipement actuel
-        equip_title = self.font.render("ÉQUIPÉ:", True, (255, 255, 255))
+        equip_title = render_text(self.font, "ÉQUIPÉ:", (255, 255, 255))
         screen.blit(equip_title, (120, 140))
         
         y_pos = 160
         for slot, item in self.player.equipment.items():
-            slot_text = self.font.render(f"{slot.capitalize()}: {item.name if item else 'Aucun'}", True, (255, 255, 255))
+            slot_text = render_text(self.font, f"{slot.capitalize()}: {item.name if item else 'Aucun'}", (255, 255, 255))
             screen.blit(slot_text, (120, y_pos))
             y_pos += 25
         
         # Liste des objets
-        items_title = self.font.render("OBJETS:", True, (255, 255, 255))
+        items_title = render_text(self.font, "OBJETS:", (255, 255, 255))
         screen.blit(items_title, (350, 140))
         
         for i, item in enumerate(self.inventory.items[:10]):  # Afficher les 10 premiers
-            item_text = self.font.render(f"{i+1}. {item.name}", True, (255, 255, 255))
+            label = f"{i+1}. {item.name}" + (f" x{item.count}" if item.count > 1 else "")
+            item_text = render_text(self.font, label, (255, 255, 255))
             screen.blit(item_text, (350, 160 + i * 20))
+        
+        return [panel_rect]
     
     def draw_quests(self, screen):
         # Similaire à draw_inventory mais pour les quêtes
-        pass
+        return []
     
-    def handle_event(self, event):
+    def handle_event(self, event, game=None):
         # Gérer les interactions avec l'UI
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mouse_pos = pygame.mouse.get_pos()
@@ -0,0 +1,143 @@
+# world_streaming.py - Découpage du monde en chunks chargés autour du joueur
+import math
+import pygame
+from collections import OrderedDict
+from atlas import prepare_surface
+
+CHUNK_TILES = 16  # Un chunk fait 16x16 tuiles (256 px)
+
+
+class Chunk:
+    def __init__(self, cx, cy, rect, surface):
+        self.cx = cx
+        self.cy = cy
+        self.rect = rect  # Zone couverte, en pixels monde
+        self.surface = surface  # Couches statiques (sol, murs, décors) pré-composées
+        self.dirty = False  # Une tuile a changé depuis la composition
+
+    def get_size_bytes(self):
+        return self.surface.get_width() * self.surface.get_height() * self.surface.get_bytesize()
+
+
+class ChunkStreamer:
+    """Garde en mémoire les chunks autour du joueur, dans un budget LRU"""
+
+    def __init__(self, tilemap, view_size=(800, 600), budget_bytes=4 * 1024 * 1024,
+                 on_chunk_loaded=None):
+        self.tilemap = tilemap
+        self.view_size = view_size
+        self.budget_bytes = budget_bytes
+        self.on_chunk_loaded = on_chunk_loaded  # Callback(chunk): monstres, musique...
+        self.chunk_px = CHUNK_TILES * tilemap.tile_size
+        self.world_width = tilemap.width * tilemap.tile_size
+        self.world_height = tilemap.height * tilemap.tile_size
+        self.cols = math.ceil(tilemap.width / CHUNK_TILES)
+        self.rows = math.ceil(tilemap.height / CHUNK_TILES)
+        self.chunks = OrderedDict()  # (cx, cy) -> Chunk, du moins au plus récent
+        self.used_bytes = 0
+        self.camera = (0, 0)
+        tilemap.add_listener(self.on_tile_changed)
+
+    def get_chunk_coords(self, x, y):
+        return (int(x // self.chunk_px), int(y // self.chunk_px))
+
+    def chunks_in_rect(self, rect):
+        """Coordonnées des chunks existants qui recouvrent un rectangle monde"""
+        cx_min, cy_min = self.get_chunk_coords(rect.left, rect.top)
+        cx_max, cy_max = self.get_chunk_coords(rect.right - 1, rect.bottom - 1)
+        return [
+            (cx, cy)
+            for cy in range(max(0, cy_min), min(self.rows - 1, cy_max) + 1)
+            for cx in range(max(0, cx_min), min(self.cols - 1, cx_max) + 1)
+        ]
+
+    def build_chunk(self, cx, cy):
+        """Compose une fois les couches statiques du chunk sur sa propre surface"""
+        tx, ty = cx * CHUNK_TILES, cy * CHUNK_TILES
+        tiles_w = min(CHUNK_TILES, self.tilemap.width - tx)
+        tiles_h = min(CHUNK_TILES, self.tilemap.height - ty)
+        surface = prepare_surface(self.tilemap.render_region(tx, ty, tiles_w, tiles_h))
+        rect = pygame.Rect(cx * self.chunk_px, cy * self.chunk_px, surface.get_width(), surface.get_height())
+        return Chunk(cx, cy, rect, surface)
+
+    def load_chunk(self, coords):
+        """Retourne le chunk, en le construisant si besoin (le marque récent)"""
+        chunk = self.chunks.get(coords)
+        if chunk is not None:
+            self.chunks.move_to_end(coords)
+            if chunk.dirty:
+                self.rebuild_chunk(chunk)
+            return chunk
+
+        chunk = self.build_chunk(*coords)
+        self.chunks[coords] = chunk
+        self.used_bytes += chunk.get_size_bytes()
+        if self.on_chunk_loaded:
+            self.on_chunk_loaded(chunk)
+        return chunk
+
+    def rebuild_chunk(self, chunk):
+        """Recompose un chunk invalidé par un changement de tuile"""
+        rebuilt = self.build_chunk(chunk.cx, chunk.cy)
+        chunk.surface = rebuilt.surface
+        chunk.dirty = False
+
+    def on_tile_changed(self, tx, ty):
+        chunk = self.chunks.get((tx // CHUNK_TILES, ty // CHUNK_TILES))
+        if chunk is not None:
+            chunk.dirty = True
+
+    def unload_chunk(self, coords):
+        chunk = self.chunks.pop(coords, None)
+        if chunk is not None:
+            self.used_bytes -= chunk.get_size_bytes()
+
+    def get_view_rect(self):
+        return pygame.Rect(self.camera, self.view_size)
+
+    def update_camera(self, position):
+        """Centre la caméra sur une position, sans sortir du monde"""
+        x = min(max(0, int(position[0]) - self.view_size[0] // 2), max(0, self.world_width - self.view_size[0]))
+        y = min(max(0, int(position[1]) - self.view_size[1] // 2), max(0, self.world_height - self.view_size[1]))
+        self.camera = (x, y)
+
+    def update(self, position, velocity=(0, 0)):
+        """Charge les chunks visibles et préchargés dans la direction du mouvement"""
+        self.update_camera(position)
+        required = self.chunks_in_rect(self.get_view_rect())
+
+        # Préchargement: la vue décalée d'un chunk dans la direction du joueur
+        if velocity[0] or velocity[1]:
+            length = math.hypot(velocity[0], velocity[1])
+            ahead = self.get_view_rect().move(
+                velocity[0] / length * self.chunk_px,
+                velocity[1] / length * self.chunk_px
+            )
+            required += [coords for coords in self.chunks_in_rect(ahead) if coords not in required]
+
+        for coords in required:
+            self.load_chunk(coords)
+        self.evict(set(required))
+
+    def evict(self, keep):
+        """Décharge les chunks les moins récents au-delà du budget mémoire"""
+        for coords in list(self.chunks):
+            if self.used_bytes <= self.budget_bytes:
+                break
+            if coords not in keep:
+                self.unload_chunk(coords)
+
+    def draw(self, screen, rect=None):
+        """Dessine le fond visible (ou seulement rect, en coordonnées écran)"""
+        camera_x, camera_y = self.camera
+        if rect is None:
+            rect = screen.get_rect()
+        world_rect = rect.move(camera_x, camera_y)
+        for coords in self.chunks_in_rect(world_rect):
+            chunk = self.load_chunk(coords)
+            area = world_rect.clip(chunk.rect)
+            screen.blit(
+                chunk.surface,
+                (area.x - camera_x, area.y - camera_y),
+                area.move(-chunk.rect.x, -chunk.rect.y)
+            )